@@ -0,0 +1,70 @@
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import click
+
+import exercises
+
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (.+)")
+SYNTHETIC_COMMAND = """import click
+import numpy
+import decimal
+
+command = click.command(name="{name}", help="Synthetic subcommand {index}")(lambda: None)
+"""
+
+
+def measure_startup(root: str, arguments: list[str], runs: int) -> tuple[float, int]:
+    # The median total import time of a run, and the number of modules it imports
+    totals, modules = [], set()
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "exercises", *arguments],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        imports = [IMPORT_TIME.match(line) for line in process.stderr.splitlines()]
+        totals.append(sum(int(match[1]) for match in imports if match))
+        modules = {match[3].strip() for match in imports if match}
+    return statistics.median(totals) / 1000, len(modules)
+
+
+@click.command()
+@click.option("--added", default="0,10,50", help="Comma separated numbers of synthetic subcommands to add")
+@click.option("--runs", default=5, help="Number of runs per measurement, the median is reported")
+@click.option("--threshold", default=0.25, help="Largest allowed growth of the import time")
+def main(added: str, runs: int, threshold: float):
+    # Copies the exercises package, adds synthetic subcommands that import numpy, and checks that the startup of
+    # `python -m exercises strategy` does not grow with them
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        package = os.path.join(root, "exercises")
+        shutil.copytree(os.path.dirname(exercises.__file__), package, ignore=shutil.ignore_patterns("__pycache__"))
+        for count in [int(value) for value in added.split(",")]:
+            for index in range(count):
+                path = os.path.join(package, "commands", f"synthetic_{index}.py")
+                if not os.path.exists(path):
+                    with open(path, "w") as file:
+                        file.write(SYNTHETIC_COMMAND.format(name=f"synthetic-{index}", index=index))
+            # Listing the commands once rebuilds the manifest, as a first --help after an install would
+            subprocess.run([sys.executable, "-m", "exercises", "--help"], cwd=root, capture_output=True, check=True)
+            milliseconds, modules = measure_startup(root, ["strategy"], runs)
+            results.append((count, milliseconds, modules))
+            print(f"{count:>4} added subcommands  {milliseconds:8.1f}ms imports  {modules:>5} modules")
+
+    baseline = results[0]
+    slower = [result for result in results if result[2] != baseline[2] or result[1] > baseline[1] * (1 + threshold)]
+    if slower:
+        raise click.ClickException(f"Startup grew with the number of subcommands: {slower}")
+    print("Startup stays flat")
+
+
+if __name__ == "__main__":
+    main()
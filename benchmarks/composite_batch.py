@@ -0,0 +1,34 @@
+import click
+
+from exercises.composite.batch import UserDataBatch, validate_batch
+from exercises.composite.composite import validate
+from exercises.composite.composite_solution import create_user_data_validator
+
+from .registrations import generate_registrations
+from .timing import best_of
+
+
+@click.command()
+@click.option("--records", "count", default=200_000, help="Number of registrations validated")
+@click.option("--valid-ratio", default=0.95, help="Share of valid registrations")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, valid_ratio: float, repeat: int):
+    registrations = generate_registrations(count, valid_ratio)
+    validator = create_user_data_validator(fediverse=False, international_shipping=False)
+    batch = UserDataBatch.from_records(registrations)
+
+    scalar = best_of(repeat, lambda: [validate(user_data) for user_data in registrations])
+    tree = best_of(repeat, lambda: [validator.validate_fast(user_data) for user_data in registrations])
+    conversion = best_of(repeat, lambda: UserDataBatch.from_records(registrations))
+    vectorised = best_of(repeat, lambda: validate_batch(validator, batch))
+
+    print(f"Records: {count} ({valid_ratio:.0%} valid)")
+    print(f"validate():       {scalar:8.3f}s {count / scalar:14,.0f} records/s")
+    print(f"Validator tree:   {tree:8.3f}s {count / tree:14,.0f} records/s")
+    print(f"Batch:            {vectorised:8.3f}s {count / vectorised:14,.0f} records/s")
+    print(f"Batch+conversion: {vectorised + conversion:8.3f}s {count / (vectorised + conversion):14,.0f} records/s")
+    print(f"Speedup:          {scalar / vectorised:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import click
+
+from exercises.composite.bulk import validate_file
+
+from .registrations import generate_registrations
+
+
+def write_registrations(path: Path, count: int) -> None:
+    with open(path, "w") as file:
+        for start in range(0, count, 10_000):
+            registrations = generate_registrations(min(10_000, count - start), seed=start)
+            file.writelines(json.dumps(user_data) + "\n" for user_data in registrations)
+
+
+@click.command()
+@click.option("--records", "count", default=200_000, help="Number of registrations in the file")
+@click.option("--chunk-size", default=1_000, help="Number of records sent to a worker at a time")
+@click.option("--max-workers", default=os.cpu_count() or 1, help="Largest worker count to measure")
+def main(count: int, chunk_size: int, max_workers: int):
+    with tempfile.TemporaryDirectory() as directory:
+        input_path, output_path = Path(directory) / "records.jsonl", Path(directory) / "results.jsonl"
+        print(f"Records: {count}, chunk size: {chunk_size}, CPUs: {os.cpu_count()}")
+        write_registrations(input_path, count)
+        workers = 1
+        while workers <= max_workers:
+            summary = validate_file(input_path, output_path, workers=workers, chunk_size=chunk_size)
+            print(f"{workers:>3} workers{summary.records_per_second:>14,.0f} records/s")
+            workers *= 2
+
+        # Peak memory of the reading process, which should not grow with the size of the file
+        print(f"{'Records':>10}{'peak':>12}")
+        for size in [count // 10, count]:
+            write_registrations(input_path, size)
+            tracemalloc.start()
+            validate_file(input_path, output_path, chunk_size=chunk_size)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{size:>10}{peak / 2**20:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
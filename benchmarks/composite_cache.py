@@ -0,0 +1,53 @@
+import time
+
+import click
+
+from exercises.composite.cache import LeafResultCache, cache_validator
+from exercises.composite.compiled import compile_validator
+from exercises.composite.composite_solution import create_user_data_validator
+
+from .registrations import generate_signups
+
+# The properties whose values repeat in signup traffic
+REPEATING_PROPERTIES = ["federation_provider", "firstname", "lastname", "address1", "address2", "postcode"]
+
+
+@click.command()
+@click.option("--records", "count", default=100_000, help="Number of registrations validated")
+@click.option("--valid-ratio", default=0.95, help="Share of valid registrations")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, valid_ratio: float, repeat: int):
+    # Every run streams the registrations through a cache that starts empty, as a bulk import would, then once more
+    # through the now warm cache, as a long running service would see returning values
+    registrations = generate_signups(count, valid_ratio)
+    tree = create_user_data_validator()
+    expected = [tree.validate(user_data) for user_data in registrations]
+
+    print(f"Records: {count} ({valid_ratio:.0%} valid)")
+    print(
+        f"{'Validator':<36}{'max size':>10}{'cold us':>9}{'warm us':>9}{'hit rate':>10}{'entries':>9}{'evictions':>11}"
+    )
+    for compiled in [False, True]:
+        configurations = [(None, None), (1_000, None), (100_000, None), (1_000, REPEATING_PROPERTIES)]
+        for max_size, properties in configurations:
+            cold, warm = [], []
+            for _ in range(repeat):
+                cache = LeafResultCache(max_size) if max_size else None
+                validator = tree if cache is None else cache_validator(tree, cache, properties)
+                validate = (compile_validator(validator) if compiled else validator).validate_fast
+                for timings in [cold, warm]:
+                    began = time.perf_counter()
+                    results = [validate(user_data) for user_data in registrations]
+                    timings.append(time.perf_counter() - began)
+                    assert results == expected
+            name = ("Compiled" if compiled else "Tree") + (", cached" if cache else "")
+            name += ", repeating fields" if properties else ""
+            row = f"{name:<36}{max_size or '':>10}{min(cold) / count * 1e6:>9.2f}{min(warm) / count * 1e6:>9.2f}"
+            if cache:
+                stats = cache.stats
+                row += f"{stats.hit_rate:>10.1%}{stats.size:>9}{stats.evictions:>11}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
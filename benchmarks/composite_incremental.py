@@ -0,0 +1,52 @@
+import timeit
+
+import click
+
+from exercises.composite.compiled import compile_validator
+from exercises.composite.composite import validate
+from exercises.composite.composite_solution import create_user_data_validator
+from exercises.composite.incremental import ValidationSession
+
+from .registrations import VALID_REGISTRATIONS
+
+
+def typing(user_data: dict[str, str], property: str, text: str) -> list[dict[str, str]]:
+    # The versions of a form while one of its properties is typed in, one character at a time
+    return [{**user_data, property: text[:length]} for length in range(1, len(text) + 1)]
+
+
+@click.command()
+@click.option("--rounds", default=200, help="Number of times each form edit sequence is validated")
+@click.option("--repeat", default=5, help="Number of timed runs, the best one is reported")
+def main(rounds: int, repeat: int):
+    form = VALID_REGISTRATIONS[1]
+    scenarios = {
+        "password, rest valid": typing(form, "password", "c0rrect-horse-battery"),
+        "email, rest valid": typing(form, "email", "someone.else@example.org"),
+        "firstname, empty form": typing({}, "firstname", "Alexandra"),
+    }
+    tree = create_user_data_validator(fediverse=False, international_shipping=False)
+    validators = {
+        "validate()": lambda: validate,
+        "Validator tree": lambda: tree.validate,
+        "Compiled plan": lambda: compile_validator(tree).validate,
+        "Session": lambda: ValidationSession(tree).validate,
+    }
+
+    print(f"{'Edit':<24}" + "".join(f"{name:>16}" for name in validators) + "  (us per edit)")
+    for scenario, versions in scenarios.items():
+        latencies = []
+        for create in validators.values():
+            function = create()
+            number = rounds * len(versions)
+            timings = timeit.repeat(
+                lambda function=function, versions=versions: [function(user_data) for user_data in versions],
+                number=rounds,
+                repeat=repeat,
+            )
+            latencies.append(min(timings) / number * 1e6)
+        print(f"{scenario:<24}" + "".join(f"{latency:>16.2f}" for latency in latencies))
+
+
+if __name__ == "__main__":
+    main()
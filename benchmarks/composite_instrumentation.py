@@ -0,0 +1,46 @@
+import timeit
+
+import click
+
+from exercises.composite.composite_solution import create_user_data_validator
+from exercises.composite.instrumentation import Instrumentation
+
+from .registrations import generate_registrations
+
+
+@click.command()
+@click.option("--count", default=10_000, help="Number of registrations to validate")
+@click.option("--repeat", default=5, help="Number of timed runs, the best one is reported")
+@click.option("--top", default=5, help="Number of nodes listed by time and by failures")
+def main(count: int, repeat: int, top: int):
+    registrations = generate_registrations(count)
+    tree = create_user_data_validator()
+    instrumentation = Instrumentation(tree)
+
+    print(f"{'Tree':<24}{'us per record':>16}")
+    for name, validator in [("Plain", tree), ("Instrumented", instrumentation.validator)]:
+        timings = timeit.repeat(
+            lambda validator=validator: [validator.validate(user_data) for user_data in registrations],
+            number=1,
+            repeat=repeat,
+        )
+        print(f"{name:<24}{min(timings) / count * 1e6:>16.2f}")
+
+    instrumentation.reset()
+    for user_data in registrations:
+        instrumentation.validator.validate(user_data)
+    stats = instrumentation.snapshot()
+    leaves = [node for node in stats if node.kind == "property"]
+    print("\nLeaves by time")
+    for node in sorted(leaves, key=lambda node: -node.seconds)[:top]:
+        print(f"  {node.path:<64}{node.calls:>8} calls{node.seconds * 1e3:>10.2f} ms")
+    print("Leaves by failures")
+    for node in sorted(leaves, key=lambda node: -node.failures)[:top]:
+        print(f"  {node.path:<64}{node.failures:>8} of {node.calls}")
+    print("Reordering suggestions")
+    for suggestion in instrumentation.suggest_reordering():
+        print(f"  {suggestion.path}: {', '.join(suggestion.suggested)}")
+
+
+if __name__ == "__main__":
+    main()
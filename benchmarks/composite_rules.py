@@ -0,0 +1,71 @@
+import re
+import timeit
+
+import click
+
+from exercises.composite import rules
+
+SPECIAL_CHARACTERS = "!\"£$%^&*()_+-=`¬|{}[]'#@~<>?,./]"
+WORD_CHARACTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"
+
+# For each rule: the check as it was written inline before the rules module, the rule, a short input and a 100
+# character worst-case input (one the check has to scan completely)
+RULES = {
+    "contains_digit": (
+        lambda value: any(c.isdigit() for c in value),
+        rules.contains_digit,
+        "passw0rd!",
+        "p" * 99 + "0",
+    ),
+    "contains_special_character": (
+        lambda value: any(c in SPECIAL_CHARACTERS for c in value),
+        rules.contains_special_character,
+        "passw0rd!",
+        "p" * 99 + "!",
+    ),
+    "only_word_characters": (
+        lambda value: all(c in WORD_CHARACTERS for c in value),
+        rules.only_word_characters,
+        "some_user",
+        "some_user" * 11 + "_",
+    ),
+    "valid_email": (
+        lambda value: re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$", value) is not None,
+        rules.valid_email,
+        "foo@bar.com",
+        "f" * 80 + "@" + "b" * 15 + ".com",
+    ),
+    "valid_fediverse_id": (
+        lambda value: re.match(r"^@[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$", value) is not None,
+        rules.valid_fediverse_id,
+        "@foo@bar.com",
+        "@" + "f" * 79 + "@" + "b" * 15 + ".com",
+    ),
+    "valid_name": (
+        lambda value: len(value) >= 2 and value[0].isupper() and value[1:].islower(),
+        rules.valid_name,
+        "John",
+        "J" + "o" * 99,
+    ),
+}
+
+
+@click.command()
+@click.option("--number", default=100_000, help="Number of calls per timing")
+@click.option("--repeat", default=5, help="Number of timed runs, the best one is reported")
+def main(number: int, repeat: int):
+    print(f"{'Rule':<28}{'input':>7}{'inline':>10}{'rule':>10}  (ns/call)")
+    for name, (inline, rule, short, worst_case) in RULES.items():
+        for label, value in [("short", short), ("100", worst_case)]:
+            assert inline(value) == rule(value)
+            timings = [
+                min(timeit.repeat(lambda check=check, value=value: check(value), number=number, repeat=repeat))
+                / number
+                * 1e9
+                for check in (inline, rule)
+            ]
+            print(f"{name:<28}{label:>7}" + "".join(f"{timing:>10,.0f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+import time
+
+import click
+
+from exercises.composite.composite import validate
+from exercises.composite.composite_solution import create_user_data_validator
+from exercises.composite.service import ValidationService
+
+from .registrations import generate_registrations
+from .timing import best_of
+
+
+@click.command()
+@click.option("--records", "count", default=200_000, help="Number of registrations validated")
+@click.option("--chunk-size", default=5_000, help="Number of registrations sent to a worker at a time")
+@click.option("--max-workers", default=os.cpu_count() or 1, help="Largest worker count to measure")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, chunk_size: int, max_workers: int, repeat: int):
+    registrations = generate_registrations(count)
+    validator = create_user_data_validator(fediverse=False, international_shipping=False)
+
+    print(f"Records: {count}, chunk size: {chunk_size}, CPUs: {os.cpu_count()}")
+    baseline = count / best_of(repeat, lambda: [validate(user_data) for user_data in registrations])
+    print(f"{'validate() loop':<24}{baseline:14,.0f} records/s")
+    for mode in ["inline", "thread", "process"]:
+        workers = 1
+        while workers <= (1 if mode == "inline" else max_workers):
+            with ValidationService(validator, mode=mode, workers=workers, chunk_size=chunk_size) as service:
+                began = time.perf_counter()
+                service.validate_many(registrations[:chunk_size])
+                startup = time.perf_counter() - began
+                rate = count / best_of(repeat, lambda: service.validate_many(registrations))
+            print(
+                f"{mode:<8}{workers:>3} workers    {rate:14,.0f} records/s  {rate / baseline:5.2f}x"
+                f"  (first call {startup * 1000:,.0f}ms)"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import click
+
+from exercises.composite.compiled import compile_validator
+from exercises.composite.composite import validate
+from exercises.composite.composite_solution import create_user_data_validator
+
+from .registrations import generate_registrations
+from .timing import best_of
+
+
+@click.command()
+@click.option("--records", "count", default=100_000, help="Number of registrations validated")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, repeat: int):
+    tree = create_user_data_validator(fediverse=False, international_shipping=False)
+    compiled = compile_validator(tree)
+    validators = {
+        "validate()": lambda user_data: validate(user_data, fast_accept=False),
+        "validate() fast": validate,
+        "Validator tree": tree.validate,
+        "Tree fast": tree.validate_fast,
+        "Tree check": tree.check,
+        "Compiled plan": compiled.validate,
+        "Compiled fast": compiled.validate_fast,
+        "Compiled check": compiled.check,
+    }
+
+    print(f"Records: {count}")
+    print(f"{'Validator':<18}{'valid':>14}{'invalid':>14}{'95% valid':>14}  (validations/s)")
+    workloads = [generate_registrations(count, valid_ratio) for valid_ratio in [1.0, 0.0, 0.95]]
+    for name, function in validators.items():
+        rates = [
+            count
+            / best_of(
+                repeat,
+                lambda function=function, registrations=registrations: [
+                    function(user_data) for user_data in registrations
+                ],
+            )
+            for registrations in workloads
+        ]
+        print(f"{name:<18}" + "".join(f"{rate:>14,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
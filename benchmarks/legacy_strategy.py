@@ -0,0 +1,170 @@
+from exercises.strategy.strategy import LoanInfo, MonthlyRepayment
+
+
+# The original if-chain implementation, kept as a reference for the strategy registry benchmark
+def create_monthly_repayment(loan_info: LoanInfo) -> MonthlyRepayment:
+    interest_payment = loan_info.amount * loan_info.interest / 12 / 100
+    variable_interest_payment = loan_info.amount * (loan_info.interest + loan_info.libor) / 12 / 100
+    repayment = loan_info.amount / loan_info.remaining_duration
+    duration_so_far = loan_info.original_duration - loan_info.remaining_duration
+    if loan_info.loan_kind == "interest_only":
+        if loan_info.remaining_duration <= 1:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(interest_payment + loan_info.amount, 4),
+                amount_remaining=0,
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment, 4),
+            amount_remaining=round(loan_info.amount, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "interest_only_variable":
+        if loan_info.remaining_duration <= 1:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(variable_interest_payment + loan_info.amount, 4),
+                amount_remaining=0,
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(variable_interest_payment, 4),
+            amount_remaining=round(loan_info.amount, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "interest_and_repayment":
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "v_interest_and_repayment":
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(variable_interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "introductory_offer_3":
+        if duration_so_far < 3:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=0,
+                amount_remaining=round(loan_info.amount + interest_payment, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "introductory_offer_12":
+        if duration_so_far < 12:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=0,
+                amount_remaining=round(loan_info.amount + variable_interest_payment, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(variable_interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "introductory_offer_interst_only_6":
+        if duration_so_far < 6:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(interest_payment, 4),
+                amount_remaining=round(loan_info.amount, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "introductory_offer_interst_only_9":
+        if duration_so_far < 9:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(interest_payment, 4),
+                amount_remaining=round(loan_info.amount, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "good_credit_score":
+        if loan_info.current_credit_score >= 700:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(repayment, 4),
+                amount_remaining=round(loan_info.amount - repayment, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "very_good_credit_score":
+        if loan_info.current_credit_score >= 850:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(repayment, 4),
+                amount_remaining=round(loan_info.amount - repayment, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(variable_interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount - repayment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "bad_credit_score":
+        if loan_info.current_credit_score < 650:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(interest_payment * 2 + repayment, 4),
+                amount_remaining=round(loan_info.amount - repayment, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount + interest_payment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+    if loan_info.loan_kind == "very_bad_credit_score":
+        if loan_info.current_credit_score < 500:
+            return MonthlyRepayment(
+                loan_id=loan_info.loan_id,
+                payment=round(interest_payment * 2 + repayment, 4),
+                amount_remaining=round(loan_info.amount - repayment, 4),
+                remaining_duration=loan_info.remaining_duration - 1,
+            )
+        return MonthlyRepayment(
+            loan_id=loan_info.loan_id,
+            payment=round(interest_payment + repayment, 4),
+            amount_remaining=round(loan_info.amount + interest_payment, 4),
+            remaining_duration=loan_info.remaining_duration - 1,
+        )
+
+    return MonthlyRepayment(
+        loan_id=loan_info.loan_id,
+        payment=round(interest_payment + repayment, 4),
+        amount_remaining=round(loan_info.amount - repayment, 4),
+        remaining_duration=loan_info.remaining_duration - 1,
+    )
@@ -0,0 +1,58 @@
+import random
+
+from exercises.strategy.strategy import LoanInfo
+
+LOAN_KINDS = [
+    "interest_only",
+    "interest_only_variable",
+    "interest_and_repayment",
+    "v_interest_and_repayment",
+    "introductory_offer_3",
+    "introductory_offer_12",
+    "introductory_offer_interst_only_6",
+    "introductory_offer_interst_only_9",
+    "good_credit_score",
+    "very_good_credit_score",
+    "bad_credit_score",
+    "very_bad_credit_score",
+]
+
+
+# A book dominated by plain repayment and interest only mortgages, with a tail of offers and credit score products
+BOOK_MIX = {
+    "interest_only": 0.15,
+    "interest_only_variable": 0.05,
+    "interest_and_repayment": 0.35,
+    "v_interest_and_repayment": 0.15,
+    "introductory_offer_3": 0.04,
+    "introductory_offer_12": 0.04,
+    "introductory_offer_interst_only_6": 0.03,
+    "introductory_offer_interst_only_9": 0.03,
+    "good_credit_score": 0.06,
+    "very_good_credit_score": 0.03,
+    "bad_credit_score": 0.05,
+    "very_bad_credit_score": 0.02,
+}
+
+
+def generate_loans(count: int, seed: int = 0, kind_weights: dict[str, float] | None = None) -> list[LoanInfo]:
+    # Loan kinds are drawn uniformly, or with the given weights
+    rng = random.Random(seed)
+    kinds = list(kind_weights) if kind_weights else LOAN_KINDS
+    weights = list(kind_weights.values()) if kind_weights else None
+    loans = []
+    for index in range(count):
+        original_duration = rng.choice([12, 24, 36, 60, 120, 240, 360])
+        loans.append(
+            LoanInfo(
+                loan_id=f"loan-{index:08d}",
+                loan_kind=rng.choices(kinds, weights)[0] if weights else rng.choice(kinds),
+                original_duration=original_duration,
+                remaining_duration=rng.randint(1, original_duration),
+                interest=round(rng.uniform(0.5, 12), 2),
+                amount=round(rng.uniform(1_000, 500_000), 2),
+                current_credit_score=rng.randint(300, 900),
+                libor=round(rng.uniform(0, 6), 3),
+            )
+        )
+    return loans
@@ -0,0 +1,107 @@
+import random
+
+VALID_REGISTRATIONS = [
+    {"federation_provider": "foo", "federation_id": "abc123"},
+    {
+        "user_id": "user1234",
+        "password": "passw0rd!",
+        "email": "foo@bar.com",
+        "firstname": "John",
+        "lastname": "Smith",
+        "address1": "1 Some Street",
+        "postcode": "AB1 2CD",
+    },
+    {
+        "user_id": "someone99",
+        "password": "c0rrect-horse",
+        "phone": "0123456789",
+        "username": "some_user",
+        "firstname": "Jane",
+        "lastname": "Doe",
+        "address1": "Flat 2",
+        "address2": "3 Other Road",
+        "postcode": "XY9 8ZW",
+    },
+]
+
+INVALID_VALUES = {
+    "federation_provider": ["baz", ""],
+    "federation_id": ["", "x" * 101],
+    "user_id": ["short", "user123456789"],
+    "password": ["password", "p4ss!", "12345678"],
+    "email": ["foo@bar", "@foo@bar.com"],
+    "phone": ["0123", "012345678a"],
+    "username": ["ab", "some user"],
+    "firstname": ["john", "J"],
+    "lastname": ["smith", "SmItH"],
+    "address1": ["", "x" * 101],
+    "postcode": ["", "ABCDE 12345"],
+}
+
+
+def generate_registrations(count: int, valid_ratio: float = 0.95, seed: int = 0) -> list[dict[str, str]]:
+    # Valid registrations, some of which get one or more fields broken or removed
+    rng = random.Random(seed)
+    registrations = []
+    for _ in range(count):
+        user_data = dict(rng.choice(VALID_REGISTRATIONS))
+        if rng.random() >= valid_ratio:
+            for field in rng.sample(sorted(INVALID_VALUES), rng.randint(1, 4)):
+                if rng.random() < 0.2:
+                    user_data.pop(field, None)
+                else:
+                    user_data[field] = rng.choice(INVALID_VALUES[field])
+            user_data.pop("federation_id", None)
+        registrations.append(user_data)
+    return registrations
+
+
+def generate_signups(count: int, valid_ratio: float = 0.95, seed: int = 0) -> list[dict[str, str]]:
+    # Registrations whose values repeat the way signup traffic does: names, postcodes and address lines drawn from
+    # pools where a few values are very common (Zipf weights), a quarter of the passwords from a list of common ones,
+    # and unique ids, emails and usernames
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+
+    def word(length: int) -> str:
+        return "".join(rng.choice(letters) for _ in range(length))
+
+    def pool(size: int, make) -> tuple[list[str], list[float]]:
+        return [make() for _ in range(size)], [1 / (rank + 1) for rank in range(size)]
+
+    firstnames = pool(300, lambda: word(rng.randint(3, 8)).capitalize())
+    lastnames = pool(2_000, lambda: word(rng.randint(4, 10)).capitalize())
+    postcodes = pool(5_000, lambda: f"{word(2).upper()}{rng.randint(1, 99)} {rng.randint(1, 9)}{word(2).upper()}")
+    streets = pool(10_000, lambda: f"{rng.randint(1, 300)} {word(rng.randint(4, 9)).capitalize()} Street")
+    passwords = pool(500, lambda: f"{word(rng.randint(5, 9))}{rng.randint(0, 99)}!")
+
+    def draw(values: tuple[list[str], list[float]]) -> str:
+        return rng.choices(values[0], values[1])[0]
+
+    registrations = []
+    for index in range(count):
+        if rng.random() < 0.3:
+            user_data = {"federation_provider": rng.choice(["foo", "foo", "bar"]), "federation_id": f"fed{index:09d}"}
+        else:
+            user_data = {
+                "user_id": f"user{index:07d}",
+                "password": draw(passwords) if rng.random() < 0.25 else f"{word(8)}{rng.randint(0, 9)}#",
+                "firstname": draw(firstnames),
+                "lastname": draw(lastnames),
+                "address1": draw(streets),
+                "postcode": draw(postcodes),
+            }
+            if rng.random() < 0.6:
+                user_data["email"] = f"{word(6)}{index}@example.com"
+            else:
+                user_data["phone"] = f"07{rng.randint(0, 99_999_999):08d}"
+                user_data["username"] = f"{word(5)}_{index}"
+        if rng.random() >= valid_ratio:
+            for field in rng.sample(sorted(INVALID_VALUES), rng.randint(1, 4)):
+                if rng.random() < 0.2:
+                    user_data.pop(field, None)
+                else:
+                    user_data[field] = rng.choice(INVALID_VALUES[field])
+            user_data.pop("federation_id", None)
+        registrations.append(user_data)
+    return registrations
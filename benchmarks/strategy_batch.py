@@ -0,0 +1,29 @@
+import click
+
+from exercises.strategy.batch import LoanBatch, create_monthly_repayments
+from exercises.strategy.strategy import create_monthly_repayment
+
+from .loans import generate_loans
+from .timing import best_of
+
+
+@click.command()
+@click.option("--loans", "count", default=1_000_000, help="Number of loans in the portfolio")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, repeat: int):
+    loans = generate_loans(count)
+    batch = LoanBatch.from_loans(loans)
+
+    scalar = best_of(repeat, lambda: [create_monthly_repayment(loan) for loan in loans])
+    conversion = best_of(repeat, lambda: LoanBatch.from_loans(loans))
+    vectorised = best_of(repeat, lambda: create_monthly_repayments(batch))
+
+    print(f"Loans: {count}")
+    print(f"Scalar:           {scalar:8.3f}s {count / scalar:14,.0f} loans/s")
+    print(f"Batch:            {vectorised:8.3f}s {count / vectorised:14,.0f} loans/s")
+    print(f"Batch+conversion: {vectorised + conversion:8.3f}s {count / (vectorised + conversion):14,.0f} loans/s")
+    print(f"Speedup:          {scalar / vectorised:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
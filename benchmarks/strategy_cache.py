@@ -0,0 +1,40 @@
+import random
+from dataclasses import replace
+
+import click
+
+from exercises.strategy.cache import RepaymentCache
+from exercises.strategy.strategy import create_monthly_repayment
+
+from .loans import generate_loans
+from .timing import best_of
+
+
+@click.command()
+@click.option("--queries", default=200_000, help="Number of quotes requested")
+@click.option("--distinct", default=2_000, help="Number of distinct quotes the queries are drawn from")
+@click.option("--max-size", default=10_000, help="Cache size")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(queries: int, distinct: int, max_size: int, repeat: int):
+    # Customers tweaking sliders: a few popular quotes are requested most of the time (Zipf-like distribution),
+    # each time under a new loan id
+    rng = random.Random(0)
+    quotes = generate_loans(distinct)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    workload = [
+        replace(quote, loan_id=f"quote-{index}")
+        for index, quote in enumerate(rng.choices(quotes, weights=weights, k=queries))
+    ]
+
+    uncached = best_of(repeat, lambda: [create_monthly_repayment(loan) for loan in workload])
+    cache = RepaymentCache(max_size=max_size)
+    cached = best_of(repeat, lambda: [cache.create_monthly_repayment(loan) for loan in workload])
+
+    print(f"Queries: {queries}, distinct quotes: {distinct}, cache size: {max_size}")
+    print(f"Uncached: {uncached / queries * 1e9:8.0f}ns per quote")
+    print(f"Cached:   {cached / queries * 1e9:8.0f}ns per quote")
+    print(f"Hit rate: {cache.stats.hit_rate:8.1%} ({cache.stats.evictions} evictions)")
+
+
+if __name__ == "__main__":
+    main()
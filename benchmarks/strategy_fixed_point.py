@@ -0,0 +1,36 @@
+import click
+
+from exercises.strategy.batch import LoanBatch, create_monthly_repayments
+from exercises.strategy.fixed_point import create_monthly_repayment_exact, create_monthly_repayments_exact
+from exercises.strategy.strategy import create_monthly_repayment
+
+from .loans import generate_loans
+from .timing import best_of
+
+
+@click.command()
+@click.option("--loans", "count", default=1_000_000, help="Number of loans in the portfolio")
+@click.option("--scalar-loans", default=100_000, help="Number of loans used for the scalar timings")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, scalar_loans: int, repeat: int):
+    loans = generate_loans(count)
+    batch = LoanBatch.from_loans(loans)
+    scalar = loans[:scalar_loans]
+
+    timings = {
+        "Scalar float": best_of(repeat, lambda: [create_monthly_repayment(loan) for loan in scalar]) / len(scalar),
+        "Scalar exact": best_of(repeat, lambda: [create_monthly_repayment_exact(loan) for loan in scalar])
+        / len(scalar),
+        "Batch float": best_of(repeat, lambda: create_monthly_repayments(batch)) / count,
+        "Batch exact": best_of(repeat, lambda: create_monthly_repayments_exact(batch)) / count,
+    }
+
+    print(f"Loans: {count} (scalar: {len(scalar)})")
+    for name, seconds in timings.items():
+        print(f"{name:<14}{seconds * 1e9:10.0f}ns per loan")
+    print(f"Cost of exactness: scalar {timings['Scalar exact'] / timings['Scalar float']:.2f}x, ", end="")
+    print(f"batch {timings['Batch exact'] / timings['Batch float']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import click
+
+from exercises.strategy.batch import LoanBatch, create_monthly_repayments
+from exercises.strategy.libor import RepaymentBook
+
+from .loans import generate_loans
+from .timing import best_of
+
+
+@click.command()
+@click.option("--loans", "count", default=1_000_000, help="Number of loans in the portfolio")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, repeat: int):
+    batch = LoanBatch.from_loans(generate_loans(count))
+    book = RepaymentBook(batch)
+    rates = iter(3 + step / 100 for step in range(1, 2 * repeat + 2))
+
+    full = best_of(repeat, lambda: create_monthly_repayments(batch))
+    incremental = best_of(repeat, lambda: book.update_libor(next(rates)))
+
+    print(f"Loans: {count}, libor sensitive: {len(book.libor_sensitive)} ({len(book.libor_sensitive) / count:.1%})")
+    print(f"Full recomputation: {full:8.3f}s")
+    print(f"Libor update:       {incremental:8.3f}s ({full / incremental:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import gc
+import tracemalloc
+
+import click
+
+from exercises.strategy.batch import LoanBatch
+from exercises.strategy.compact import FrozenLoanInfo, LoanPortfolio, SlottedLoanInfo
+
+from .loans import generate_loans
+
+
+def measure(build) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+@click.command()
+@click.option("--loans", "count", default=1_000_000, help="Number of loans in the portfolio")
+def main(count: int):
+    # Every layout is built from freshly generated loans, so the loan id and kind strings are counted for all of them
+    layouts = {
+        "LoanInfo (dataclass)": lambda: generate_loans(count),
+        "SlottedLoanInfo": lambda: [SlottedLoanInfo.from_loan_info(loan) for loan in generate_loans(count)],
+        "FrozenLoanInfo": lambda: [FrozenLoanInfo.from_loan_info(loan) for loan in generate_loans(count)],
+        "LoanBatch (columns)": lambda: LoanBatch.from_loans(generate_loans(count)),
+        "LoanPortfolio (typed columns)": lambda: LoanPortfolio.from_loans(generate_loans(count)),
+    }
+
+    print(f"Loans: {count}")
+    print(f"{'Layout':<32}{'retained':>14}{'per loan':>12}{'peak':>14}")
+    for name, build in layouts.items():
+        current, peak = measure(build)
+        print(f"{name:<32}{current / 2**20:>12.1f}MB{current / count:>11.1f}B{peak / 2**20:>12.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import os
+
+import click
+
+from exercises.strategy.batch import LoanBatch
+from exercises.strategy.compact import LoanPortfolio
+from exercises.strategy.parallel import run_portfolio
+
+from .loans import generate_loans
+
+
+@click.command()
+@click.option("--loans", "count", default=1_000_000, help="Number of loans in the portfolio")
+@click.option("--chunk-size", default=100_000, help="Number of loans sent to a worker at a time")
+@click.option("--max-workers", default=os.cpu_count() or 1, help="Largest worker count to measure")
+def main(count: int, chunk_size: int, max_workers: int):
+    portfolio = LoanPortfolio.from_batch(LoanBatch.from_loans(generate_loans(count)))
+
+    print(f"Loans: {count}, chunk size: {chunk_size}, CPUs: {os.cpu_count()}")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        run = run_portfolio(portfolio, workers=workers, chunk_size=chunk_size)
+        baseline = baseline or run.loans_per_second
+        print(
+            f"{workers:>3} workers: {run.seconds:8.3f}s {run.loans_per_second:14,.0f} loans/s "
+            f"speedup {run.loans_per_second / baseline:5.2f}x"
+        )
+        for stats in run.worker_stats:
+            print(f"      worker {stats.worker}: {stats.chunks} chunks, {stats.loans_per_second:14,.0f} loans/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import functools
+import timeit
+
+import click
+
+from exercises.strategy.strategy import LoanInfo, create_monthly_repayment
+
+from .legacy_strategy import create_monthly_repayment as legacy_create_monthly_repayment
+from .loans import LOAN_KINDS
+
+
+def example(loan_kind: str) -> LoanInfo:
+    return LoanInfo(
+        loan_id="123-456",
+        loan_kind=loan_kind,
+        original_duration=36,
+        remaining_duration=24,
+        interest=5,
+        amount=10000,
+        current_credit_score=700,
+        libor=3,
+    )
+
+
+@click.command()
+@click.option("--number", default=200_000, help="Number of calls per timed run")
+@click.option("--repeat", default=5, help="Number of timed runs, the best one is reported")
+def main(number: int, repeat: int):
+    print(f"{'Loan kind':<36}{'if-chain':>12}{'registry':>12}")
+    for loan_kind in [LOAN_KINDS[0], LOAN_KINDS[-1], "unknown_kind"]:
+        loan_info = example(loan_kind)
+        latencies = [
+            min(timeit.repeat(functools.partial(function, loan_info), number=number, repeat=repeat)) / number * 1e9
+            for function in [legacy_create_monthly_repayment, create_monthly_repayment]
+        ]
+        print(f"{loan_kind:<36}{latencies[0]:>10.0f}ns{latencies[1]:>10.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import time
+import tracemalloc
+from dataclasses import replace
+
+import click
+
+from exercises.strategy.batch import LoanBatch
+from exercises.strategy.scenarios import ScenarioShocks, run_scenarios
+from exercises.strategy.strategy import create_monthly_repayment
+
+from .loans import generate_loans
+
+
+def scalar_seconds(loans, shocks: ScenarioShocks) -> float:
+    # One create_monthly_repayment call per loan, scenario and month
+    began = time.perf_counter()
+    for scenario in range(shocks.scenarios):
+        for loan in loans:
+            for month in range(shocks.months):
+                if loan.remaining_duration < 1:
+                    break
+                repayment = create_monthly_repayment(
+                    replace(
+                        loan,
+                        libor=float(shocks.libor[scenario, month]),
+                        current_credit_score=loan.current_credit_score
+                        + int(shocks.credit_score_shift[scenario, month]),
+                    )
+                )
+                loan = replace(loan, amount=repayment.amount_remaining, remaining_duration=repayment.remaining_duration)
+    return time.perf_counter() - began
+
+
+@click.command()
+@click.option("--loans", "count", default=10_000, help="Number of loans in the portfolio")
+@click.option("--scenarios", default=200, help="Number of scenarios")
+@click.option("--months", default=12, help="Number of months simulated")
+@click.option("--max-workers", default=os.cpu_count() or 1, help="Largest worker count to measure")
+def main(count: int, scenarios: int, months: int, max_workers: int):
+    loans = generate_loans(count)
+    batch = LoanBatch.from_loans(loans)
+    shocks = ScenarioShocks.random_walk(scenarios, months, libor=3.0, credit_score_volatility=15, seed=1)
+    cells = count * scenarios * months
+    print(f"Loans: {count}, scenarios: {scenarios}, months: {months}, CPUs: {os.cpu_count()}")
+
+    # The scalar loop is timed on a few scenarios and scaled up
+    sample = min(scenarios, 2)
+    scalar = scalar_seconds(loans, shocks[:sample]) * scenarios / sample
+    print(f"{'Scalar (estimated)':<32}{scalar:9.2f}s{cells / scalar:14,.0f} loan-months/s")
+    for block_size in [100_000, 1_000_000]:
+        workers = 1
+        while workers <= max_workers:
+            tracemalloc.start()
+            result = run_scenarios(batch, shocks, workers=workers, block_size=block_size)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"block {block_size:>9,} {workers:>2} workers{result.seconds:9.2f}s{cells / result.seconds:14,.0f}"
+                f" loan-months/s  {scalar / result.seconds:5.1f}x  peak {peak / 2**20:,.0f}MB"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import click
+
+from exercises.strategy.batch import LoanBatch
+from exercises.strategy.schedule import create_repayment_schedule, iter_schedule
+
+from .loans import generate_loans
+from .timing import best_of
+
+
+@click.command()
+@click.option("--loans", "count", default=100_000, help="Number of loans in the portfolio")
+@click.option("--repeat", default=3, help="Number of timed runs, the best one is reported")
+def main(count: int, repeat: int):
+    loans = generate_loans(count)
+    batch = LoanBatch.from_loans(loans)
+    rows = int(batch.remaining_duration.sum())
+
+    scalar = best_of(repeat, lambda: [sum(1 for _ in iter_schedule(loan)) for loan in loans])
+    vectorised = best_of(repeat, lambda: create_repayment_schedule(batch))
+
+    print(f"Loans: {count}, schedule rows: {rows}")
+    print(f"Scalar: {scalar:8.3f}s {rows / scalar:14,.0f} rows/s")
+    print(f"Batch:  {vectorised:8.3f}s {rows / vectorised:14,.0f} rows/s")
+    print(f"Speedup: {scalar / vectorised:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
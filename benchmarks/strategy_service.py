@@ -0,0 +1,54 @@
+import asyncio
+import statistics
+import time
+
+import click
+
+from exercises.strategy.service import RepaymentService
+from exercises.strategy.strategy import LoanInfo, create_monthly_repayment
+
+from .loans import generate_loans
+
+
+async def direct(loan_info: LoanInfo):
+    return create_monthly_repayment(loan_info)
+
+
+async def load(request, loans: list[LoanInfo], clients: int) -> tuple[list[float], float]:
+    # Every client sends its share of the requests one after the other, like a caller waiting for each response
+    latencies: list[float] = []
+
+    async def client(share: list[LoanInfo]):
+        for loan_info in share:
+            start = time.perf_counter()
+            await request(loan_info)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(loans[index::clients]) for index in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def report(name: str, latencies: list[float], seconds: float):
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{name:<28}{percentiles[49] * 1e6:10.0f}us{percentiles[98] * 1e6:10.0f}us{len(latencies) / seconds:14,.0f}")
+
+
+@click.command()
+@click.option("--requests", "count", default=100_000, help="Number of requests")
+@click.option("--clients", default=500, help="Number of concurrent clients")
+@click.option("--max-wait", default=0.001, help="Longest time a request waits for its batch to fill up, in seconds")
+def main(count: int, clients: int, max_wait: float):
+    loans = generate_loans(count)
+    print(f"Requests: {count}, concurrent clients: {clients}")
+    print(f"{'Mode':<28}{'p50':>12}{'p99':>12}{'requests/s':>14}")
+    report("Without micro-batching", *asyncio.run(load(direct, loans, clients)))
+    for max_batch_size in [16, 64, 256]:
+        service = RepaymentService(max_batch_size=max_batch_size, max_wait=max_wait)
+        report(
+            f"Micro-batches of {max_batch_size}", *asyncio.run(load(service.create_monthly_repayment, loans, clients))
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+import click
+import numpy as np
+
+from exercises.composite.batch import UserDataBatch, validate_batch
+from exercises.composite.compiled import compile_validator
+from exercises.composite.composite import validate
+from exercises.composite.composite_solution import create_user_data_validator
+from exercises.strategy.batch import LoanBatch, create_monthly_repayments
+from exercises.strategy.schedule import create_repayment_schedule
+from exercises.strategy.strategy import create_monthly_repayment
+
+from .loans import BOOK_MIX, generate_loans
+from .registrations import generate_registrations
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+# A benchmark case. setup builds the synthetic input of the given size outside of the timings, and returns the
+# function that is timed.
+@dataclass
+class Case:
+    name: str
+    size: int
+    setup: Callable[[int], Callable[[], object]]
+
+
+@dataclass
+class Measurement:
+    name: str
+    size: int
+    seconds: float
+    peak_bytes: int
+
+    @property
+    def microseconds_per_item(self) -> float:
+        return self.seconds / self.size * 1e6
+
+
+def loan_book(size: int, uniform: bool = False) -> list:
+    return generate_loans(size, seed=1, kind_weights=None if uniform else BOOK_MIX)
+
+
+def scalar_repayments(size: int) -> Callable[[], object]:
+    loans = loan_book(size)
+    return lambda: [create_monthly_repayment(loan) for loan in loans]
+
+
+def batch_repayments(size: int, uniform: bool = False) -> Callable[[], object]:
+    batch = LoanBatch.from_loans(loan_book(size, uniform))
+    return lambda: create_monthly_repayments(batch)
+
+
+def batch_conversion(size: int) -> Callable[[], object]:
+    loans = loan_book(size)
+    return lambda: LoanBatch.from_loans(loans)
+
+
+def repayment_schedules(size: int) -> Callable[[], object]:
+    batch = LoanBatch.from_loans(loan_book(size))
+    return lambda: create_repayment_schedule(batch)
+
+
+def validate_function(size: int, valid_ratio: float = 0.95) -> Callable[[], object]:
+    registrations = generate_registrations(size, valid_ratio, seed=1)
+    return lambda: [validate(user_data) for user_data in registrations]
+
+
+def validate_tree(size: int, valid_ratio: float = 0.95) -> Callable[[], object]:
+    registrations = generate_registrations(size, valid_ratio, seed=1)
+    validator = create_user_data_validator()
+    return lambda: [validator.validate(user_data) for user_data in registrations]
+
+
+def validate_compiled(size: int, valid_ratio: float = 0.95) -> Callable[[], object]:
+    registrations = generate_registrations(size, valid_ratio, seed=1)
+    validator = compile_validator(create_user_data_validator())
+    return lambda: [validator.validate_fast(user_data) for user_data in registrations]
+
+
+def validate_vectorised(size: int, valid_ratio: float = 0.95) -> Callable[[], object]:
+    registrations = generate_registrations(size, valid_ratio, seed=1)
+    validator = create_user_data_validator()
+    return lambda: validate_batch(validator, UserDataBatch.from_records(registrations))
+
+
+CASES = [
+    Case("strategy.scalar", 100_000, scalar_repayments),
+    Case("strategy.batch", 500_000, batch_repayments),
+    Case("strategy.batch_uniform_mix", 500_000, lambda size: batch_repayments(size, uniform=True)),
+    Case("strategy.batch_conversion", 200_000, batch_conversion),
+    Case("strategy.schedule", 5_000, repayment_schedules),
+    Case("composite.function", 50_000, validate_function),
+    Case("composite.tree", 50_000, validate_tree),
+    Case("composite.tree_half_invalid", 50_000, lambda size: validate_tree(size, valid_ratio=0.5)),
+    Case("composite.compiled", 50_000, validate_compiled),
+    Case("composite.compiled_half_invalid", 50_000, lambda size: validate_compiled(size, valid_ratio=0.5)),
+    Case("composite.batch", 200_000, validate_vectorised),
+]
+
+
+def measure(case: Case, scale: float, repeat: int) -> Measurement:
+    size = max(int(case.size * scale), 1)
+    function = case.setup(size)
+    function()
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - began)
+    # Memory is traced in a separate run, as tracing slows the code down
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return Measurement(name=case.name, size=size, seconds=min(timings), peak_bytes=peak_bytes)
+
+
+def machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def read_results(path: str) -> dict[str, Measurement]:
+    try:
+        with open(path) as file:
+            results = json.load(file)["results"]
+        return {name: Measurement(**result) for name, result in results.items()}
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        raise click.ClickException(f"Cannot read benchmark results from {path}: {error}")
+
+
+def compare_results(
+    baseline: dict[str, Measurement], current: dict[str, Measurement], threshold: float, memory_threshold: float
+) -> list[str]:
+    # Prints the change of every case present in both runs, and returns the cases that got slower or bigger than the
+    # thresholds allow. Cases are compared per item, so runs of different sizes can still be compared.
+    regressions = []
+    print(f"{'Case':<36}{'baseline':>12}{'current':>12}{'change':>9}{'peak change':>13}")
+    for name, measurement in current.items():
+        if name not in baseline:
+            print(f"{name:<36}{'':>12}{measurement.microseconds_per_item:>10.3f}us    (new)")
+            continue
+        before = baseline[name]
+        change = measurement.microseconds_per_item / before.microseconds_per_item - 1
+        peak_change = (measurement.peak_bytes / measurement.size) / max(before.peak_bytes / before.size, 1e-9) - 1
+        flags = []
+        if change > threshold:
+            flags.append("SLOWER")
+        if peak_change > memory_threshold:
+            flags.append("MORE MEMORY")
+        if flags:
+            regressions.append(name)
+        print(
+            f"{name:<36}{before.microseconds_per_item:>10.3f}us{measurement.microseconds_per_item:>10.3f}us"
+            f"{change:>+9.1%}{peak_change:>+13.1%}  {' '.join(flags)}"
+        )
+    return regressions
+
+
+@click.group()
+def main():
+    pass
+
+
+@main.command(help="Run the benchmark cases and optionally save the results or compare them to a baseline")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the results to this JSON file")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Compare the results to this file")
+@click.option("--only", "patterns", multiple=True, help="Only run the cases whose name starts with this")
+@click.option("--scale", default=1.0, show_default=True, help="Multiplies the size of every case")
+@click.option("--repeat", default=3, show_default=True, help="Number of timed runs, the best one is kept")
+@click.option("--threshold", default=0.3, show_default=True, help="Largest allowed slowdown per item")
+@click.option("--memory-threshold", default=0.2, show_default=True, help="Largest allowed memory peak growth")
+def run(
+    output: str | None,
+    baseline: str | None,
+    patterns: tuple[str, ...],
+    scale: float,
+    repeat: int,
+    threshold: float,
+    memory_threshold: float,
+):
+    cases = [case for case in CASES if not patterns or case.name.startswith(patterns)]
+    results = {}
+    print(f"{'Case':<36}{'size':>10}{'seconds':>10}{'per item':>12}{'peak':>10}")
+    for case in cases:
+        measurement = measure(case, scale, repeat)
+        results[case.name] = measurement
+        print(
+            f"{case.name:<36}{measurement.size:>10}{measurement.seconds:>10.4f}"
+            f"{measurement.microseconds_per_item:>10.3f}us{measurement.peak_bytes / 2**20:>8.1f}MB"
+        )
+    if output:
+        with open(output, "w") as file:
+            json.dump(
+                {"machine": machine(), "results": {name: asdict(result) for name, result in results.items()}},
+                file,
+                indent=2,
+            )
+    if baseline:
+        print()
+        if compare_results(read_results(baseline), results, threshold, memory_threshold):
+            sys.exit(1)
+
+
+@main.command(help="Compare two saved runs and fail when a case got slower or bigger than the thresholds allow")
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False))
+@click.option("--threshold", default=0.3, show_default=True, help="Largest allowed slowdown per item")
+@click.option("--memory-threshold", default=0.2, show_default=True, help="Largest allowed memory peak growth")
+def compare(baseline: str, current: str, threshold: float, memory_threshold: float):
+    if compare_results(read_results(baseline), read_results(current), threshold, memory_threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
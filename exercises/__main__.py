@@ -1,16 +1,12 @@
 import click
-from .composite import run_example as composite
-from .strategy import run_example as strategy
 
+from .commands import LazyGroup
 
-@click.group()
+
+@click.group(cls=LazyGroup)
 def cli():
     pass
 
 
-cli.command(name="composite", help="Composite exercise example")(composite)
-cli.command(name="strategy", help="Strategy exercise example")(strategy)
-
-
 if __name__ == "__main__":
     cli()
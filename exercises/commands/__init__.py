@@ -0,0 +1,83 @@
+import importlib
+import json
+import os
+
+import click
+
+# Every module of this package defines one subcommand, as a click command named `command`. The module of a
+# subcommand is its name with dashes replaced by underscores, so running a subcommand imports only its own module.
+COMMANDS_PACKAGE = __name__
+# Paths are handled with os.path, as importing pathlib would take longer than running a small subcommand
+COMMANDS_DIRECTORY = os.path.dirname(__file__)
+MANIFEST_PATH = os.path.join(COMMANDS_DIRECTORY, "__pycache__", "manifest.json")
+
+
+def module_name(command_name: str) -> str:
+    return command_name.replace("-", "_")
+
+
+def command_sources() -> dict[str, int]:
+    # The modification time of every command module, which tells when the manifest needs rebuilding
+    return {
+        entry.name: entry.stat().st_mtime_ns
+        for entry in os.scandir(COMMANDS_DIRECTORY)
+        if entry.name.endswith(".py") and not entry.name.startswith(("_", "test_"))
+    }
+
+
+def load_command(name: str) -> click.Command | None:
+    # Only command modules resolve, so private modules and tests are "No such command" like any unknown name
+    module = module_name(name)
+    if f"{module}.py" not in command_sources():
+        return None
+    return importlib.import_module(f"{COMMANDS_PACKAGE}.{module}").command
+
+
+def build_manifest(sources: dict[str, int]) -> dict:
+    # Imports every command module, so is only done when the cached manifest is missing or out of date
+    commands = {}
+    for source in sorted(sources):
+        command = importlib.import_module(f"{COMMANDS_PACKAGE}.{source.removesuffix('.py')}").command
+        commands[command.name] = {"help": command.get_short_help_str(limit=80)}
+    return {"sources": sources, "commands": commands}
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    # The names and short help of all subcommands, cached in a file next to the command modules' bytecode. The cache
+    # is only a speed-up, so an unreadable or unwritable cache file falls back to building the manifest.
+    sources = command_sources()
+    try:
+        with open(path) as file:
+            manifest = json.load(file)
+        if manifest.get("sources") == sources:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    manifest = build_manifest(sources)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(manifest, file)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+    return manifest
+
+
+# A click group whose subcommands are imported when they are run. Listing them, as --help does, reads their names and
+# help from the manifest instead of importing them.
+class LazyGroup(click.Group):
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(load_manifest()["commands"]))
+
+    def get_command(self, ctx: click.Context, name: str) -> click.Command | None:
+        return super().get_command(ctx, name) or load_command(name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        commands = load_manifest()["commands"]
+        rows = [(name, commands[name]["help"]) for name in self.list_commands(ctx) if name in commands]
+        rows += [(name, command.get_short_help_str()) for name, command in self.commands.items()]
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(sorted(rows))
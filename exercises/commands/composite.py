@@ -0,0 +1,5 @@
+import click
+
+from ..composite import run_example
+
+command = click.command(name="composite", help="Composite exercise example")(run_example)
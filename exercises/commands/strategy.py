@@ -0,0 +1,5 @@
+import click
+
+from ..strategy.strategy import run_example
+
+command = click.command(name="strategy", help="Strategy exercise example")(run_example)
@@ -0,0 +1,16 @@
+import click
+
+from ..strategy.pipeline import process_file
+
+
+@click.command(name="strategy-file", help="Calculate the monthly repayments of a CSV or JSONL file of loans")
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_path", type=click.Path(dir_okay=False))
+@click.option("--chunk-size", default=100_000, show_default=True, help="Number of loans processed at a time")
+@click.option("--mmap", "memory_map", is_flag=True, help="Memory map the input file")
+def command(input_path: str, output_path: str, chunk_size: int, memory_map: bool):
+    try:
+        count = process_file(input_path, output_path, chunk_size, memory_map)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    click.echo(f"Wrote {count} monthly repayments to {output_path}")
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from ..__main__ import cli
+from . import build_manifest, command_sources, load_command, load_manifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+COMMANDS = ["composite", "strategy", "strategy-file", "validate"]
+
+
+def test_subcommand_imports_only_its_module():
+    script = (
+        "import sys\n"
+        "from exercises.__main__ import cli\n"
+        "cli(['strategy'], standalone_mode=False)\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = output.stdout.splitlines()[-1].split()
+    assert "exercises.commands.strategy" in modules
+    assert not [module for module in modules if module.startswith(("numpy", "exercises.composite"))]
+    assert not [module for module in modules if module.startswith("exercises.commands.") and "strategy" not in module]
+
+
+def test_help_lists_every_command():
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for name in COMMANDS:
+        assert name in result.output
+
+
+@pytest.mark.parametrize("name", ["nope", "test-commands", "test_commands"])
+def test_unknown_command(name: str):
+    result = CliRunner().invoke(cli, [name])
+    assert result.exit_code == 2
+    assert f"No such command '{name}'" in result.output
+
+
+def test_only_command_modules_load():
+    # click reads a name starting with an underscore as an option, so the group shows its usage for those instead
+    assert load_command("__init__") is None
+    assert load_command("test-commands") is None
+    assert load_command("strategy-file").name == "strategy-file"
+
+
+def test_manifest_is_cached(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache" / "manifest.json")
+    manifest = load_manifest(path)
+    assert sorted(manifest["commands"]) == COMMANDS
+    with open(path) as file:
+        assert json.load(file) == manifest
+
+    monkeypatch.setattr(sys.modules[__package__], "build_manifest", lambda sources: 1 / 0)
+    assert load_manifest(path) == manifest
+
+
+def test_manifest_is_rebuilt_when_out_of_date(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    stale = build_manifest(command_sources())
+    stale["sources"]["strategy.py"] -= 1
+    stale["commands"] = {}
+    with open(path, "w") as file:
+        json.dump(stale, file)
+    assert sorted(load_manifest(path)["commands"]) == COMMANDS
+
+
+def test_run_subcommand(tmp_path):
+    input_path = tmp_path / "records.jsonl"
+    input_path.write_text('{"federation_provider": "foo", "federation_id": "abc"}\n{}\n')
+    result = CliRunner().invoke(cli, ["validate", str(input_path), str(tmp_path / "results.jsonl"), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    assert "1 valid, 1 invalid" in result.output
@@ -0,0 +1,36 @@
+import json
+import os
+
+import click
+
+from ..composite.bulk import validate_file
+from ..composite.schema import build_validator, parse_schema, schema_format_of
+
+
+@click.command(name="validate", help="Validate a CSV or JSONL file of registrations into a CSV or JSONL results file")
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_path", type=click.Path(dir_okay=False))
+@click.option("--schema", "schema_path", type=click.Path(exists=True, dir_okay=False), help="JSON or TOML schema")
+@click.option("--workers", default=os.cpu_count() or 1, show_default=True, help="Number of worker processes")
+@click.option("--chunk-size", default=1_000, show_default=True, help="Number of records sent to a worker at a time")
+@click.option("--summary", "summary_path", type=click.Path(dir_okay=False), help="Write the summary as JSON")
+def command(
+    input_path: str, output_path: str, schema_path: str | None, workers: int, chunk_size: int, summary_path: str | None
+):
+    try:
+        validator = None
+        if schema_path:
+            with open(schema_path, "rb") as file:
+                validator = build_validator(parse_schema(file.read(), schema_format_of(schema_path)))
+        summary = validate_file(input_path, output_path, validator, workers, chunk_size)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    if summary_path:
+        with open(summary_path, "w") as file:
+            json.dump(summary.to_dict(), file, indent=2)
+    click.echo(
+        f"Validated {summary.records} records in {summary.seconds:.2f}s ({summary.records_per_second:,.0f} records/s): "
+        f"{summary.valid} valid, {summary.invalid} invalid"
+    )
+    for rule, count in summary.failures_by_rule.most_common():
+        click.echo(f"  {rule:<48}{count:>10}")
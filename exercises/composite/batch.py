@@ -0,0 +1,242 @@
+import operator
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from functools import cache, cached_property
+from itertools import repeat
+
+import numpy as np
+
+from .composite_solution import (
+    AllFieldsValidator,
+    AtleastOneFieldValidator,
+    ContainsAlphanumericValidator,
+    ContainsDigitValidator,
+    LengthValidator,
+    MinLengthValidator,
+    NameValidator,
+    OnlyAlphanumericOrUnderscoreValidator,
+    OnlyDigitValidator,
+    OptionValidator,
+    PropertyValidator,
+    Validator,
+)
+from .rules import SPECIAL_CHARACTERS, WORD_CHARACTERS
+
+# Rows validated at once, which bounds the memory used for the results of every node in the tree
+BLOCK_SIZE = 10_000
+
+
+# Columnar counterpart of a list of user data dicts: one sequence of values per property, with None where a record
+# does not have the property. Properties without a column are missing from every record.
+@dataclass
+class UserDataBatch:
+    columns: dict[str, Sequence[str | None]]
+    size: int
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, str]]) -> "UserDataBatch":
+        records = list(records)
+        properties = dict.fromkeys(property for user_data in records for property in user_data)
+        columns = {property: [user_data.get(property) for user_data in records] for property in properties}
+        return cls(columns=columns, size=len(records))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: slice) -> "UserDataBatch":
+        columns = {property: values[index] for property, values in self.columns.items()}
+        return UserDataBatch(columns=columns, size=len(range(self.size)[index]))
+
+    def record(self, index: int) -> dict[str, str]:
+        return {property: values[index] for property, values in self.columns.items() if values[index] is not None}
+
+
+@cache
+def character_table(predicate: Callable[[str], bool]) -> np.ndarray:
+    # Predicate of every character of the Basic Multilingual Plane, the rest are looked up one by one
+    return np.fromiter((predicate(chr(code)) for code in range(0x10000)), dtype=bool, count=0x10000)
+
+
+# The values of one property, with the lengths and characters shared by all the leaf checks on it. The characters
+# of all the values are held back to back in one array, value i taking up codes[starts[i]:ends[i]].
+class Column:
+    def __init__(self, values: Sequence[str | None] | None, size: int) -> None:
+        self.values = [None] * size if values is None else values
+        self.present = np.fromiter(map(operator.is_not, self.values, repeat(None)), dtype=bool, count=size)
+        self.strings = ["" if value is None else value for value in self.values]
+        self.lengths = np.fromiter(map(len, self.strings), dtype=np.int64, count=size)
+        self.ends = np.cumsum(self.lengths)
+        self.starts = self.ends - self.lengths
+
+    @cached_property
+    def codes(self) -> np.ndarray:
+        characters = "".join(self.strings).encode("utf-32-le", "surrogatepass")
+        return np.frombuffer(characters, dtype=np.uint32)
+
+    def characters(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        matches = character_table(predicate)[np.minimum(self.codes, 0xFFFF)]
+        astral = self.codes > 0xFFFF
+        if astral.any():
+            matches[astral] = [predicate(chr(code)) for code in self.codes[astral].tolist()]
+        return matches
+
+    def count(self, matches: np.ndarray, skip_first: bool = False) -> np.ndarray:
+        # Number of matching characters in each value
+        totals = np.concatenate(([0], np.cumsum(matches)))
+        starts = np.minimum(self.starts + 1, self.ends) if skip_first else self.starts
+        return totals[self.ends] - totals[starts]
+
+    def first(self, matches: np.ndarray) -> np.ndarray:
+        # Whether the first character of each value matches, False for empty values
+        nonempty = self.lengths > 0
+        first = np.zeros(len(self.lengths), dtype=bool)
+        first[nonempty] = matches[self.starts[nonempty]]
+        return first
+
+    def any_character(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        return self.count(self.characters(predicate)) > 0
+
+    def all_characters(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        return self.count(self.characters(predicate)) == self.lengths
+
+
+def is_digit(character: str) -> bool:
+    return character.isdigit()
+
+
+def is_special(character: str) -> bool:
+    return character in SPECIAL_CHARACTERS
+
+
+def is_word(character: str) -> bool:
+    return character in WORD_CHARACTERS
+
+
+def is_upper(character: str) -> bool:
+    return character.isupper()
+
+
+def is_lower(character: str) -> bool:
+    return character.islower()
+
+
+def is_upper_or_title(character: str) -> bool:
+    # For a single character, istitle() holds for uppercase and titlecase characters
+    return character.istitle()
+
+
+def valid_names(column: Column) -> np.ndarray:
+    # value[1:].islower() holds when there is a lowercase and no uppercase or titlecase character after the first one
+    first_upper = column.first(column.characters(is_upper))
+    any_lower = column.count(column.characters(is_lower), skip_first=True) > 0
+    any_upper = column.count(column.characters(is_upper_or_title), skip_first=True) > 0
+    return column.present & (column.lengths >= 2) & first_upper & any_lower & ~any_upper
+
+
+# Leaf checks over a whole column, by validator type. Other leaves are checked one value at a time with is_valid.
+VECTORISED_VALIDATORS: dict[type, Callable[[PropertyValidator, Column], np.ndarray]] = {
+    LengthValidator: lambda validator, column: (
+        column.present & (validator.min <= column.lengths) & (column.lengths <= validator.max)
+    ),
+    MinLengthValidator: lambda validator, column: column.present & (column.lengths >= validator.min),
+    ContainsDigitValidator: lambda validator, column: column.present & column.any_character(is_digit),
+    OnlyDigitValidator: lambda validator, column: (
+        column.present & (column.lengths > 0) & column.all_characters(is_digit)
+    ),
+    ContainsAlphanumericValidator: lambda validator, column: column.present & column.any_character(is_special),
+    OnlyAlphanumericOrUnderscoreValidator: lambda validator, column: column.present & column.all_characters(is_word),
+    NameValidator: lambda validator, column: valid_names(column),
+    OptionValidator: lambda validator, column: np.fromiter(
+        map(set(validator.options).__contains__, column.values), dtype=bool, count=len(column.values)
+    ),
+}
+
+
+@dataclass
+class BatchResult:
+    valid: np.ndarray
+    # Error lines of the invalid rows only, by row
+    errors: dict[int, list[str]]
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def __getitem__(self, index: int) -> tuple[bool, list[str]]:
+        # The same result validate() gives for the record
+        if self.valid[index]:
+            return (True, [])
+        return (False, self.errors[index])
+
+
+# Nodes of the tree are numbered in post-order, as in the compiled validator, so the results of every node are rows
+# of one array, and the results of the invalid records can be turned into plain lists before rendering their errors.
+class BatchEvaluation:
+    def __init__(self, batch: UserDataBatch) -> None:
+        self.batch = batch
+        self.columns: dict[str, Column] = {}
+        # Per node: its results, the error text of a leaf or the header of a composite, and its children
+        self.results: list[np.ndarray] = []
+        self.texts: list[str] = []
+        self.children: list[tuple[int, ...]] = []
+        # Errors of the validators evaluated one record at a time, by node
+        self.opaque_errors: dict[int, list[list[str]]] = {}
+
+    def column(self, property: str) -> Column:
+        if property not in self.columns:
+            self.columns[property] = Column(self.batch.columns.get(property), self.batch.size)
+        return self.columns[property]
+
+    def _add_node(self, result: np.ndarray, text: str, children: tuple[int, ...] = ()) -> int:
+        self.results.append(result)
+        self.texts.append(text)
+        self.children.append(children)
+        return len(self.results) - 1
+
+    def evaluate(self, validator: Validator) -> int:
+        if isinstance(validator, (AllFieldsValidator, AtleastOneFieldValidator)):
+            children = tuple(self.evaluate(child) for child in validator.validators)
+            results = [self.results[child] for child in children]
+            if isinstance(validator, AllFieldsValidator):
+                result = np.logical_and.reduce(results) if results else np.ones(self.batch.size, dtype=bool)
+            else:
+                result = np.logical_or.reduce(results) if results else np.zeros(self.batch.size, dtype=bool)
+            return self._add_node(result, validator.error, children)
+        if type(validator) in VECTORISED_VALIDATORS:
+            result = VECTORISED_VALIDATORS[type(validator)](validator, self.column(validator.property))
+            return self._add_node(result, validator.error)
+        if isinstance(validator, PropertyValidator):
+            values = self.column(validator.property).values
+            result = np.fromiter(map(validator.is_valid, values), dtype=bool, count=self.batch.size)
+            return self._add_node(result, validator.error)
+        outcomes = [validator.validate(self.batch.record(row)) for row in range(self.batch.size)]
+        result = np.fromiter((valid for valid, _ in outcomes), dtype=bool, count=self.batch.size)
+        node = self._add_node(result, "")
+        self.opaque_errors[node] = [errors for _, errors in outcomes]
+        return node
+
+    def render(self, node: int, row: int, results: list[bool], depth: int, errors: list[str]) -> None:
+        indent = "\t" * depth
+        if node in self.opaque_errors:
+            errors.extend(f"{indent}{error}" for error in self.opaque_errors[node][row])
+            return
+        errors.append(f"{indent}{self.texts[node]}")
+        for child in self.children[node]:
+            if not results[child]:
+                self.render(child, row, results, depth + 1, errors)
+
+
+def validate_batch(validator: Validator, batch: UserDataBatch, block_size: int = BLOCK_SIZE) -> BatchResult:
+    # Evaluates every leaf over a whole column, combines the columns of results through the tree, and only renders
+    # the error text of the invalid rows
+    valid = np.empty(batch.size, dtype=bool)
+    errors: dict[int, list[str]] = {}
+    for start in range(0, batch.size, block_size):
+        evaluation = BatchEvaluation(batch[start : start + block_size])
+        root = evaluation.evaluate(validator)
+        valid[start : start + block_size] = evaluation.results[root]
+        invalid = np.flatnonzero(~evaluation.results[root])
+        node_results = np.array(evaluation.results)[:, invalid].T.tolist()
+        for row, results in zip(invalid.tolist(), node_results):
+            errors[start + row] = row_errors = []
+            evaluation.render(root, row, results, 0, row_errors)
+    return BatchResult(valid=valid, errors=errors)
@@ -0,0 +1,174 @@
+import csv
+import json
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO
+
+from ..io import file_type_of, open_lines, read_records
+from .compiled import CompiledValidator, compile_validator
+from .composite_solution import PropertyValidator, ValidationError, Validator, create_user_data_validator
+from .schema import LEAF_VALIDATORS
+
+RESULT_FIELDS = ["line", "valid", "errors"]
+LEAF_RULES = {validator_type: rule for rule, validator_type in LEAF_VALIDATORS.items()}
+
+# The validator of a process pool worker, compiled once when the worker starts
+_worker_validator: CompiledValidator | None = None
+
+# One validated record: its line number, the error tree as a dict, or None when valid, and the rules that failed
+RecordResult = tuple[int, dict | None, list[str]]
+
+
+@dataclass
+class ImportSummary:
+    records: int = 0
+    valid: int = 0
+    seconds: float = 0.0
+    # Number of invalid records each leaf rule failed on, such as "password:contains_digit"
+    failures_by_rule: Counter = field(default_factory=Counter)
+
+    @property
+    def invalid(self) -> int:
+        return self.records - self.valid
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "records": self.records,
+            "valid": self.valid,
+            "invalid": self.invalid,
+            "seconds": self.seconds,
+            "records_per_second": self.records_per_second,
+            "failures_by_rule": dict(self.failures_by_rule.most_common()),
+        }
+
+
+def registration_of(record: dict, file_type: str) -> dict[str, str]:
+    # CSV has no way to leave out a property, so empty CSV cells count as missing properties
+    if file_type == "csv":
+        return {name: value for name, value in record.items() if name is not None and value not in (None, "")}
+    return {
+        name: value if isinstance(value, str) else json.dumps(value)
+        for name, value in record.items()
+        if value is not None
+    }
+
+
+def failing_rules(error: ValidationError) -> list[str]:
+    if error.lines is not None:
+        return [type(error.validator).__name__]
+    if isinstance(error.validator, PropertyValidator):
+        rule = LEAF_RULES.get(type(error.validator), type(error.validator).__name__)
+        return [f"{error.validator.property}:{rule}"]
+    return [rule for child in error.children for rule in failing_rules(child)]
+
+
+def validate_records(
+    validator: CompiledValidator, records: list[tuple[int, dict]], file_type: str
+) -> list[RecordResult]:
+    results = []
+    for line_number, record in records:
+        user_data = registration_of(record, file_type)
+        if validator.accepts(user_data):
+            results.append((line_number, None, []))
+            continue
+        error = validator.check(user_data)
+        results.append((line_number, error.to_dict(), failing_rules(error)))
+    return results
+
+
+def _start_worker(validator: Validator) -> None:
+    global _worker_validator
+    _worker_validator = compile_validator(validator)
+
+
+def _validate_in_worker(records: list[tuple[int, dict]], file_type: str) -> list[RecordResult]:
+    return validate_records(_worker_validator, records, file_type)
+
+
+def read_chunks(path: str | Path, chunk_size: int) -> Iterator[list[tuple[int, dict]]]:
+    file_type = file_type_of(path)
+    with open_lines(path) as lines:
+        chunk = []
+        for line_number, record in read_records(lines, file_type):
+            chunk.append((line_number, record))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class ResultWriter:
+    def __init__(self, file: IO[str], file_type: str) -> None:
+        self.file = file
+        self.csv_writer = None
+        if file_type == "csv":
+            self.csv_writer = csv.writer(file)
+            self.csv_writer.writerow(RESULT_FIELDS)
+
+    def write(self, results: list[RecordResult]) -> None:
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(
+                (line_number, error is None, "" if error is None else json.dumps(error))
+                for line_number, error, _ in results
+            )
+            return
+        self.file.writelines(
+            json.dumps({"line": line_number, "valid": error is None, "errors": error}) + "\n"
+            for line_number, error, _ in results
+        )
+
+
+# Validates a CSV or JSONL file of registrations into a CSV or JSONL file of results, in input order. The input is
+# read one chunk at a time, and at most two chunks per worker are in flight, so memory stays bounded whatever the size
+# of the file. With more than one worker the chunks run on a process pool whose workers each compile the tree once.
+def validate_file(
+    input_path: str | Path,
+    output_path: str | Path,
+    validator: Validator | None = None,
+    workers: int = 1,
+    chunk_size: int = 1_000,
+) -> ImportSummary:
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    input_type, output_type = file_type_of(input_path), file_type_of(output_path)
+    validator = create_user_data_validator() if validator is None else validator
+    summary = ImportSummary()
+    began = time.perf_counter()
+
+    def write(results: list[RecordResult]) -> None:
+        writer.write(results)
+        summary.records += len(results)
+        for _, error, rules in results:
+            if error is None:
+                summary.valid += 1
+            summary.failures_by_rule.update(set(rules))
+
+    with open(output_path, "w", newline="") as output:
+        writer = ResultWriter(output, output_type)
+        if workers == 1:
+            compiled = compile_validator(validator)
+            for chunk in read_chunks(input_path, chunk_size):
+                write(validate_records(compiled, chunk, input_type))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_start_worker, initargs=(validator,)) as executor:
+                pending: deque[Future] = deque()
+                for chunk in read_chunks(input_path, chunk_size):
+                    pending.append(executor.submit(_validate_in_worker, chunk, input_type))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+    summary.seconds = time.perf_counter() - began
+    return summary
@@ -0,0 +1,143 @@
+import copy
+import functools
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from .composite_solution import (
+    AllFieldsValidator,
+    AtleastOneFieldValidator,
+    LengthValidator,
+    MinLengthValidator,
+    PropertyValidator,
+    Validator,
+)
+
+COMPOSITES = (AllFieldsValidator, AtleastOneFieldValidator)
+# Rules that only compare the length of the value are cheaper to run than to look up
+UNCACHED_RULES = (LengthValidator, MinLengthValidator)
+
+
+@dataclass
+class LeafCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def rule_key(validator: PropertyValidator) -> tuple:
+    # What a leaf's outcome depends on apart from the value: its type and parameters, but not the property it reads,
+    # so leaves applying the same rule to different properties share their entries
+    parameters = []
+    for name, value in sorted(vars(validator).items()):
+        if name == "property":
+            continue
+        if isinstance(value, (list, set, frozenset)):
+            value = tuple(value)
+        try:
+            hash(value)
+        except TypeError:
+            # Parameters that cannot be part of a key keep the validator to itself. Keying on the validator rather
+            # than its id keeps it alive, so a later validator can never reuse the id and be given its entries.
+            return (type(validator), validator)
+        parameters.append((name, value))
+    return (type(validator), tuple(parameters))
+
+
+# An opt-in cache of leaf outcomes, keyed by the leaf's rule and the value it checked. Leaf rules are pure functions
+# of the value, so a cached outcome is always the one the rule would return. Every rule gets its own LRU table of at
+# most max_size values, kept by functools.lru_cache, which is thread-safe and looks values up without running any
+# Python code. Values that cannot be hashed, such as lists from JSON records, skip the cache and run the rule. One
+# cache can be shared by any number of trees and threads. Copies and pickles of a cache, such as the ones sent to
+# process pool workers, start empty.
+class LeafResultCache:
+    def __init__(self, max_size: int = 10_000) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._functions: dict[tuple, Callable[[str | None], bool]] = {}
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple:
+        return (LeafResultCache, (self.max_size,))
+
+    def __len__(self) -> int:
+        return self.stats.size
+
+    def function(self, validator: PropertyValidator) -> Callable[[str | None], bool]:
+        # The cached is_valid of the validator's rule
+        key = rule_key(validator)
+        with self._lock:
+            if key not in self._functions:
+                self._functions[key] = functools.lru_cache(maxsize=self.max_size)(validator.is_valid)
+            cached = self._functions[key]
+
+        def is_valid(value: str | None) -> bool:
+            try:
+                return cached(value)
+            except TypeError:
+                return validator.is_valid(value)
+
+        return is_valid
+
+    @property
+    def stats(self) -> LeafCacheStats:
+        stats = LeafCacheStats()
+        with self._lock:
+            functions = list(self._functions.values())
+        for function in functions:
+            info = function.cache_info()
+            stats.hits += info.hits
+            stats.misses += info.misses
+            # Every miss adds an entry, so the misses that are no longer in the table have been evicted
+            stats.evictions += info.misses - info.currsize
+            stats.size += info.currsize
+        return stats
+
+    def clear(self) -> None:
+        # Also resets the counters
+        with self._lock:
+            for function in self._functions.values():
+                function.cache_clear()
+
+
+# A leaf whose is_valid is its rule's cached function, so a cache hit costs a single lookup
+class CachedLeafValidator(PropertyValidator):
+    def __init__(self, validator: PropertyValidator, cache: LeafResultCache) -> None:
+        super().__init__(validator.property)
+        self.validator = validator
+        self.cache = cache
+        self.is_valid = cache.function(validator)
+
+    def __reduce__(self) -> tuple:
+        return (CachedLeafValidator, (self.validator, self.cache))
+
+    @property
+    def error(self) -> str:
+        return self.validator.error
+
+
+def cache_validator(validator: Validator, cache: LeafResultCache, properties: Iterable[str] | None = None) -> Validator:
+    # A copy of the tree whose leaves use the cache, or only the leaves of the given properties. Properties whose
+    # values are mostly unique, such as ids and emails, only fill the cache with entries that are never hit. The copy
+    # is taken now, so later changes to the original tree, which would change the rules, do not affect it.
+    return _cache_leaves(copy.deepcopy(validator), cache, None if properties is None else set(properties))
+
+
+def _cache_leaves(validator: Validator, cache: LeafResultCache, properties: set[str] | None) -> Validator:
+    if isinstance(validator, COMPOSITES):
+        validator.validators = [_cache_leaves(child, cache, properties) for child in validator.validators]
+        return validator
+    if (
+        isinstance(validator, PropertyValidator)
+        and not isinstance(validator, UNCACHED_RULES)
+        and (properties is None or validator.property in properties)
+    ):
+        return CachedLeafValidator(validator, cache)
+    return validator
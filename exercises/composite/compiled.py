@@ -0,0 +1,186 @@
+from collections.abc import Callable
+
+from .composite_solution import (
+    AllFieldsValidator,
+    AtleastOneFieldValidator,
+    LengthValidator,
+    MinLengthValidator,
+    PropertyValidator,
+    ValidationError,
+    Validator,
+)
+
+COMPOSITES = (AllFieldsValidator, AtleastOneFieldValidator)
+
+
+def source_literal(value: object, namespace: dict[str, object]) -> str:
+    # Plain ints and strings are pasted into the generated source as literals, as their repr is always a literal.
+    # Any other value, whose repr could be arbitrary code, is passed to the function through its namespace instead.
+    if type(value) in (int, str):
+        return repr(value)
+    name = f"c{len(namespace)}"
+    namespace[name] = value
+    return name
+
+
+# A validator tree compiled into a single flat Python function. The function looks every property up once,
+# computes each property's length once for all the length checks on it, evaluates every node into a local boolean
+# and only builds error text when the user data is invalid.
+# Nodes are numbered in post-order, so every node comes after its children.
+class CompiledValidator(Validator):
+    def __init__(self, validator: Validator) -> None:
+        self.properties: list[str] = []
+        # Per node: its validator, the error text of a leaf or the header of a composite, and its children
+        self.validators: list[Validator] = []
+        self.texts: list[str] = []
+        self.children: list[tuple[int, ...]] = []
+        self.opaque_nodes: set[int] = set()
+        self._lines: list[str] = []
+        self._length_properties: set[int] = set()
+        self._namespace: dict[str, object] = {}
+        self.root = self._compile(validator)
+        self.evaluate = self._build()
+        self.accepts = self._build_accepts(validator)
+
+    @property
+    def tree(self) -> Validator:
+        # The validator tree this was compiled from
+        return self.validators[self.root]
+
+    def _property(self, property: str, length: bool = False) -> str:
+        if property not in self.properties:
+            self.properties.append(property)
+        index = self.properties.index(property)
+        if length:
+            self._length_properties.add(index)
+            return f"l{index}"
+        return f"v{index}"
+
+    def _literal(self, value: object) -> str:
+        return source_literal(value, self._namespace)
+
+    def _add_node(self, validator: Validator, children: tuple[int, ...] = ()) -> int:
+        self.validators.append(validator)
+        self.texts.append(validator.error if isinstance(validator, (PropertyValidator, *COMPOSITES)) else "")
+        self.children.append(children)
+        return len(self.texts) - 1
+
+    def _compile(self, validator: Validator) -> int:
+        if isinstance(validator, COMPOSITES):
+            children = tuple(self._compile(child) for child in validator.validators)
+            node = self._add_node(validator, children)
+            if isinstance(validator, AllFieldsValidator):
+                expression = " and ".join(f"r{child}" for child in children) or "True"
+            else:
+                expression = " or ".join(f"r{child}" for child in children) or "False"
+            self._lines.append(f"r{node} = {expression}")
+            return node
+
+        node = self._add_node(validator)
+        if type(validator) is LengthValidator:
+            length = self._property(validator.property, length=True)
+            self._lines.append(
+                f"r{node} = {self._literal(validator.min)} <= {length} <= {self._literal(validator.max)}"
+            )
+        elif type(validator) is MinLengthValidator:
+            length = self._property(validator.property, length=True)
+            self._lines.append(f"r{node} = {length} >= {self._literal(validator.min)}")
+        elif isinstance(validator, PropertyValidator):
+            self._namespace[f"check{node}"] = validator.is_valid
+            self._lines.append(f"r{node} = check{node}({self._property(validator.property)})")
+        else:
+            # Validators the compiler does not know are called as they are, and keep their own error text
+            self.opaque_nodes.add(node)
+            self._namespace[f"validate{node}"] = validator.validate
+            self._lines.append(f"r{node}, e{node} = validate{node}(user_data)")
+        return node
+
+    def _build(self) -> Callable[[dict[str, str]], tuple]:
+        lookups = [f"v{index} = get({self._literal(property)})" for index, property in enumerate(self.properties)]
+        lengths = [f"l{index} = -1 if v{index} is None else len(v{index})" for index in sorted(self._length_properties)]
+        results = ", ".join(f"r{node}" for node in range(len(self.texts)))
+        opaque_errors = ", ".join(f"{node}: e{node}" for node in sorted(self.opaque_nodes))
+        body = [
+            "get = user_data.get",
+            *lookups,
+            *lengths,
+            *self._lines,
+            f"if r{self.root}:",
+            "    return True, None, None",
+            f"return False, ({results},), {{{opaque_errors}}}",
+        ]
+        source = "def evaluate(user_data):\n" + "".join(f"    {line}\n" for line in body)
+        namespace = dict(self._namespace)
+        # The source only holds names generated here and literals made by source_literal
+        exec(compile(source, "<compiled validator>", "exec"), namespace)  # noqa: S102
+        return namespace["evaluate"]
+
+    def _accepts_expression(self, validator: Validator, namespace: dict[str, object]) -> str:
+        # A nested and/or expression, so Python's short-circuiting skips every check that can't change the outcome.
+        # Every leaf looks up its own property, as the leaves before it may have been skipped.
+        if isinstance(validator, COMPOSITES):
+            expressions = [self._accepts_expression(child, namespace) for child in validator.validators]
+            if isinstance(validator, AllFieldsValidator):
+                return f"({' and '.join(expressions) or 'True'})"
+            return f"({' or '.join(expressions) or 'False'})"
+        leaf = len(namespace)
+        if type(validator) is LengthValidator:
+            namespace[f"x{leaf}"] = None
+            lookup = f"(x{leaf} := get({source_literal(validator.property, namespace)})) is not None"
+            minimum, maximum = source_literal(validator.min, namespace), source_literal(validator.max, namespace)
+            return f"({lookup} and {minimum} <= len(x{leaf}) <= {maximum})"
+        if type(validator) is MinLengthValidator:
+            namespace[f"x{leaf}"] = None
+            lookup = f"(x{leaf} := get({source_literal(validator.property, namespace)})) is not None"
+            return f"({lookup} and len(x{leaf}) >= {source_literal(validator.min, namespace)})"
+        if isinstance(validator, PropertyValidator):
+            namespace[f"check{leaf}"] = validator.is_valid
+            return f"check{leaf}(get({source_literal(validator.property, namespace)}))"
+        namespace[f"accepts{leaf}"] = validator.accepts
+        return f"accepts{leaf}(user_data)"
+
+    def _build_accepts(self, validator: Validator) -> Callable[[dict[str, str]], bool]:
+        namespace: dict[str, object] = {}
+        expression = self._accepts_expression(validator, namespace)
+        source = f"def accepts(user_data):\n    get = user_data.get\n    return {expression}\n"
+        # The source only holds names generated here and literals made by source_literal
+        exec(compile(source, "<compiled validator>", "exec"), namespace)  # noqa: S102
+        return namespace["accepts"]
+
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        valid, results, opaque_errors = self.evaluate(user_data)
+        if valid:
+            return (True, [])
+        errors: list[str] = []
+        self._render(self.root, 0, results, opaque_errors, errors)
+        return (False, errors)
+
+    def check(self, user_data: dict[str, str]) -> ValidationError | None:
+        valid, results, opaque_errors = self.evaluate(user_data)
+        if valid:
+            return None
+        return self._error(self.root, results, opaque_errors)
+
+    def _error(self, node: int, results: tuple[bool, ...], opaque_errors: dict[int, list[str]]) -> ValidationError:
+        if node in opaque_errors:
+            return ValidationError(self.validators[node], lines=tuple(opaque_errors[node]))
+        children = tuple(
+            self._error(child, results, opaque_errors) for child in self.children[node] if not results[child]
+        )
+        return ValidationError(self.validators[node], children)
+
+    def _render(
+        self, node: int, depth: int, results: tuple[bool, ...], opaque_errors: dict[int, list[str]], errors: list[str]
+    ) -> None:
+        indent = "\t" * depth
+        if node in opaque_errors:
+            errors.extend(f"{indent}{error}" for error in opaque_errors[node])
+            return
+        errors.append(f"{indent}{self.texts[node]}")
+        for child in self.children[node]:
+            if not results[child]:
+                self._render(child, depth + 1, results, opaque_errors, errors)
+
+
+def compile_validator(validator: Validator) -> CompiledValidator:
+    return CompiledValidator(validator)
@@ -1,7 +1,54 @@
-import re
+# The files can also be run on their own, as scripts outside the package
+if __package__:
+    from . import rules
+else:
+    import rules
+
+
+def _length_between(user_data: dict[str, str], property: str, min: int, max: int) -> bool:
+    return property in user_data and min <= len(user_data[property]) <= max
+
+
+def _valid_name(user_data: dict[str, str], property: str) -> bool:
+    return property in user_data and rules.valid_name(user_data[property])
+
+
+def accepts(user_data: dict[str, str]) -> bool:
+    # Same rules as validate, but stops at the first check that decides the outcome, and builds no error text. A rule
+    # changed in one of the two has to be changed in the other; test_accepts_matches_validate_on_every_rule checks
+    # that they agree at every limit.
+    if user_data.get("federation_provider") in ["foo", "bar"] and _length_between(user_data, "federation_id", 1, 100):
+        return True
+
+    password = user_data.get("password")
+    return bool(
+        _length_between(user_data, "user_id", 8, 12)
+        and password is not None
+        and len(password) >= 8
+        and rules.contains_digit(password)
+        and rules.contains_special_character(password)
+        and (
+            ("email" in user_data and rules.valid_email(user_data["email"]))
+            or (
+                _length_between(user_data, "phone", 8, 10)
+                and user_data["phone"].isdigit()
+                and _length_between(user_data, "username", 3, 20)
+                and rules.only_word_characters(user_data["username"])
+            )
+        )
+        and _valid_name(user_data, "firstname")
+        and _valid_name(user_data, "lastname")
+        and (_length_between(user_data, "address1", 1, 100) or _length_between(user_data, "address2", 1, 100))
+        and _length_between(user_data, "postcode", 1, 10)
+    )
+
 
+def validate(user_data: dict[str, str], fast_accept: bool = True):
+    # With fast_accept, valid user data (the common case) is recognised by accepts, and the full set of checks below
+    # only runs to describe what is wrong with invalid data
+    if fast_accept and accepts(user_data):
+        return True, ""
 
-def validate(user_data: dict[str, str]):
     federation_errors: list[str] = []
     if "federation_provider" not in user_data or user_data["federation_provider"] not in ["foo", "bar"]:
         federation_errors.append("Property 'federation_provider' must be one of 'foo' or 'bar'")
@@ -17,14 +64,14 @@ def validate(user_data: dict[str, str]):
     password_errors: list[str] = []
     if "password" not in user_data or len(user_data["password"]) < 8:
         password_errors.append("Property 'password' must be at least 8 characters long")
-    if "password" not in user_data or not any(c.isdigit() for c in user_data["password"]):
+    if "password" not in user_data or not rules.contains_digit(user_data["password"]):
         password_errors.append("Property 'password' must contain a digit")
-    if "password" not in user_data or not any(c in "!\"£$%^&*()_+-=`¬|{}[]'#@~<>?,./]" for c in user_data["password"]):
+    if "password" not in user_data or not rules.contains_special_character(user_data["password"]):
         password_errors.append("Property 'password' must contain a special character")
     password_valid = len(password_errors) == 0
 
     email_errors: list[str] = []
-    if "email" not in user_data or not re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$", user_data["email"]):
+    if "email" not in user_data or not rules.valid_email(user_data["email"]):
         email_errors.append("Property 'email' must be a valid email address")
     email_valid = len(email_errors) == 0
 
@@ -38,29 +85,17 @@ def validate(user_data: dict[str, str]):
     username_errors: list[str] = []
     if "username" not in user_data or len(user_data["username"]) < 3 or len(user_data["username"]) > 20:
         username_errors.append("Property 'username' must be between 3 and 20 characters long")
-    if "username" not in user_data or not all(
-        c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_" for c in user_data["username"]
-    ):
+    if "username" not in user_data or not rules.only_word_characters(user_data["username"]):
         username_errors.append("Property 'username' must only contain alphanumerical characters or underscores")
     username_valid = len(username_errors) == 0
 
     firstname_errors: list[str] = []
-    if (
-        "firstname" not in user_data
-        or len(user_data["firstname"]) < 2
-        or not user_data["firstname"][0].isupper()
-        or not user_data["firstname"][1:].islower()
-    ):
+    if "firstname" not in user_data or not rules.valid_name(user_data["firstname"]):
         firstname_errors.append("Property 'firstname' must be a valid name")
     firstname_valid = len(firstname_errors) == 0
 
     lastname_errors: list[str] = []
-    if (
-        "lastname" not in user_data
-        or len(user_data["lastname"]) < 2
-        or not user_data["lastname"][0].isupper()
-        or not user_data["lastname"][1:].islower()
-    ):
+    if "lastname" not in user_data or not rules.valid_name(user_data["lastname"]):
         lastname_errors.append("Property 'lastname' must be a valid name")
     lastname_valid = len(lastname_errors) == 0
 
@@ -1,189 +1,429 @@
-import re
+import json
+import warnings
+from dataclasses import dataclass
+
+# The files can also be run on their own, as scripts outside the package
+if __package__:
+    from . import rules
+else:
+    import rules
+
+
+# The outcome of validating invalid user data, as a tree of the failing validators. Nothing is formatted until the
+# error text or JSON is asked for.
+@dataclass(slots=True)
+class ValidationError:
+    validator: "Validator"
+    children: tuple["ValidationError", ...] = ()
+    # The error lines of a validator that only implements validate()
+    lines: tuple[str, ...] | None = None
+
+    @property
+    def kind(self) -> str:
+        return self.validator.kind
+
+    @property
+    def field(self) -> str | None:
+        return self.validator.field
+
+    @property
+    def message(self) -> str:
+        if self.lines is not None:
+            return "\n".join(self.lines)
+        return self.validator.error
+
+    def failing_properties(self) -> list[str]:
+        if isinstance(self.validator, PropertyValidator):
+            return [self.validator.property]
+        return list(dict.fromkeys(property for child in self.children for property in child.failing_properties()))
+
+    def error_lines(self) -> list[str]:
+        # The same lines validate() returns, each nested node indented by one more tab
+        lines: list[str] = []
+        self._render(0, lines)
+        return lines
+
+    def _render(self, depth: int, lines: list[str]) -> None:
+        indent = "\t" * depth
+        if self.lines is not None:
+            lines.extend(f"{indent}{line}" for line in self.lines)
+            return
+        lines.append(f"{indent}{self.validator.error}")
+        for child in self.children:
+            child._render(depth + 1, lines)
+
+    def render(self) -> str:
+        return "\n".join(self.error_lines())
+
+    def to_dict(self) -> dict:
+        if self.lines is not None:
+            return {"kind": self.kind, "field": self.field, "lines": list(self.lines)}
+        error = {"kind": self.kind, "field": self.field, "message": self.message}
+        if self.children:
+            error["errors"] = [child.to_dict() for child in self.children]
+        return error
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
 
 class Validator:
+    kind = "validator"
+    field: str | None = None
+
     def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        pass
+        raise NotImplementedError
+
+    def check(self, user_data: dict[str, str]) -> ValidationError | None:
+        # None when the user data is valid. Validators that only implement validate() keep their own error lines.
+        valid, errors = self.validate(user_data)
+        return None if valid else ValidationError(self, lines=tuple(errors))
+
+    def collect(self, user_data: dict[str, str], depth: int, lines: list[str]) -> bool:
+        # Appends the error lines of invalid user data to lines, indented by depth tabs, in a single pass
+        valid, errors = self.validate(user_data)
+        if not valid:
+            indent = "\t" * depth
+            lines.extend(f"{indent}{error}" for error in errors)
+        return valid
+
+    def accepts(self, user_data: dict[str, str]) -> bool:
+        return self.validate(user_data)[0]
+
+    def validate_fast(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        # Most user data is valid, so first check that with accepts, which stops as soon as the outcome is known and
+        # builds no error text. The errors are only collected for invalid user data.
+        if self.accepts(user_data):
+            return (True, [])
+        return self.validate(user_data)
+
+
+# Leaf validators check a single property. The value passed to is_valid is None when the property is missing.
+class PropertyValidator(Validator):
+    kind = "property"
+
+    def __init__(self, property: str) -> None:
+        self.property = property
+
+    @property
+    def field(self) -> str:
+        return self.property
+
+    @property
+    def error(self) -> str:
+        raise NotImplementedError
+
+    def is_valid(self, value: str | None) -> bool:
+        raise NotImplementedError
+
+    def accepts(self, user_data: dict[str, str]) -> bool:
+        return self.is_valid(user_data.get(self.property))
+
+    def check(self, user_data: dict[str, str]) -> ValidationError | None:
+        return None if self.is_valid(user_data.get(self.property)) else ValidationError(self)
+
+    def collect(self, user_data: dict[str, str], depth: int, lines: list[str]) -> bool:
+        if self.is_valid(user_data.get(self.property)):
+            return True
+        lines.append("\t" * depth + self.error)
+        return False
 
-class LengthValidator(Validator):
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        if self.is_valid(user_data.get(self.property)):
+            return (True, [])
+        return (False, [self.error])
+
+
+class LengthValidator(PropertyValidator):
     def __init__(self, min: int, max: int, property: str) -> None:
+        super().__init__(property)
         self.min = min
         self.max = max
-        self.property = property
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or len(user_data[self.property]) < self.min or len(user_data[self.property]) > self.max:
-            return (False, [f"Property '{self.property}' must be between {self.min} and {self.max} characters long"])
-        return (True, [])
-    
-class MinLengthValidator(Validator):
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must be between {self.min} and {self.max} characters long"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and self.min <= len(value) <= self.max
+
+
+class MinLengthValidator(PropertyValidator):
     def __init__(self, min: int, property: str) -> None:
+        super().__init__(property)
         self.min = min
-        self.property = property
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or len(user_data[self.property]) < self.min:
-            return (False, [f"Property '{self.property}' must be at least {self.min} characters long"])
-        return (True, [])
-    
-class ContainsDigitValidator(Validator):
-    def __init__(self, property: str) -> None:
-        self.property = property
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must be at least {self.min} characters long"
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or  any(c.isdigit() for c in user_data[self.property]):
-            return (False, [f"Property '{self.property}' must contain a digit"])
-        return (True, [])
-    
-class DoesNotContainDigitValidator(Validator):
-    def __init__(self, property: str) -> None:
-        self.property = property
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and len(value) >= self.min
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or  any(not c.isdigit() for c in user_data[self.property]):
-            return (False, [f"Property '{self.property}' must be only digits"])
-        return (True, [])
-    
-class OnlyDigitValidator(Validator):
-    def __init__(self, property: str) -> None:
-        self.property = property
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or  all(c.isdigit() for c in user_data[self.property]):
-            return (False, [f"Property '{self.property}' must contain a digit"])
-        return (True, [])
-    
-class ContainsAlphanumericValidator(Validator):
-    def __init__(self, property: str) -> None:
-        self.property = property
+class ContainsDigitValidator(PropertyValidator):
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must contain a digit"
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or  any(c in "!\"£$%^&*()_+-=`¬|{}[]'#@~<>?,./]" for c in user_data[self.property]):
-            return (False, [f"Property '{self.property}' must contain a special character"])
-        return (True, [])
-    
-class OnlyAlphanumericOrUnderscoreValidator(Validator):
-    def __init__(self, property: str) -> None:
-        self.property = property
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and rules.contains_digit(value)
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or  all(
-        c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_" for c in user_data[self.property]):
-            return (False,[ f"Property '{self.property}' must only contain alphanumerical characters or underscores"])
-        return (True, [])
-    
-class EmailValidator(Validator):
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if "email" not in user_data or not re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$", user_data["email"]):
-            return (False, ["Property 'email' must be a valid email address"])
-        return (True, [])
-    
-class FediverseIdValidator(Validator):
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if "fediverse_id" not in user_data or not re.match(r"@^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$", user_data["fediverse_id"]):
-            return (False, ["Property 'fediverse_id' must be a valid fediverse id"])
-        return (True, [])
-    
-class NameValidator(Validator):
+
+class OnlyDigitValidator(PropertyValidator):
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must be only digits"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and value.isdigit()
+
+
+class DoesNotContainDigitValidator(PropertyValidator):
+    # Deprecated, use OnlyDigitValidator, which unlike this also rejects an empty value
     def __init__(self, property: str) -> None:
-        self.property = property
+        warnings.warn(
+            "DoesNotContainDigitValidator is deprecated, use OnlyDigitValidator", DeprecationWarning, stacklevel=2
+        )
+        super().__init__(property)
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if (
-            self.property not in user_data
-            or len(user_data[self.property]) < 2
-            or not user_data[self.property][0].isupper()
-            or not user_data[self.property][1:].islower()
-            ):
-            return(False, [f"Property '{self.property}' must be a valid name"])
-        return (True, [])
-     
-class OptionValidator(Validator):
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must be only digits"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and all(c.isdigit() for c in value)
+
+
+class ContainsAlphanumericValidator(PropertyValidator):
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must contain a special character"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and rules.contains_special_character(value)
+
+
+class OnlyAlphanumericOrUnderscoreValidator(PropertyValidator):
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must only contain alphanumerical characters or underscores"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and rules.only_word_characters(value)
+
+
+class EmailValidator(PropertyValidator):
+    def __init__(self, property: str = "email") -> None:
+        super().__init__(property)
+
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must be a valid email address"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and rules.valid_email(value)
+
+
+class FediverseIdValidator(PropertyValidator):
+    def __init__(self, property: str = "fediverse_id") -> None:
+        super().__init__(property)
+
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must be a valid fediverse id"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and rules.valid_fediverse_id(value)
+
+
+class NameValidator(PropertyValidator):
+    @property
+    def error(self) -> str:
+        return f"Property '{self.property}' must be a valid name"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and rules.valid_name(value)
+
+
+class OptionValidator(PropertyValidator):
     def __init__(self, options: list[str], property: str) -> None:
+        super().__init__(property)
         self.options = options
-        self.property = property
 
-    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
-        if self.property not in user_data or user_data[self.property] not in self.options:
-            options_string = "' or '".join(self.options)
-            return (False, [f"Property '{self.property} must be one of '{options_string}'"])
-        return (True, [])
-    
+    @property
+    def error(self) -> str:
+        options_string = "' or '".join(self.options)
+        return f"Property '{self.property}' must be one of '{options_string}'"
+
+    def is_valid(self, value: str | None) -> bool:
+        return value is not None and value in self.options
+
+
 class AllFieldsValidator(Validator):
+    kind = "all"
+
     def __init__(self, field: str, validators: list[Validator]) -> None:
         self.field = field
         self.validators = validators
 
-    def validate(self, user_data) -> tuple[bool, list[str]]:
+    @property
+    def error(self) -> str:
+        return f"All of the following {self.field} errors must be fixed:"
+
+    def accepts(self, user_data: dict[str, str]) -> bool:
+        for validator in self.validators:
+            if not validator.accepts(user_data):
+                return False
+        return True
+
+    def check(self, user_data: dict[str, str]) -> ValidationError | None:
+        errors = [error for validator in self.validators if (error := validator.check(user_data)) is not None]
+        return ValidationError(self, tuple(errors)) if errors else None
+
+    def collect(self, user_data: dict[str, str], depth: int, lines: list[str]) -> bool:
+        # The header goes before the errors of the children, which are only known afterwards, so its line is
+        # reserved up front
+        header = len(lines)
+        lines.append("")
         valid = True
-        errors = []
         for validator in self.validators:
-            result = validator.validate(user_data)
-            if not result[0]:
+            if not validator.collect(user_data, depth + 1, lines):
                 valid = False
-                for error in result[1]:
-                    errors.append(f"\t{error}")
-        if not valid:
-            errors.insert(0, f"All of the following {self.field} errors must be fixed:")
-            return (False, errors)
-        return (True, [])
+        if valid:
+            del lines[header:]
+            return True
+        lines[header] = "\t" * depth + self.error
+        return False
+
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        lines: list[str] = []
+        return (True, []) if self.collect(user_data, 0, lines) else (False, lines)
+
 
 class AtleastOneFieldValidator(Validator):
+    kind = "at_least_one"
+
     def __init__(self, field: str, validators: list[Validator]) -> None:
         self.field = field
         self.validators = validators
 
-    def validate(self, user_data) -> tuple[bool, list[str]]:
-        valid = False
+    @property
+    def error(self) -> str:
+        return f"At least one of the following {self.field} errors must be fixed:"
+
+    def accepts(self, user_data: dict[str, str]) -> bool:
+        for validator in self.validators:
+            if validator.accepts(user_data):
+                return True
+        return False
+
+    def check(self, user_data: dict[str, str]) -> ValidationError | None:
         errors = []
         for validator in self.validators:
-            result = validator.validate(user_data)
-            if result[0]:
-                valid = True
-                break
-            else:
-                for error in result[1]:
-                    errors.append(f"\t{error}")
-        if not valid:
-            errors.insert(0, f"At least one of the following {self.field} errors must be fixed:")
-            return (False, errors)
-        return (True, [])
-    
-if __name__ == "__main__":
-    example = {}
+            error = validator.check(user_data)
+            if error is None:
+                return None
+            errors.append(error)
+        return ValidationError(self, tuple(errors))
+
+    def collect(self, user_data: dict[str, str], depth: int, lines: list[str]) -> bool:
+        header = len(lines)
+        lines.append("")
+        for validator in self.validators:
+            if validator.collect(user_data, depth + 1, lines):
+                del lines[header:]
+                return True
+        lines[header] = "\t" * depth + self.error
+        return False
+
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        lines: list[str] = []
+        return (True, []) if self.collect(user_data, 0, lines) else (False, lines)
+
+
+def create_user_data_validator(fediverse: bool = True, international_shipping: bool = True) -> Validator:
+    # Without the fediverse id and international shipping options, this validates the same rules as validate() in
+    # composite.py, with the same error text
+    federation_validator = AllFieldsValidator(
+        "federation", [OptionValidator(["foo", "bar"], "federation_provider"), LengthValidator(1, 100, "federation_id")]
+    )
+    userid_validator = LengthValidator(8, 12, "user_id")
+    password_validator = AllFieldsValidator(
+        "password",
+        [
+            MinLengthValidator(8, "password"),
+            ContainsDigitValidator("password"),
+            ContainsAlphanumericValidator("password"),
+        ],
+    )
+    non_email_login_validator = AllFieldsValidator(
+        "non-email login",
+        [
+            LengthValidator(8, 10, "phone"),
+            OnlyDigitValidator("phone"),
+            LengthValidator(3, 20, "username"),
+            OnlyAlphanumericOrUnderscoreValidator("username"),
+        ],
+    )
+    user_contact_validator = AtleastOneFieldValidator(
+        "user contact",
+        [EmailValidator(), FediverseIdValidator(), non_email_login_validator]
+        if fediverse
+        else [EmailValidator(), non_email_login_validator],
+    )
+    address_validator = AtleastOneFieldValidator(
+        "address", [LengthValidator(1, 100, "address1"), LengthValidator(1, 100, "address2")]
+    )
+    postcode_validator = LengthValidator(1, 10, "postcode")
+    if international_shipping:
+        international_address_validator = AllFieldsValidator(
+            "international address",
+            [
+                LengthValidator(4, 10, "state"),
+                LengthValidator(3, 100, "city"),
+                LengthValidator(4, 10, "zipcode"),
+                OnlyDigitValidator("zipcode"),
+            ],
+        )
+        shipping_validators: list[Validator] = [
+            AtleastOneFieldValidator(
+                "shipping",
+                [
+                    AllFieldsValidator("local address", [address_validator, postcode_validator]),
+                    international_address_validator,
+                ],
+            )
+        ]
+    else:
+        shipping_validators = [address_validator, postcode_validator]
 
-    federation_validator = AllFieldsValidator("federation", [ OptionValidator(["foo", "bar"],"federation_provider"), LengthValidator(1, 100,"federation_provider")])
-    userid_validator = AllFieldsValidator("user_id", [LengthValidator(8, 12,"user_id")])
-    password_validator = AllFieldsValidator("password", [MinLengthValidator(8, "password"), ContainsDigitValidator("password"), ContainsAlphanumericValidator("password")])
-    email_validator = EmailValidator()
-    fediverseid_validator = FediverseIdValidator()
-    phone_validator = AllFieldsValidator("phone", [LengthValidator(8, 10, "phone"), DoesNotContainDigitValidator("phone")])
-    username_validator = AllFieldsValidator("username", [LengthValidator(3, 20, "username"), OnlyAlphanumericOrUnderscoreValidator("username")])
-    firstname_validator = AllFieldsValidator("firstname", [NameValidator("firstname")])
-    lastname_validator = AllFieldsValidator("lastname", [NameValidator("lastname")])
-    address_validator = AllFieldsValidator("address", [LengthValidator(1, 100, "address1"), LengthValidator(1, 100, "address2")])
-    postcode_validator = AllFieldsValidator("postcode", [LengthValidator(1, 10, "postcode")])
-    local_address_validator = AllFieldsValidator("address", [address_validator, postcode_validator])
-    international_address_validator = AllFieldsValidator("address", [LengthValidator(4, 10, "state"), LengthValidator(3, 100, "city"), LengthValidator(4, 10, "zipcode"), OnlyDigitValidator("zipcode")])
-
-    shipping_validator = AtleastOneFieldValidator("shipping", [local_address_validator, international_address_validator])
-    non_email_login_validator = AllFieldsValidator("non-email login", [phone_validator, username_validator])
-    user_contact_validator = AtleastOneFieldValidator("user contact", [email_validator, fediverseid_validator, non_email_login_validator])
-
-    user_login_validator = AllFieldsValidator("login", [
-        userid_validator,
-        password_validator,
-        user_contact_validator,
-        firstname_validator,
-        lastname_validator,
-        shipping_validator])
-    
-    user_data_validator = AtleastOneFieldValidator("", [federation_validator, user_login_validator])
+    user_login_validator = AllFieldsValidator(
+        "login",
+        [
+            userid_validator,
+            password_validator,
+            user_contact_validator,
+            NameValidator("firstname"),
+            NameValidator("lastname"),
+            *shipping_validators,
+        ],
+    )
+
+    return AtleastOneFieldValidator("user", [federation_validator, user_login_validator])
+
+
+def run_example():
+    example = {}
 
     print(f"Example: {example}")
-    valid, errors = user_data_validator.validate(example)
+    valid, errors = create_user_data_validator().validate(example)
     print(f"Valid: {valid}")
     if not valid:
         print("Errors:")
         for error in errors:
             print(error)
-            
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    run_example()
@@ -0,0 +1,104 @@
+from .composite_solution import AllFieldsValidator, AtleastOneFieldValidator, PropertyValidator, Validator
+
+COMPOSITES = (AllFieldsValidator, AtleastOneFieldValidator)
+
+
+# Validates successive versions of the same user data, such as a form being filled in. The session remembers the
+# result of every node of the tree, and on each call only re-checks the leaves whose property changed, then walks up
+# from them, recomputing an all/at-least-one node only when one of its children changed result. Validators that are
+# neither leaves nor all/at-least-one nodes are re-run on every call, as it is not known which properties they read.
+# Nodes are numbered in post-order, so every node comes after its children.
+class ValidationSession:
+    def __init__(self, validator: Validator) -> None:
+        self.validators: list[Validator] = []
+        self.children: list[tuple[int, ...]] = []
+        self.parents: list[int | None] = []
+        self.leaves: dict[str, list[int]] = {}
+        self.opaque_nodes: list[int] = []
+        self.root = self._add(validator)
+
+        # None until the first validation, apart from all/at-least-one nodes without children, which never change
+        self.results: list[bool | None] = [None] * len(self.validators)
+        self._constant = [
+            node
+            for node, validator in enumerate(self.validators)
+            if isinstance(validator, COMPOSITES) and not self.children[node]
+        ]
+        for node in self._constant:
+            self.results[node] = self._evaluate(node)
+        self.opaque_errors: dict[int, list[str]] = {}
+        self._values: dict[str, str | None] = {}
+        self._lines: list[str] | None = None
+
+    def _add(self, validator: Validator) -> int:
+        children = (
+            tuple(self._add(child) for child in validator.validators) if isinstance(validator, COMPOSITES) else ()
+        )
+        node = len(self.validators)
+        self.validators.append(validator)
+        self.children.append(children)
+        self.parents.append(None)
+        for child in children:
+            self.parents[child] = node
+        if isinstance(validator, PropertyValidator):
+            self.leaves.setdefault(validator.property, []).append(node)
+        elif not isinstance(validator, COMPOSITES):
+            self.opaque_nodes.append(node)
+        return node
+
+    def _evaluate(self, node: int) -> bool:
+        validator = self.validators[node]
+        if isinstance(validator, AllFieldsValidator):
+            return all(self.results[child] for child in self.children[node])
+        return any(self.results[child] for child in self.children[node])
+
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        # Re-check the leaves of the changed properties, and re-run the other validators
+        changed, self._constant = self._constant, []
+        for property, nodes in self.leaves.items():
+            value = user_data.get(property)
+            if property in self._values and value == self._values[property]:
+                continue
+            self._values[property] = value
+            for node in nodes:
+                result = self.validators[node].is_valid(value)
+                if result != self.results[node]:
+                    self.results[node] = result
+                    changed.append(node)
+        for node in self.opaque_nodes:
+            valid, errors = self.validators[node].validate(user_data)
+            if valid != self.results[node] or errors != self.opaque_errors.get(node):
+                self.results[node] = valid
+                self.opaque_errors[node] = errors
+                changed.append(node)
+
+        if changed:
+            self._lines = None
+            # Parents have a higher number than their children, so recomputing the lowest stale node first sees
+            # every change below it
+            stale = {self.parents[node] for node in changed} - {None}
+            while stale:
+                node = min(stale)
+                stale.remove(node)
+                result = self._evaluate(node)
+                if result != self.results[node]:
+                    self.results[node] = result
+                    if self.parents[node] is not None:
+                        stale.add(self.parents[node])
+
+        if self.results[self.root]:
+            return (True, [])
+        if self._lines is None:
+            self._lines = []
+            self._render(self.root, 0, self._lines)
+        return (False, list(self._lines))
+
+    def _render(self, node: int, depth: int, lines: list[str]) -> None:
+        indent = "\t" * depth
+        if node in self.opaque_errors:
+            lines.extend(f"{indent}{error}" for error in self.opaque_errors[node])
+            return
+        lines.append(f"{indent}{self.validators[node].error}")
+        for child in self.children[node]:
+            if not self.results[child]:
+                self._render(child, depth + 1, lines)
@@ -0,0 +1,202 @@
+import copy
+import threading
+import time
+from dataclasses import dataclass
+
+from .composite_solution import (
+    AllFieldsValidator,
+    AtleastOneFieldValidator,
+    PropertyValidator,
+    ValidationError,
+    Validator,
+)
+
+COMPOSITES = (AllFieldsValidator, AtleastOneFieldValidator)
+
+
+@dataclass
+class NodeStats:
+    path: str
+    kind: str
+    calls: int
+    passes: int
+    # Including the time spent in the node's children
+    seconds: float
+
+    @property
+    def failures(self) -> int:
+        return self.calls - self.passes
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passes / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ReorderSuggestion:
+    path: str
+    current: list[str]
+    suggested: list[str]
+
+
+# Counters of one thread, so recording needs no lock
+class _Counters:
+    def __init__(self, size: int) -> None:
+        self.calls = [0] * size
+        self.passes = [0] * size
+        self.seconds = [0.0] * size
+
+
+# Times and counts one node of an instrumented tree, around the validator it wraps
+class InstrumentedValidator(Validator):
+    def __init__(self, instrumentation: "Instrumentation", node: int, validator: Validator) -> None:
+        self.instrumentation = instrumentation
+        self.node = node
+        self.validator = validator
+        self.kind = validator.kind
+        self.field = validator.field
+
+    @property
+    def error(self) -> str:
+        return self.validator.error
+
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        began = time.perf_counter()
+        result = self.validator.validate(user_data)
+        self.instrumentation.record(self.node, result[0], time.perf_counter() - began)
+        return result
+
+    def check(self, user_data: dict[str, str]) -> ValidationError | None:
+        began = time.perf_counter()
+        error = self.validator.check(user_data)
+        self.instrumentation.record(self.node, error is None, time.perf_counter() - began)
+        return error
+
+    def collect(self, user_data: dict[str, str], depth: int, lines: list[str]) -> bool:
+        began = time.perf_counter()
+        valid = self.validator.collect(user_data, depth, lines)
+        self.instrumentation.record(self.node, valid, time.perf_counter() - began)
+        return valid
+
+    def accepts(self, user_data: dict[str, str]) -> bool:
+        began = time.perf_counter()
+        valid = self.validator.accepts(user_data)
+        self.instrumentation.record(self.node, valid, time.perf_counter() - began)
+        return valid
+
+
+# Opt-in instrumentation of a validator tree. The original tree is left untouched, so it keeps running at full speed;
+# validations through `validator`, an instrumented copy of the tree, record the calls, passes and time of every node.
+class Instrumentation:
+    def __init__(self, validator: Validator) -> None:
+        self.paths: list[str] = []
+        self.kinds: list[str] = []
+        self.children: list[tuple[int, ...]] = []
+        self._path_counts: dict[str, int] = {}
+        self._local = threading.local()
+        self._counters: list[_Counters] = []
+        self._lock = threading.Lock()
+        self.validator = self._instrument(validator, "")
+
+    def _instrument(self, validator: Validator, parent: str) -> InstrumentedValidator:
+        if isinstance(validator, COMPOSITES):
+            name = validator.field
+        elif isinstance(validator, PropertyValidator):
+            name = f"{type(validator).__name__}({validator.property})"
+        else:
+            name = type(validator).__name__
+        path = f"{parent}/{name}" if parent else name
+        # Siblings with the same name are told apart by a number
+        self._path_counts[path] = self._path_counts.get(path, 0) + 1
+        if self._path_counts[path] > 1:
+            path = f"{path}#{self._path_counts[path]}"
+        node = len(self.paths)
+        self.paths.append(path)
+        self.kinds.append(validator.kind)
+        self.children.append(())
+
+        if isinstance(validator, COMPOSITES):
+            children = [self._instrument(child, path) for child in validator.validators]
+            self.children[node] = tuple(child.node for child in children)
+            validator = copy.copy(validator)
+            validator.validators = children
+        return InstrumentedValidator(self, node, validator)
+
+    def record(self, node: int, valid: bool, seconds: float) -> None:
+        counters = getattr(self._local, "counters", None)
+        if counters is None:
+            counters = self._local.counters = _Counters(len(self.paths))
+            with self._lock:
+                self._counters.append(counters)
+        counters.calls[node] += 1
+        counters.passes[node] += valid
+        counters.seconds[node] += seconds
+
+    def snapshot(self) -> list[NodeStats]:
+        # The totals of all threads so far, one entry per node in depth-first order
+        with self._lock:
+            counters = list(self._counters)
+        return [
+            NodeStats(
+                path=path,
+                kind=self.kinds[node],
+                calls=sum(thread.calls[node] for thread in counters),
+                passes=sum(thread.passes[node] for thread in counters),
+                seconds=sum(thread.seconds[node] for thread in counters),
+            )
+            for node, path in enumerate(self.paths)
+        ]
+
+    def reset(self) -> None:
+        size = len(self.paths)
+        with self._lock:
+            for counters in self._counters:
+                counters.calls[:] = [0] * size
+                counters.passes[:] = [0] * size
+                counters.seconds[:] = [0.0] * size
+
+    def to_prometheus(self, prefix: str = "validator_node") -> str:
+        stats = self.snapshot()
+        metrics = [
+            ("calls_total", "Number of times the validator node ran", lambda node: node.calls),
+            ("passes_total", "Number of times the validator node passed", lambda node: node.passes),
+            ("failures_total", "Number of times the validator node failed", lambda node: node.failures),
+            ("seconds_total", "Time spent in the validator node, including its children", lambda node: node.seconds),
+        ]
+        lines = []
+        for name, description, value in metrics:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for node in stats:
+                labels = f'node="{_escape_label(node.path)}",kind="{node.kind}"'
+                lines.append(f"{prefix}_{name}{{{labels}}} {value(node)}")
+        return "\n".join(lines) + "\n"
+
+    def suggest_reordering(self) -> list[ReorderSuggestion]:
+        # An at-least-one node stops at its first passing child, so trying the child most likely to pass first skips
+        # the most work. Later children only see the data the earlier ones rejected, so they are compared by the share
+        # of their calls that pass rather than by their raw passes. Note that reordering also changes the order of the
+        # node's error lines.
+        stats = self.snapshot()
+        suggestions = []
+        for node, children in enumerate(self.children):
+            if self.kinds[node] != AtleastOneFieldValidator.kind or len(children) < 2:
+                continue
+            # Highest pass rate first, then the cheapest per call
+            suggested = sorted(
+                children,
+                key=lambda child: (-stats[child].pass_rate, stats[child].seconds / max(stats[child].calls, 1)),
+            )
+            if suggested != list(children):
+                suggestions.append(
+                    ReorderSuggestion(
+                        path=self.paths[node],
+                        current=[self.paths[child] for child in children],
+                        suggested=[self.paths[child] for child in suggested],
+                    )
+                )
+        return suggestions
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
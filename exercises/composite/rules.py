@@ -0,0 +1,42 @@
+import re
+
+# Leaf rules shared by the validators. Each rule checks a single value that is present; the validators deal with
+# missing properties. Character classes and patterns are built once, here, instead of on every call.
+
+SPECIAL_CHARACTERS = frozenset("!\"£$%^&*()_+-=`¬|{}[]'#@~<>?,./]")
+WORD_CHARACTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+
+SPECIAL_CHARACTER_PATTERN = re.compile("[" + re.escape("".join(sorted(SPECIAL_CHARACTERS))) + "]")
+ASCII_DIGIT_PATTERN = re.compile("[0-9]")
+# Translating a value with this table removes its word characters, leaving only the other ones
+WORD_CHARACTER_DELETIONS = str.maketrans("", "", "".join(WORD_CHARACTERS))
+
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$")
+FEDIVERSE_ID_PATTERN = re.compile(r"^@[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$")
+
+
+def contains_digit(value: str) -> bool:
+    # str.isdigit() also holds for non-ASCII digits, such as superscripts, which [0-9] does not match
+    if value.isascii():
+        return ASCII_DIGIT_PATTERN.search(value) is not None
+    return any(map(str.isdigit, value))
+
+
+def contains_special_character(value: str) -> bool:
+    return SPECIAL_CHARACTER_PATTERN.search(value) is not None
+
+
+def only_word_characters(value: str) -> bool:
+    return not value.translate(WORD_CHARACTER_DELETIONS)
+
+
+def valid_email(value: str) -> bool:
+    return EMAIL_PATTERN.match(value) is not None
+
+
+def valid_fediverse_id(value: str) -> bool:
+    return FEDIVERSE_ID_PATTERN.match(value) is not None
+
+
+def valid_name(value: str) -> bool:
+    return len(value) >= 2 and value[0].isupper() and value[1:].islower()
@@ -0,0 +1,227 @@
+import copy
+import hashlib
+import json
+import threading
+import tomllib
+from collections import OrderedDict
+from pathlib import Path
+
+from .compiled import CompiledValidator, compile_validator
+from .composite_solution import (
+    AllFieldsValidator,
+    AtleastOneFieldValidator,
+    ContainsAlphanumericValidator,
+    ContainsDigitValidator,
+    EmailValidator,
+    FediverseIdValidator,
+    LengthValidator,
+    MinLengthValidator,
+    NameValidator,
+    OnlyAlphanumericOrUnderscoreValidator,
+    OnlyDigitValidator,
+    OptionValidator,
+    PropertyValidator,
+    ValidationError,
+    Validator,
+)
+
+# A schema is a tree of nodes. Composite nodes name their kind and field, and list their children:
+#   {"all": "login", "validators": [...]} or {"at_least_one": "user contact", "validators": [...]}
+# Leaf nodes name their rule, the property they check and the rule's parameters:
+#   {"rule": "length", "property": "user_id", "min": 8, "max": 12}
+COMPOSITE_VALIDATORS = {"all": AllFieldsValidator, "at_least_one": AtleastOneFieldValidator}
+LEAF_VALIDATORS: dict[str, type[PropertyValidator]] = {
+    "length": LengthValidator,
+    "min_length": MinLengthValidator,
+    "contains_digit": ContainsDigitValidator,
+    "only_digits": OnlyDigitValidator,
+    "contains_special_character": ContainsAlphanumericValidator,
+    "only_word_characters": OnlyAlphanumericOrUnderscoreValidator,
+    "email": EmailValidator,
+    "fediverse_id": FediverseIdValidator,
+    "name": NameValidator,
+    "option": OptionValidator,
+}
+LEAF_PARAMETERS = {
+    LengthValidator: ["min", "max"],
+    MinLengthValidator: ["min"],
+    OptionValidator: ["options"],
+}
+SCHEMA_FORMATS = {".json": "json", ".toml": "toml"}
+
+
+def schema_format_of(path: str | Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in SCHEMA_FORMATS:
+        raise ValueError(f"Unsupported schema type '{suffix}', expected one of: {', '.join(SCHEMA_FORMATS)}")
+    return SCHEMA_FORMATS[suffix]
+
+
+def parse_schema(content: bytes, schema_format: str) -> dict:
+    try:
+        if schema_format == "toml":
+            return tomllib.loads(content.decode())
+        schema = json.loads(content)
+    except (UnicodeDecodeError, json.JSONDecodeError, tomllib.TOMLDecodeError) as error:
+        raise ValueError(f"Invalid {schema_format} schema: {error}") from error
+    if not isinstance(schema, dict):
+        raise ValueError("The schema must be an object")
+    return schema
+
+
+def build_validator(node: dict, path: str = "schema") -> Validator:
+    if not isinstance(node, dict):
+        raise ValueError(f"{path}: expected an object, got {type(node).__name__}")
+    kinds = [kind for kind in COMPOSITE_VALIDATORS if kind in node]
+    if len(kinds) > 1 or (kinds and "rule" in node):
+        raise ValueError(f"{path}: a node is either 'all', 'at_least_one' or a 'rule'")
+    if kinds:
+        kind = kinds[0]
+        unknown = set(node) - {kind, "validators"}
+        if unknown:
+            raise ValueError(f"{path}: '{kind}' takes only 'validators', unknown {sorted(unknown)}")
+        # An empty 'all' node accepts everything, so a mistake in a schema must not be able to load as one
+        children = node.get("validators")
+        if not isinstance(children, list) or not children:
+            raise ValueError(f"{path}: '{kind}' needs a non-empty list of validators")
+        validators = [build_validator(child, f"{path}.validators[{index}]") for index, child in enumerate(children)]
+        return COMPOSITE_VALIDATORS[kind](str(node[kind]), validators)
+
+    rule = node.get("rule")
+    if rule not in LEAF_VALIDATORS:
+        raise ValueError(f"{path}: unknown rule '{rule}', expected one of: {', '.join(LEAF_VALIDATORS)}")
+    if not isinstance(node.get("property"), str):
+        raise ValueError(f"{path}: rule '{rule}' needs a property")
+    validator_type = LEAF_VALIDATORS[rule]
+    parameters = LEAF_PARAMETERS.get(validator_type, [])
+    unknown = set(node) - {"rule", "property", *parameters}
+    missing = [parameter for parameter in parameters if parameter not in node]
+    if unknown or missing:
+        raise ValueError(
+            f"{path}: rule '{rule}' takes the parameters {parameters}, "
+            f"missing {sorted(missing)}, unknown {sorted(unknown)}"
+        )
+    check_parameters(node, path, rule)
+    return validator_type(**{parameter: node[parameter] for parameter in ["property", *parameters]})
+
+
+def check_parameters(node: dict, path: str, rule: str) -> None:
+    # Lengths are counts of characters and options are the exact values allowed. bool is excluded explicitly, as it
+    # is a subclass of int.
+    for parameter in ("min", "max"):
+        value = node.get(parameter)
+        if parameter in node and (type(value) is not int or value < 0):
+            raise ValueError(f"{path}: rule '{rule}' needs '{parameter}' to be a non-negative integer, got {value!r}")
+    if "min" in node and "max" in node and node["min"] > node["max"]:
+        raise ValueError(f"{path}: rule '{rule}' needs 'min' to be at most 'max', got {node['min']} > {node['max']}")
+    options = node.get("options")
+    if "options" in node and (not isinstance(options, list) or not all(isinstance(option, str) for option in options)):
+        raise ValueError(f"{path}: rule '{rule}' needs 'options' to be a list of strings, got {options!r}")
+
+
+def describe_validator(validator: Validator) -> dict:
+    # The schema of an existing validator tree
+    if isinstance(validator, (AllFieldsValidator, AtleastOneFieldValidator)):
+        kind = "all" if isinstance(validator, AllFieldsValidator) else "at_least_one"
+        return {kind: validator.field, "validators": [describe_validator(child) for child in validator.validators]}
+    rules = {validator_type: rule for rule, validator_type in LEAF_VALIDATORS.items()}
+    if type(validator) not in rules:
+        raise ValueError(f"There is no schema rule for {type(validator).__name__}")
+    node = {"rule": rules[type(validator)], "property": validator.property}
+    node.update({parameter: getattr(validator, parameter) for parameter in LEAF_PARAMETERS.get(type(validator), [])})
+    return node
+
+
+# Compiled validators by the hash of their schema's content, so loading an unchanged schema again costs only reading
+# and hashing it. At most max_size validators are kept; the least recently loaded one is dropped to make room.
+class ValidatorCache:
+    def __init__(self, max_size: int = 32) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._validators: OrderedDict[str, CompiledValidator] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple:
+        # Copies and pickles start empty, as the lock can't be copied and compiled validators can't be pickled
+        return (ValidatorCache, (self.max_size,))
+
+    def __len__(self) -> int:
+        return len(self._validators)
+
+    def get(self, content: bytes, schema_format: str) -> CompiledValidator:
+        key = hashlib.sha256(schema_format.encode() + b"\0" + content).hexdigest()
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is not None:
+                self._validators.move_to_end(key)
+                self.hits += 1
+                return validator
+            self.misses += 1
+        # Compiled outside the lock. When two threads load the same new schema at once, both compile it and the
+        # first one stored is kept.
+        validator = compile_validator(build_validator(parse_schema(content, schema_format)))
+        with self._lock:
+            validator = self._validators.setdefault(key, validator)
+            self._validators.move_to_end(key)
+            while len(self._validators) > self.max_size:
+                self._validators.popitem(last=False)
+                self.evictions += 1
+            return validator
+
+    def load(self, path: str | Path) -> CompiledValidator:
+        return self.get(Path(path).read_bytes(), schema_format_of(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._validators.clear()
+
+
+# A validator backed by a schema file, that can be reloaded while other threads are validating. A reload builds the
+# new validator completely before swapping it in with a single assignment, and every validation reads the current
+# validator once, so it runs entirely on either the old or the new schema.
+# Copies and pickles hold the schema that is current when they are taken, and are reloaded independently of the
+# original, so a copy sent to a process pool worker validates exactly what the original did at that moment.
+class SchemaValidator(Validator):
+    def __init__(
+        self, path: str | Path, cache: ValidatorCache | None = None, current: CompiledValidator | None = None
+    ) -> None:
+        self.path = Path(path)
+        self.cache = ValidatorCache() if cache is None else cache
+        self._reload_lock = threading.Lock()
+        self.current = self.cache.load(self.path) if current is None else current
+
+    def __reduce__(self) -> tuple:
+        return (_restore_schema_validator, (self.path, self.cache, self.current.tree))
+
+    def __deepcopy__(self, memo: dict) -> "SchemaValidator":
+        # The compiled validator keeps no state, so the copy can share it
+        return SchemaValidator(self.path, copy.deepcopy(self.cache, memo), self.current)
+
+    def reload(self, path: str | Path | None = None) -> bool:
+        # Returns whether the validator changed. A schema that fails to load leaves the current validator in place.
+        with self._reload_lock:
+            path = self.path if path is None else Path(path)
+            validator = self.cache.load(path)
+            changed = validator is not self.current
+            self.path, self.current = path, validator
+            return changed
+
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        return self.current.validate(user_data)
+
+    def check(self, user_data: dict[str, str]) -> ValidationError | None:
+        return self.current.check(user_data)
+
+    def accepts(self, user_data: dict[str, str]) -> bool:
+        return self.current.accepts(user_data)
+
+    def validate_fast(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        return self.current.validate_fast(user_data)
+
+
+def _restore_schema_validator(path: Path, cache: ValidatorCache, tree: Validator) -> SchemaValidator:
+    return SchemaValidator(path, cache, compile_validator(tree))
@@ -0,0 +1,82 @@
+import copy
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Self
+
+from .compiled import CompiledValidator, compile_validator
+from .composite_solution import Validator
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+# The validator of a process pool worker, compiled once when the worker starts
+_worker_validator: CompiledValidator | None = None
+
+
+def _start_worker(validator: Validator) -> None:
+    global _worker_validator
+    _worker_validator = compile_validator(validator)
+
+
+def _validate_in_worker(records: Sequence[dict[str, str]]) -> list[tuple[bool, list[str]]]:
+    return [_worker_validator.validate_fast(user_data) for user_data in records]
+
+
+# Validates user data with a private, compiled copy of a validator tree. The copy is taken when the service is
+# created, so later changes to the original tree do not affect it, and the compiled validator keeps no state between
+# calls, so any number of threads can share it. Large batches are split into chunks that run on a thread pool, or on
+# a process pool whose workers each receive and compile the tree once, when they start. The pool is created by the
+# first batch that needs it, under a lock, so threads starting batches at the same time share a single pool.
+class ValidationService:
+    def __init__(
+        self, validator: Validator, mode: str = "thread", workers: int | None = None, chunk_size: int = 1_000
+    ) -> None:
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{mode}', expected one of: {', '.join(EXECUTION_MODES)}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.mode = mode
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._tree = copy.deepcopy(validator)
+        self.validator = compile_validator(self._tree)
+        self._executor: Executor | None = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _pool(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    self._executor = ProcessPoolExecutor(
+                        self.workers, initializer=_start_worker, initargs=(self._tree,)
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(self.workers)
+            return self._executor
+
+    def validate(self, user_data: dict[str, str]) -> tuple[bool, list[str]]:
+        # Single validations run on the calling thread, a pool would only add latency
+        return self.validator.validate_fast(user_data)
+
+    def validate_many(self, records: Sequence[dict[str, str]]) -> list[tuple[bool, list[str]]]:
+        if self.mode == "inline":
+            return [self.validator.validate_fast(user_data) for user_data in records]
+        chunks = [records[start : start + self.chunk_size] for start in range(0, len(records), self.chunk_size)]
+        if self.mode == "process":
+            results = self._pool().map(_validate_in_worker, chunks)
+        else:
+            validate_fast = self.validator.validate_fast
+            results = self._pool().map(lambda chunk: [validate_fast(user_data) for user_data in chunk], chunks)
+        return [result for chunk_results in results for result in chunk_results]
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from .batch import UserDataBatch, validate_batch
+from .composite import validate
+from .composite_solution import (
+    AllFieldsValidator,
+    LengthValidator,
+    NameValidator,
+    OnlyDigitValidator,
+    PropertyValidator,
+    Validator,
+    create_user_data_validator,
+)
+from .test_composite_solution import joined, random_registrations
+
+UNICODE_REGISTRATIONS = [
+    {"firstname": "Élodie", "lastname": "Ǆemal", "password": "pässw0rd£", "phone": "٠١٢٣٤٥٦٧٨"},
+    {"firstname": "ǅemal", "lastname": "O'brien", "password": "²²²²²²²²", "phone": "0123456789\x00"},
+    {"firstname": "J\U0001d41a", "lastname": "Sm\U0001d400th", "username": "some_üser", "zipcode": "𝟙𝟚𝟛𝟜"},
+    {"firstname": "Jo1", "lastname": "Σίσυφος", "user_id": "", "password": "\x00" * 8, "state": "\U0001f600" * 4},
+]
+
+
+@pytest.mark.parametrize("fediverse, international_shipping", [(False, False), (True, True), (True, False)])
+def test_batch_matches_tree(fediverse: bool, international_shipping: bool):
+    validator = create_user_data_validator(fediverse, international_shipping)
+    registrations = random_registrations(2000, seed=6) + UNICODE_REGISTRATIONS + [{}]
+    result = validate_batch(validator, UserDataBatch.from_records(registrations), block_size=300)
+    assert len(result) == len(registrations)
+    for index, user_data in enumerate(registrations):
+        assert result[index] == validator.validate(user_data)
+    assert set(result.errors) == set(np.flatnonzero(~result.valid).tolist())
+
+
+def test_batch_matches_validate():
+    validator = create_user_data_validator(fediverse=False, international_shipping=False)
+    registrations = random_registrations(1000, seed=7)
+    result = validate_batch(validator, UserDataBatch.from_records(registrations))
+    for index, user_data in enumerate(registrations):
+        assert joined(result[index]) == validate(user_data)
+
+
+def test_batch_from_columns():
+    batch = UserDataBatch(
+        columns={"phone": np.array(["01234567", None, "0123a567"], dtype=object), "firstname": ["John", "Jo", None]},
+        size=3,
+    )
+    validator = AllFieldsValidator("test", [OnlyDigitValidator("phone"), NameValidator("firstname")])
+    result = validate_batch(validator, batch)
+    assert result.valid.tolist() == [True, False, False]
+    assert result[1] == validator.validate({"firstname": "Jo"})
+    assert batch.record(2) == {"phone": "0123a567"}
+
+
+def test_batch_evaluates_other_validators_per_record():
+    class Palindrome(PropertyValidator):
+        @property
+        def error(self) -> str:
+            return f"Property '{self.property}' must be a palindrome"
+
+        def is_valid(self, value: str | None) -> bool:
+            return value is not None and value == value[::-1]
+
+    class NeverValid(Validator):
+        def validate(self, user_data):
+            return (False, [f"Never valid with {len(user_data)} properties", "\tReally"])
+
+    validator = AllFieldsValidator("test", [LengthValidator(1, 3, "a"), Palindrome("a"), NeverValid()])
+    registrations = [{"a": "aba"}, {"a": "abcd"}, {}]
+    result = validate_batch(validator, UserDataBatch.from_records(registrations))
+    for index, user_data in enumerate(registrations):
+        assert result[index] == validator.validate(user_data)
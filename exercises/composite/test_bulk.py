@@ -0,0 +1,83 @@
+import csv
+import json
+
+import pytest
+
+from .bulk import validate_file
+from .composite_solution import create_user_data_validator
+from .test_composite_solution import random_registrations
+
+
+def write_records(path, records):
+    with open(path, "w", newline="") as file:
+        if path.suffix == ".jsonl":
+            file.writelines(json.dumps(record) + "\n" for record in records)
+            return
+        names = sorted({name for record in records for name in record})
+        writer = csv.DictWriter(file, names)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def read_results(path):
+    with open(path, newline="") as file:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in file]
+        return [
+            {"line": int(row["line"]), "valid": row["valid"] == "True", "errors": json.loads(row["errors"] or "null")}
+            for row in csv.DictReader(file)
+        ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("input_type, output_type", [("jsonl", "jsonl"), ("csv", "csv"), ("jsonl", "csv")])
+def test_validate_file(tmp_path, input_type: str, output_type: str, workers: int):
+    validator = create_user_data_validator()
+    registrations = random_registrations(700, seed=18)
+    input_path, output_path = tmp_path / f"records.{input_type}", tmp_path / f"results.{output_type}"
+    write_records(input_path, registrations)
+
+    summary = validate_file(input_path, output_path, validator, workers=workers, chunk_size=64)
+
+    results = read_results(output_path)
+    errors = [validator.check(user_data) for user_data in registrations]
+    first_line = 2 if input_type == "csv" else 1
+    assert [result["line"] for result in results] == list(range(first_line, first_line + len(registrations)))
+    assert [result["valid"] for result in results] == [error is None for error in errors]
+    assert [result["errors"] for result in results] == [error and error.to_dict() for error in errors]
+    assert (summary.records, summary.valid) == (len(registrations), errors.count(None))
+
+
+def test_failures_by_rule(tmp_path):
+    records = [
+        {"federation_provider": "foo", "federation_id": "abc"},
+        {"federation_provider": "baz", "federation_id": "abc"},
+        {"federation_provider": "baz"},
+    ]
+    write_records(tmp_path / "records.jsonl", records)
+    summary = validate_file(tmp_path / "records.jsonl", tmp_path / "results.jsonl")
+    assert (summary.records, summary.valid, summary.invalid) == (3, 1, 2)
+    assert summary.failures_by_rule["federation_provider:option"] == 2
+    assert summary.failures_by_rule["federation_id:length"] == 1
+    assert summary.failures_by_rule["user_id:length"] == 2
+
+
+def test_non_string_values(tmp_path):
+    (tmp_path / "records.jsonl").write_text('{"federation_provider": "foo", "federation_id": 12, "phone": null}\n')
+    summary = validate_file(tmp_path / "records.jsonl", tmp_path / "results.jsonl")
+    assert summary.valid == 1
+
+
+@pytest.mark.parametrize(
+    "content, error",
+    [("{\n", "Line 1"), ('{"a": "b"}\n[1]\n', "Line 2: expected an object")],
+)
+def test_invalid_input(tmp_path, content: str, error: str):
+    (tmp_path / "records.jsonl").write_text(content)
+    with pytest.raises(ValueError, match=error):
+        validate_file(tmp_path / "records.jsonl", tmp_path / "results.jsonl")
+
+
+def test_rejects_unknown_file_type(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        validate_file(tmp_path / "records.jsonl", tmp_path / "results.txt")
@@ -0,0 +1,101 @@
+import copy
+import pickle
+
+import pytest
+
+from .cache import LeafResultCache, cache_validator
+from .compiled import compile_validator
+from .composite_solution import AllFieldsValidator, NameValidator, OptionValidator, create_user_data_validator
+from .service import ValidationService
+from .test_composite_solution import random_registrations
+
+
+def test_cached_tree_gives_identical_results():
+    validator = create_user_data_validator()
+    cache = LeafResultCache(max_size=5)
+    cached = cache_validator(validator, cache)
+    compiled = compile_validator(cached)
+    for user_data in random_registrations(1000, seed=24) + [{}]:
+        expected = validator.validate(user_data)
+        assert cached.validate(user_data) == expected
+        assert cached.validate_fast(user_data) == expected
+        assert compiled.validate_fast(user_data) == expected
+        error, expected_error = cached.check(user_data), validator.check(user_data)
+        assert (error and error.to_dict()) == (expected_error and expected_error.to_dict())
+    assert cache.stats.hits > 0
+    assert cache.stats.evictions > 0
+
+
+def test_leaves_with_the_same_rule_share_entries():
+    cache = LeafResultCache()
+    names = AllFieldsValidator("name", [NameValidator("firstname"), NameValidator("lastname")])
+    validator = cache_validator(names, cache)
+    assert validator.validate({"firstname": "Smith", "lastname": "Smith"}) == (True, [])
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.size, stats.hit_rate) == (1, 1, 1, 0.5)
+
+
+def test_unhashable_values_skip_the_cache():
+    validator = create_user_data_validator()
+    cache = LeafResultCache()
+    cached = cache_validator(validator, cache)
+    for user_data in [{"firstname": ["a"]}, {"firstname": ["a"], "lastname": ["b"], "user_id": ["user1234"]}]:
+        assert cached.validate(user_data) == validator.validate(user_data)
+        assert compile_validator(cached).validate_fast(user_data) == validator.validate(user_data)
+    leaf_cache = LeafResultCache()
+    leaf = cache_validator(NameValidator("firstname"), leaf_cache)
+    assert leaf.validate({"firstname": ["a"]}) == NameValidator("firstname").validate({"firstname": ["a"]})
+    assert leaf_cache.stats.size == 0
+
+
+def test_bounded_size():
+    cache = LeafResultCache(max_size=3)
+    validator = cache_validator(NameValidator("firstname"), cache)
+    for name in ["Ann", "Bob", "Cy", "Dee", "Ann"]:
+        validator.validate({"firstname": name})
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, len(cache)) == (0, 5, 2, 3)
+    cache.clear()
+    assert len(cache) == 0 and cache.stats.misses == 0
+
+
+def test_cached_tree_is_isolated_from_the_original_tree():
+    validator = OptionValidator(["foo", "bar"], "federation_provider")
+    cached = cache_validator(validator, LeafResultCache())
+    validator.options.remove("foo")
+    assert cached.validate({"federation_provider": "foo"}) == (True, [])
+    assert not validator.validate({"federation_provider": "foo"})[0]
+
+
+def test_copies_get_an_empty_cache():
+    cache = LeafResultCache(max_size=7)
+    cached = cache_validator(create_user_data_validator(), cache)
+    registrations = random_registrations(50, seed=25)
+    expected = [cached.validate(user_data) for user_data in registrations]
+    for copied in [copy.deepcopy(cached), pickle.loads(pickle.dumps(cached))]:
+        assert [copied.validate(user_data) for user_data in registrations] == expected
+        assert copied.validators[1].validators[1].validators[1].cache is not cache
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_cached_tree_in_service(mode: str):
+    validator = create_user_data_validator()
+    registrations = random_registrations(400, seed=26)
+    cached = cache_validator(validator, LeafResultCache())
+    with ValidationService(cached, mode=mode, workers=2, chunk_size=100) as service:
+        assert service.validate_many(registrations) == [validator.validate(user_data) for user_data in registrations]
+
+
+def test_rejects_empty_cache():
+    with pytest.raises(ValueError):
+        LeafResultCache(max_size=0)
+
+
+def test_cache_only_some_properties():
+    cache = LeafResultCache()
+    cached = cache_validator(create_user_data_validator(), cache, properties=["firstname", "lastname"])
+    registrations = random_registrations(100, seed=27)
+    for user_data in registrations:
+        cached.validate(user_data)
+    names = {user_data.get(property) for user_data in registrations for property in ["firstname", "lastname"]}
+    assert cache.stats.size == len(names)
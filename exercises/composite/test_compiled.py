@@ -0,0 +1,80 @@
+import pytest
+
+from .compiled import compile_validator
+from .composite import validate
+from .composite_solution import (
+    AllFieldsValidator,
+    LengthValidator,
+    MinLengthValidator,
+    Validator,
+    create_user_data_validator,
+)
+from .test_composite_solution import joined, random_registrations
+
+
+@pytest.mark.parametrize("fediverse, international_shipping", [(False, False), (True, True), (True, False)])
+def test_compiled_matches_tree(fediverse: bool, international_shipping: bool):
+    validator = create_user_data_validator(fediverse, international_shipping)
+    compiled = compile_validator(validator)
+    for user_data in random_registrations(2000, seed=1) + [{}]:
+        assert compiled.validate(user_data) == validator.validate(user_data)
+
+
+def test_compiled_matches_validate():
+    compiled = compile_validator(create_user_data_validator(fediverse=False, international_shipping=False))
+    for user_data in random_registrations(2000, seed=2) + [{}]:
+        assert joined(compiled.validate(user_data)) == validate(user_data)
+
+
+def test_compiled_shares_property_lookups():
+    compiled = compile_validator(create_user_data_validator())
+    assert len(compiled.properties) == len(set(compiled.properties))
+    assert compiled.properties.count("password") == 1
+
+
+def test_compiled_calls_unknown_validators():
+    class AlwaysInvalid(Validator):
+        def validate(self, user_data):
+            return (False, ["Never valid", "\tReally"])
+
+    validator = AllFieldsValidator("test", [LengthValidator(1, 2, "a"), AlwaysInvalid()])
+    compiled = compile_validator(validator)
+    assert compiled.validate({"a": "x"}) == validator.validate({"a": "x"})
+    assert compiled.validate({}) == validator.validate({})
+
+
+@pytest.mark.parametrize("fediverse, international_shipping", [(False, False), (True, True)])
+def test_compiled_accepts_matches_tree(fediverse: bool, international_shipping: bool):
+    validator = create_user_data_validator(fediverse, international_shipping)
+    compiled = compile_validator(validator)
+    for user_data in random_registrations(2000, seed=5) + [{}]:
+        assert compiled.accepts(user_data) == validator.accepts(user_data)
+        assert compiled.validate_fast(user_data) == validator.validate(user_data)
+
+
+def test_compiled_check_matches_tree():
+    validator = create_user_data_validator()
+    compiled = compile_validator(validator)
+    for user_data in random_registrations(1000, seed=9) + [{}]:
+        assert compiled.check(user_data) == validator.check(user_data)
+
+
+def test_compiled_passes_values_that_are_not_plain_literals_through_the_namespace():
+    called = []
+
+    class Bound(int):
+        def __repr__(self) -> str:
+            return "called.append(1) or 1"
+
+    class Property(str):
+        def __repr__(self) -> str:
+            return "called.append(1) or 'a'"
+
+    validator = AllFieldsValidator(
+        "test", [LengthValidator(Bound(2), Bound(3), Property("b")), MinLengthValidator(Bound(2), Property("c"))]
+    )
+    compiled = compile_validator(validator)
+    for user_data in [{"b": "xy", "c": "xy"}, {"a": "xy", "c": "xy"}, {"b": "x", "c": "xy"}, {}]:
+        assert compiled.validate(user_data) == validator.validate(user_data)
+        assert compiled.accepts(user_data) == validator.accepts(user_data)
+    assert called == []
@@ -1,4 +1,20 @@
-from .composite import validate
+import itertools
+
+from .composite import accepts, validate
+from .test_composite_solution import FIELD_VALUES, random_registrations
+
+# Values just inside and just outside every length limit validate checks, made of characters that pass the other
+# rules of the property
+LENGTH_BOUNDARIES = {
+    "federation_id": ["x", "x" * 100],
+    "user_id": ["u" * 7, "u" * 8, "u" * 12, "u" * 13],
+    "password": ["p4ss!xx", "p4ss!xxx"],
+    "phone": ["0" * 7, "0" * 8, "0" * 10, "0" * 11],
+    "username": ["u" * 2, "u" * 3, "u" * 20, "u" * 21],
+    "address1": ["x", "x" * 100],
+    "address2": ["x", "x" * 100],
+    "postcode": ["x", "x" * 10, "x" * 11],
+}
 
 
 def test_validate_empty():
@@ -32,3 +48,37 @@ At least one of the following user errors must be fixed:
 \t\tProperty 'postcode' must be between 1 and 10 characters long
 """.strip()
     )
+
+
+def test_fast_accept_matches_full_validation():
+    registrations = random_registrations(2000, seed=3) + [{}]
+    for user_data in registrations:
+        assert validate(user_data, fast_accept=True) == validate(user_data, fast_accept=False)
+        assert accepts(user_data) == validate(user_data, fast_accept=False)[0]
+
+
+def rule_variations() -> list[dict[str, str]]:
+    # Starting from a valid login and from a valid federation, every property and every pair of properties is set
+    # to each of its test values or left out, so every rule is exercised on its own and next to every other rule
+    values = {
+        field: [*FIELD_VALUES[field], *LENGTH_BOUNDARIES.get(field, []), None]
+        for field in FIELD_VALUES
+        if field not in ("fediverse_id", "state", "city", "zipcode")
+    }
+    login = {field: FIELD_VALUES[field][0] for field in values if not field.startswith("federation")}
+    federation = {"federation_provider": "foo", "federation_id": "abc123"}
+    variations = []
+    for base in (login, federation, {**login, **federation}):
+        for first, second in itertools.combinations_with_replacement(values, 2):
+            for first_value, second_value in itertools.product(values[first], values[second]):
+                user_data = {**base, first: first_value, second: second_value}
+                variations.append({field: value for field, value in user_data.items() if value is not None})
+    return variations
+
+
+def test_accepts_matches_validate_on_every_rule():
+    variations = rule_variations()
+    assert any(accepts(user_data) for user_data in variations)
+    assert not all(accepts(user_data) for user_data in variations)
+    for user_data in variations:
+        assert accepts(user_data) == validate(user_data, fast_accept=False)[0], user_data
@@ -0,0 +1,211 @@
+import json
+import random
+
+import pytest
+
+from .composite import validate
+from .composite_solution import (
+    AllFieldsValidator,
+    DoesNotContainDigitValidator,
+    LengthValidator,
+    OnlyDigitValidator,
+    create_user_data_validator,
+)
+
+FIELD_VALUES = {
+    "federation_provider": ["foo", "bar", "baz", ""],
+    "federation_id": ["abc123", "", "x" * 101],
+    "user_id": ["user1234", "short", "user12345678", "user123456789"],
+    "password": ["passw0rd!", "password", "p4ss!", "12345678", "!!!!!!!!"],
+    "email": ["foo@bar.com", "foo.bar+baz@example.org", "foo@bar", "@foo@bar.com", ""],
+    "fediverse_id": ["@foo@bar.com", "foo@bar.com", "@foo@bar"],
+    "phone": ["0123456789", "01234567", "0123", "012345678a", "01234567890"],
+    "username": ["some_user", "ab", "some user", "x" * 21, "User_123"],
+    "firstname": ["John", "john", "JOHN", "J", "Jo"],
+    "lastname": ["Smith", "smith", "SmItH", "S", "O"],
+    "address1": ["1 Some Street", "", "x" * 101],
+    "address2": ["Flat 2", "", "x" * 101],
+    "postcode": ["AB1 2CD", "", "ABCDE 12345"],
+    "state": ["Texas", "TX", "x" * 11],
+    "city": ["Austin", "Au", "x" * 101],
+    "zipcode": ["78701", "787", "7870a", "78701234567"],
+}
+
+
+def random_registrations(count: int, seed: int = 0) -> list[dict[str, str]]:
+    # Each field is missing, valid or invalid in various ways. Every other registration starts from a valid login,
+    # so both the valid and the deeply nested invalid branches are covered.
+    rng = random.Random(seed)
+    registrations = []
+    for index in range(count):
+        user_data = {}
+        for field, values in FIELD_VALUES.items():
+            if index % 2 == 0 and field not in ("federation_provider", "federation_id"):
+                value = values[0] if rng.random() < 0.9 else rng.choice(values + [None])
+            else:
+                value = rng.choice(values + [None, None])
+            if value is not None:
+                user_data[field] = value
+        registrations.append(user_data)
+    return registrations
+
+
+def joined(result: tuple[bool, list[str]]) -> tuple[bool, str]:
+    return result[0], "\n".join(result[1])
+
+
+def test_tree_matches_validate():
+    validator = create_user_data_validator(fediverse=False, international_shipping=False)
+    registrations = random_registrations(2000)
+    assert any(validate(user_data)[0] for user_data in registrations)
+    assert not all(validate(user_data)[0] for user_data in registrations)
+    for user_data in registrations:
+        assert joined(validator.validate(user_data)) == validate(user_data)
+
+
+@pytest.mark.parametrize(
+    "user_data, valid",
+    [
+        ({"federation_provider": "foo", "federation_id": "abc"}, True),
+        ({"federation_provider": "foo", "federation_id": ""}, False),
+    ],
+)
+def test_federation(user_data: dict[str, str], valid: bool):
+    assert create_user_data_validator().validate(user_data)[0] == valid
+
+
+def test_fediverse_id_is_a_user_contact():
+    login = {
+        "user_id": "user1234",
+        "password": "passw0rd!",
+        "firstname": "John",
+        "lastname": "Smith",
+        "address1": "1 Some Street",
+        "postcode": "AB1 2CD",
+    }
+    assert create_user_data_validator().validate({**login, "fediverse_id": "@foo@bar.com"}) == (True, [])
+    assert not create_user_data_validator().validate({**login, "fediverse_id": "foo@bar.com"})[0]
+    assert not create_user_data_validator(fediverse=False).validate({**login, "fediverse_id": "@foo@bar.com"})[0]
+
+
+def test_international_shipping():
+    login = {
+        "user_id": "user1234",
+        "password": "passw0rd!",
+        "email": "foo@bar.com",
+        "firstname": "John",
+        "lastname": "Smith",
+    }
+    international = {"state": "Texas", "city": "Austin", "zipcode": "78701"}
+    assert create_user_data_validator().validate({**login, **international}) == (True, [])
+    assert not create_user_data_validator().validate({**login, **international, "zipcode": "7870a"})[0]
+    assert not create_user_data_validator(international_shipping=False).validate({**login, **international})[0]
+
+
+def test_does_not_contain_digit_validator_is_deprecated():
+    with pytest.deprecated_call():
+        validator = DoesNotContainDigitValidator("phone")
+    only_digits = OnlyDigitValidator("phone")
+    for value in ["0123456789", "012345678a", "abc"]:
+        assert validator.validate({"phone": value}) == only_digits.validate({"phone": value})
+    # Unlike OnlyDigitValidator, it has always accepted an empty value
+    assert validator.validate({"phone": ""}) == (True, [])
+    assert validator.validate({}) == (False, ["Property 'phone' must be only digits"])
+
+
+def test_validate_empty():
+    valid, errors = create_user_data_validator().validate({})
+    assert not valid
+    assert "\n".join(errors) == (
+        """
+At least one of the following user errors must be fixed:
+\tAll of the following federation errors must be fixed:
+\t\tProperty 'federation_provider' must be one of 'foo' or 'bar'
+\t\tProperty 'federation_id' must be between 1 and 100 characters long
+\tAll of the following login errors must be fixed:
+\t\tProperty 'user_id' must be between 8 and 12 characters long
+\t\tAll of the following password errors must be fixed:
+\t\t\tProperty 'password' must be at least 8 characters long
+\t\t\tProperty 'password' must contain a digit
+\t\t\tProperty 'password' must contain a special character
+\t\tAt least one of the following user contact errors must be fixed:
+\t\t\tProperty 'email' must be a valid email address
+\t\t\tProperty 'fediverse_id' must be a valid fediverse id
+\t\t\tAll of the following non-email login errors must be fixed:
+\t\t\t\tProperty 'phone' must be between 8 and 10 characters long
+\t\t\t\tProperty 'phone' must be only digits
+\t\t\t\tProperty 'username' must be between 3 and 20 characters long
+\t\t\t\tProperty 'username' must only contain alphanumerical characters or underscores
+\t\tProperty 'firstname' must be a valid name
+\t\tProperty 'lastname' must be a valid name
+\t\tAt least one of the following shipping errors must be fixed:
+\t\t\tAll of the following local address errors must be fixed:
+\t\t\t\tAt least one of the following address errors must be fixed:
+\t\t\t\t\tProperty 'address1' must be between 1 and 100 characters long
+\t\t\t\t\tProperty 'address2' must be between 1 and 100 characters long
+\t\t\t\tProperty 'postcode' must be between 1 and 10 characters long
+\t\t\tAll of the following international address errors must be fixed:
+\t\t\t\tProperty 'state' must be between 4 and 10 characters long
+\t\t\t\tProperty 'city' must be between 3 and 100 characters long
+\t\t\t\tProperty 'zipcode' must be between 4 and 10 characters long
+\t\t\t\tProperty 'zipcode' must be only digits
+""".strip()
+    )
+
+
+@pytest.mark.parametrize("fediverse, international_shipping", [(False, False), (True, True)])
+def test_validate_fast_matches_validate(fediverse: bool, international_shipping: bool):
+    validator = create_user_data_validator(fediverse, international_shipping)
+    for user_data in random_registrations(2000, seed=4) + [{}]:
+        assert validator.accepts(user_data) == validator.validate(user_data)[0]
+        assert validator.validate_fast(user_data) == validator.validate(user_data)
+
+
+def test_check_renders_validate_text():
+    validator = create_user_data_validator(fediverse=False, international_shipping=False)
+    for user_data in random_registrations(1000, seed=8):
+        error = validator.check(user_data)
+        valid, text = validate(user_data)
+        assert (error is None) == valid
+        if error is not None:
+            assert error.render() == text
+
+
+def test_check_structure():
+    user_data = {"federation_provider": "foo", "user_id": "user1234", "password": "password", "email": "foo@bar.com"}
+    error = create_user_data_validator(international_shipping=False).check(user_data)
+    assert error.kind == "at_least_one"
+    assert error.field == "user"
+    assert [child.field for child in error.children] == ["federation", "login"]
+    assert error.failing_properties() == [
+        "federation_id",
+        "password",
+        "firstname",
+        "lastname",
+        "address1",
+        "address2",
+        "postcode",
+    ]
+    federation = json.loads(error.to_json())["errors"][0]
+    assert federation == {
+        "kind": "all",
+        "field": "federation",
+        "message": "All of the following federation errors must be fixed:",
+        "errors": [
+            {
+                "kind": "property",
+                "field": "federation_id",
+                "message": "Property 'federation_id' must be between 1 and 100 characters long",
+            }
+        ],
+    }
+
+
+def test_check_deep_tree():
+    validator = LengthValidator(1, 2, "a")
+    for depth in range(500):
+        validator = AllFieldsValidator(f"level {depth}", [validator])
+    lines = validator.check({}).error_lines()
+    assert len(lines) == 501
+    assert lines[-1] == "\t" * 500 + "Property 'a' must be between 1 and 2 characters long"
+    assert validator.validate({}) == (False, lines)
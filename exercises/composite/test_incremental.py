@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from .composite_solution import (
+    AllFieldsValidator,
+    AtleastOneFieldValidator,
+    LengthValidator,
+    Validator,
+    create_user_data_validator,
+)
+from .incremental import ValidationSession
+from .test_composite_solution import FIELD_VALUES, random_registrations
+
+
+def random_edits(count: int, seed: int = 0) -> list[dict[str, str]]:
+    # Successive versions of a form, each one changing, adding or removing a single property
+    rng = random.Random(seed)
+    user_data = dict(random_registrations(1, seed=seed)[0])
+    versions = []
+    for _ in range(count):
+        field = rng.choice(list(FIELD_VALUES))
+        value = rng.choice(FIELD_VALUES[field] + [None, user_data.get(field, "")[:-1]])
+        if value is None:
+            user_data.pop(field, None)
+        else:
+            user_data[field] = value
+        versions.append(dict(user_data))
+    return versions
+
+
+@pytest.mark.parametrize("fediverse, international_shipping", [(False, False), (True, True)])
+def test_session_matches_validate(fediverse: bool, international_shipping: bool):
+    validator = create_user_data_validator(fediverse, international_shipping)
+    session = ValidationSession(validator)
+    for user_data in random_edits(3000, seed=14) + random_registrations(200, seed=15) + [{}]:
+        assert session.validate(user_data) == validator.validate(user_data)
+
+
+def test_session_reruns_other_validators():
+    class Matching(Validator):
+        def validate(self, user_data):
+            if user_data.get("a") == user_data.get("b"):
+                return (True, [])
+            return (False, [f"'{user_data.get('a')}' is not '{user_data.get('b')}'"])
+
+    validator = AtleastOneFieldValidator(
+        "test", [Matching(), AllFieldsValidator("empty", []), AtleastOneFieldValidator("none", [])]
+    )
+    session = ValidationSession(validator)
+    for user_data in [{"a": "x"}, {"a": "x", "b": "x"}, {"a": "x", "b": "y"}, {"a": "z", "b": "y"}]:
+        assert session.validate(user_data) == validator.validate(user_data)
+    assert ValidationSession(AtleastOneFieldValidator("none", [])).validate({}) == (
+        False,
+        ["At least one of the following none errors must be fixed:"],
+    )
+
+
+def test_session_only_checks_changed_properties():
+    checked = []
+
+    class Recording(LengthValidator):
+        def is_valid(self, value):
+            checked.append(self.property)
+            return super().is_valid(value)
+
+    session = ValidationSession(AllFieldsValidator("test", [Recording(1, 5, "a"), Recording(1, 5, "b")]))
+    session.validate({"a": "x", "b": "y"})
+    assert sorted(checked) == ["a", "b"]
+    checked.clear()
+    assert session.validate({"a": "x", "b": "too long"}) == (
+        False,
+        ["All of the following test errors must be fixed:", "\tProperty 'b' must be between 1 and 5 characters long"],
+    )
+    assert checked == ["b"]
@@ -0,0 +1,94 @@
+import threading
+
+from .composite_solution import AtleastOneFieldValidator, LengthValidator, NameValidator, create_user_data_validator
+from .instrumentation import Instrumentation
+from .test_composite_solution import random_registrations
+
+
+def test_instrumented_results_match():
+    validator = create_user_data_validator()
+    instrumentation = Instrumentation(validator)
+    for user_data in random_registrations(500, seed=16) + [{}]:
+        assert instrumentation.validator.validate(user_data) == validator.validate(user_data)
+        error, expected = instrumentation.validator.check(user_data), validator.check(user_data)
+        assert (error and error.to_dict()) == (expected and expected.to_dict())
+        assert instrumentation.validator.validate_fast(user_data) == validator.validate(user_data)
+
+
+def test_counts():
+    instrumentation = Instrumentation(
+        AtleastOneFieldValidator("name", [NameValidator("firstname"), LengthValidator(1, 2, "firstname")])
+    )
+    for user_data in [{"firstname": "John"}, {"firstname": "jo"}, {}]:
+        instrumentation.validator.validate(user_data)
+    stats = {node.path: node for node in instrumentation.snapshot()}
+    assert list(stats) == ["name", "name/NameValidator(firstname)", "name/LengthValidator(firstname)"]
+    assert (stats["name"].calls, stats["name"].passes, stats["name"].failures) == (3, 2, 1)
+    assert (stats["name/NameValidator(firstname)"].calls, stats["name/NameValidator(firstname)"].passes) == (3, 1)
+    assert (stats["name/LengthValidator(firstname)"].calls, stats["name/LengthValidator(firstname)"].passes) == (2, 1)
+    assert stats["name"].seconds >= stats["name/NameValidator(firstname)"].seconds
+
+    instrumentation.reset()
+    assert all(node.calls == 0 for node in instrumentation.snapshot())
+
+
+def test_counts_from_all_threads():
+    instrumentation = Instrumentation(create_user_data_validator())
+    registrations = random_registrations(100, seed=17)
+
+    def validate():
+        for user_data in registrations:
+            instrumentation.validator.validate(user_data)
+
+    threads = [threading.Thread(target=validate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert instrumentation.snapshot()[0].calls == 400
+
+
+def test_prometheus_export():
+    instrumentation = Instrumentation(AtleastOneFieldValidator('say "hi"', [LengthValidator(1, 2, "a")]))
+    instrumentation.validator.validate({"a": "x"})
+    lines = instrumentation.to_prometheus().splitlines()
+    assert "# TYPE validator_node_calls_total counter" in lines
+    assert 'validator_node_calls_total{node="say \\"hi\\"",kind="at_least_one"} 1' in lines
+    assert 'validator_node_failures_total{node="say \\"hi\\"/LengthValidator(a)",kind="property"} 0' in lines
+
+
+def test_suggest_reordering():
+    instrumentation = Instrumentation(create_user_data_validator(fediverse=False, international_shipping=False))
+    login = {
+        "user_id": "user1234",
+        "password": "passw0rd!",
+        "phone": "0123456789",
+        "username": "some_user",
+        "firstname": "John",
+        "lastname": "Smith",
+        "address2": "Flat 2",
+        "postcode": "AB1 2CD",
+    }
+    for _ in range(10):
+        instrumentation.validator.validate(login)
+    suggestions = {suggestion.path: suggestion for suggestion in instrumentation.suggest_reordering()}
+    assert suggestions["user"].suggested == ["user/login", "user/federation"]
+    assert suggestions["user/login/user contact"].suggested == [
+        "user/login/user contact/non-email login",
+        "user/login/user contact/EmailValidator(email)",
+    ]
+    assert suggestions["user/login/address"].suggested[0] == "user/login/address/LengthValidator(address2)"
+
+
+def test_suggest_reordering_by_pass_rate():
+    instrumentation = Instrumentation(
+        AtleastOneFieldValidator("a", [LengthValidator(1, 1, "a"), LengthValidator(2, 2, "a")])
+    )
+    for value in ["x"] * 4 + ["xx"] * 3 + ["xxx"] * 3:
+        instrumentation.validator.validate({"a": value})
+    stats = {node.path: node for node in instrumentation.snapshot()}
+    first, second = stats["a/LengthValidator(a)"], stats["a/LengthValidator(a)#2"]
+    # The second child passes less often overall, but more often when it runs
+    assert (first.calls, first.passes, second.calls, second.passes) == (10, 4, 6, 3)
+    [suggestion] = instrumentation.suggest_reordering()
+    assert suggestion.suggested == ["a/LengthValidator(a)#2", "a/LengthValidator(a)"]
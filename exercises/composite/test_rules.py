@@ -0,0 +1,20 @@
+import re
+
+import pytest
+
+from . import rules
+
+VALUES = ["", "passw0rd!", "some_user", "foo@bar.com", "@foo@bar.com", "John", "ab cd", "²", "٣", "£", "¬", "]", "-"]
+VALUES += ["user\n", "foo@bar.com\n", "Élodie", "ǅemal", "x" * 100, "p" * 99 + "0", "a\x00b", "\U0001d7d9", "_"]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_rules_match_inline_checks(value: str):
+    assert rules.contains_digit(value) == any(c.isdigit() for c in value)
+    assert rules.contains_special_character(value) == any(c in "!\"£$%^&*()_+-=`¬|{}[]'#@~<>?,./]" for c in value)
+    assert rules.only_word_characters(value) == all(
+        c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_" for c in value
+    )
+    assert rules.valid_email(value) == bool(re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$", value))
+    assert rules.valid_fediverse_id(value) == bool(re.match(r"^@[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]+$", value))
+    assert rules.valid_name(value) == (len(value) >= 2 and value[0].isupper() and value[1:].islower())
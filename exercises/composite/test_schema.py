@@ -0,0 +1,138 @@
+import json
+import re
+import threading
+from pathlib import Path
+
+import pytest
+
+from .composite_solution import create_user_data_validator
+from .schema import SchemaValidator, ValidatorCache, build_validator, describe_validator, parse_schema
+from .test_composite_solution import random_registrations
+
+SCHEMAS = Path(__file__).parent / "schemas"
+
+
+def test_schema_files_match_validators():
+    registrations = random_registrations(500, seed=10) + [{}]
+    for path, validator in [
+        (SCHEMAS / "user_data.json", create_user_data_validator()),
+        (SCHEMAS / "user_data_basic.toml", create_user_data_validator(fediverse=False, international_shipping=False)),
+    ]:
+        loaded = ValidatorCache().load(path)
+        for user_data in registrations:
+            assert loaded.validate(user_data) == validator.validate(user_data)
+
+
+@pytest.mark.parametrize("fediverse, international_shipping", [(False, False), (True, False), (False, True)])
+def test_describe_round_trip(fediverse: bool, international_shipping: bool):
+    schema = describe_validator(create_user_data_validator(fediverse, international_shipping))
+    assert describe_validator(build_validator(schema)) == schema
+
+
+@pytest.mark.parametrize(
+    "schema, error",
+    [
+        ({"all": "x"}, "schema: 'all' needs a non-empty list of validators"),
+        ({"all": "x", "validators": []}, "schema: 'all' needs a non-empty list of validators"),
+        ({"at_least_one": "x", "validators": {}}, "schema: 'at_least_one' needs a non-empty list of validators"),
+        (
+            {"all": "x", "validators": [{"rule": "name", "property": "a"}], "validator": []},
+            "schema: 'all' takes only 'validators', unknown ['validator']",
+        ),
+        ({"all": "x", "at_least_one": "y", "validators": []}, "either"),
+        ({"all": "x", "validators": [{"rule": "nope", "property": "a"}]}, "schema.validators[0]: unknown rule 'nope'"),
+        ({"rule": "length", "property": "a", "min": 1}, "missing ['max']"),
+        ({"rule": "email", "property": "a", "max": 1}, "unknown ['max']"),
+        ({"rule": "name"}, "needs a property"),
+        ({"rule": "option", "property": "a", "options": "foobar"}, "needs 'options' to be a list of strings"),
+        ({"rule": "option", "property": "a", "options": ["foo", 1]}, "needs 'options' to be a list of strings"),
+        ({"rule": "min_length", "property": "a", "min": "5"}, "needs 'min' to be a non-negative integer, got '5'"),
+        ({"rule": "length", "property": "a", "min": 1, "max": 2.5}, "needs 'max' to be a non-negative integer"),
+        ({"rule": "length", "property": "a", "min": True, "max": 2}, "needs 'min' to be a non-negative integer"),
+        ({"rule": "length", "property": "a", "min": -1, "max": 2}, "needs 'min' to be a non-negative integer"),
+        ({"rule": "length", "property": "a", "min": 3, "max": 2}, "needs 'min' to be at most 'max', got 3 > 2"),
+    ],
+)
+def test_invalid_schemas(schema: dict, error: str):
+    with pytest.raises(ValueError, match=re.escape(error)):
+        build_validator(schema)
+
+
+def test_parse_errors():
+    with pytest.raises(ValueError, match="Invalid json schema"):
+        parse_schema(b"{", "json")
+    with pytest.raises(ValueError, match="must be an object"):
+        parse_schema(b"[]", "json")
+    with pytest.raises(ValueError, match="Invalid toml schema"):
+        parse_schema(b"rule = ", "toml")
+
+
+def test_cache_by_content(tmp_path: Path):
+    cache = ValidatorCache()
+    first = cache.load(SCHEMAS / "user_data.json")
+    copy = tmp_path / "copy.json"
+    copy.write_bytes((SCHEMAS / "user_data.json").read_bytes())
+    assert cache.load(copy) is first
+    copy.write_text('{"rule": "name", "property": "firstname"}')
+    assert cache.load(copy) is not first
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+
+def test_reload(tmp_path: Path):
+    path = tmp_path / "schema.json"
+    path.write_text('{"rule": "name", "property": "firstname"}')
+    validator = SchemaValidator(path)
+    assert validator.validate({"firstname": "John"}) == (True, [])
+    assert not validator.reload()
+
+    path.write_text('{"rule": "length", "property": "firstname", "min": 5, "max": 10}')
+    assert validator.reload()
+    assert not validator.validate({"firstname": "John"})[0]
+
+    path.write_text("{")
+    with pytest.raises(ValueError):
+        validator.reload()
+    assert not validator.validate({"firstname": "John"})[0]
+
+
+def test_hot_swap_under_concurrent_use():
+    cache = ValidatorCache()
+    paths = [SCHEMAS / "user_data.json", SCHEMAS / "user_data_basic.toml"]
+    expected = [cache.load(path) for path in paths]
+    validator = SchemaValidator(paths[0], cache)
+    registrations = random_registrations(200, seed=11)
+    # Every validation gives the result of one of the two schemas, never a mix of both
+    outcomes = [{tuple(schema.validate(user_data)[1]) for schema in expected} for user_data in registrations]
+    failures = []
+    stop = threading.Event()
+
+    def validate():
+        while not stop.is_set():
+            for user_data, allowed in zip(registrations, outcomes):
+                if tuple(validator.validate(user_data)[1]) not in allowed:
+                    failures.append(user_data)
+
+    threads = [threading.Thread(target=validate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for index in range(200):
+        validator.reload(paths[index % 2])
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert not failures
+
+
+def test_cache_is_bounded(tmp_path: Path):
+    cache = ValidatorCache(max_size=2)
+    schema = tmp_path / "schema.json"
+    loaded = []
+    for min_length in range(3):
+        schema.write_text(json.dumps({"rule": "min_length", "property": "password", "min": min_length}))
+        loaded.append(cache.load(schema))
+    assert (len(cache), cache.evictions) == (2, 1)
+    assert cache.load(schema) is loaded[2]
+    schema.write_text(json.dumps({"rule": "min_length", "property": "password", "min": 0}))
+    assert cache.load(schema) is not loaded[0]
+    with pytest.raises(ValueError):
+        ValidatorCache(max_size=0)
@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from .composite_solution import create_user_data_validator
+from .schema import SchemaValidator
+from .service import ValidationService
+from .test_composite_solution import random_registrations
+
+
+@pytest.mark.parametrize("mode, workers", [("inline", None), ("thread", 4), ("process", 2)])
+def test_service_matches_validator(mode: str, workers: int | None):
+    validator = create_user_data_validator()
+    registrations = random_registrations(1500, seed=12)
+    with ValidationService(validator, mode=mode, workers=workers, chunk_size=200) as service:
+        expected = [validator.validate(user_data) for user_data in registrations]
+        assert service.validate_many(registrations) == expected
+        assert service.validate_many(registrations[:10]) == expected[:10]
+        assert service.validate(registrations[0]) == expected[0]
+
+
+def test_service_is_isolated_from_the_original_tree():
+    validator = create_user_data_validator()
+    service = ValidationService(validator, mode="inline")
+    user_data = {"federation_provider": "foo", "federation_id": "abc"}
+    validator.validators[0].validators[0].options.remove("foo")
+    assert service.validate(user_data) == (True, [])
+    assert not validator.validate(user_data)[0]
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_service_on_a_schema_validator(tmp_path: Path, mode: str):
+    schema = tmp_path / "schema.json"
+    schema.write_bytes((Path(__file__).parent / "schemas" / "user_data.json").read_bytes())
+    validator = SchemaValidator(schema)
+    registrations = random_registrations(500, seed=15)
+    expected = [validator.validate(user_data) for user_data in registrations]
+    with ValidationService(validator, mode=mode, workers=2, chunk_size=100) as service:
+        schema.write_text('{"rule": "name", "property": "firstname"}')
+        assert validator.reload()
+        assert service.validate_many(registrations) == expected
+        assert service.validate(registrations[0]) == expected[0]
+
+
+def test_service_shared_by_threads():
+    service = ValidationService(create_user_data_validator(), mode="inline")
+    registrations = random_registrations(300, seed=13)
+    expected = service.validate_many(registrations)
+    results = {}
+
+    def validate(thread: int):
+        results[thread] = [service.validate(user_data) for user_data in registrations]
+
+    threads = [threading.Thread(target=validate, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(thread_results == expected for thread_results in results.values())
+
+
+def test_threads_share_one_pool(monkeypatch: pytest.MonkeyPatch):
+    pools = []
+
+    class SlowThreadPoolExecutor(ThreadPoolExecutor):
+        # Gives the other threads time to ask for the pool while it is being created
+        def __init__(self, workers: int | None) -> None:
+            time.sleep(0.05)
+            super().__init__(workers)
+            pools.append(self)
+
+    monkeypatch.setattr("exercises.composite.service.ThreadPoolExecutor", SlowThreadPoolExecutor)
+    registrations = random_registrations(50, seed=19)
+    with ValidationService(create_user_data_validator(), mode="thread", workers=2, chunk_size=10) as service:
+        threads = [threading.Thread(target=service.validate_many, args=(registrations,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(pools) == 1
+
+
+def test_service_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        ValidationService(create_user_data_validator(), mode="fibers")
@@ -0,0 +1,48 @@
+import csv
+import json
+import mmap
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Readers of the CSV and JSONL files the loan pipeline and the bulk registration import take
+FILE_TYPES = {".csv": "csv", ".jsonl": "jsonl"}
+
+
+def file_type_of(path: str | Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in FILE_TYPES:
+        raise ValueError(f"Unsupported file type '{suffix}', expected one of: {', '.join(FILE_TYPES)}")
+    return FILE_TYPES[suffix]
+
+
+@contextmanager
+def open_lines(path: str | Path, memory_map: bool = False) -> Iterator[Iterable[str]]:
+    if not memory_map:
+        with open(path, newline="") as file:
+            yield file
+        return
+    with open(path, "rb") as file:
+        if Path(path).stat().st_size == 0:
+            yield iter(())
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield (line.decode() for line in iter(mapped.readline, b""))
+
+
+def read_records(lines: Iterable[str], file_type: str) -> Iterator[tuple[int, dict]]:
+    if file_type == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Line {line_number}: {error}") from error
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number}: expected an object, got {type(record).__name__}")
+        yield line_number, record
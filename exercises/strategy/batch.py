@@ -0,0 +1,294 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from .strategy import BUILT_IN_STRATEGIES, REPAYMENT_STRATEGIES, LoanInfo, MonthlyRepayment
+
+# Loan kinds vectorised below, which are the built-in ones. Other registered kinds, and built-in ones registered again,
+# fall back to their scalar strategy, whenever they were registered.
+VECTORISED_STRATEGIES = BUILT_IN_STRATEGIES
+
+
+# Columnar (struct-of-arrays) counterparts of LoanInfo and MonthlyRepayment. Each field is one numpy array, with
+# one entry per loan, so a whole portfolio can be evaluated with vectorised operations instead of one call per loan.
+@dataclass
+class LoanBatch:
+    loan_id: np.ndarray
+    loan_kind: np.ndarray
+    original_duration: np.ndarray
+    remaining_duration: np.ndarray
+    interest: np.ndarray
+    amount: np.ndarray
+    current_credit_score: np.ndarray
+    libor: np.ndarray
+
+    @classmethod
+    def from_loans(cls, loans: Iterable[LoanInfo]) -> "LoanBatch":
+        loans = list(loans)
+        return cls(
+            loan_id=np.array([loan.loan_id for loan in loans], dtype=object),
+            loan_kind=np.array([loan.loan_kind for loan in loans], dtype=str),
+            original_duration=np.array([loan.original_duration for loan in loans], dtype=np.int64),
+            remaining_duration=np.array([loan.remaining_duration for loan in loans], dtype=np.int64),
+            interest=np.array([loan.interest for loan in loans], dtype=np.float64),
+            amount=np.array([loan.amount for loan in loans], dtype=np.float64),
+            current_credit_score=np.array([loan.current_credit_score for loan in loans], dtype=np.int64),
+            libor=np.array([loan.libor for loan in loans], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.loan_id)
+
+    def __getitem__(self, index) -> "LoanBatch":
+        return LoanBatch(
+            loan_id=self.loan_id[index],
+            loan_kind=self.loan_kind[index],
+            original_duration=self.original_duration[index],
+            remaining_duration=self.remaining_duration[index],
+            interest=self.interest[index],
+            amount=self.amount[index],
+            current_credit_score=self.current_credit_score[index],
+            libor=self.libor[index],
+        )
+
+    def to_loans(self) -> list[LoanInfo]:
+        return [
+            LoanInfo(
+                loan_id=loan_id,
+                loan_kind=str(loan_kind),
+                original_duration=original_duration,
+                remaining_duration=remaining_duration,
+                interest=interest,
+                amount=amount,
+                current_credit_score=current_credit_score,
+                libor=libor,
+            )
+            for (
+                loan_id,
+                loan_kind,
+                original_duration,
+                remaining_duration,
+                interest,
+                amount,
+                current_credit_score,
+                libor,
+            ) in zip(
+                self.loan_id.tolist(),
+                self.loan_kind.tolist(),
+                self.original_duration.tolist(),
+                self.remaining_duration.tolist(),
+                self.interest.tolist(),
+                self.amount.tolist(),
+                self.current_credit_score.tolist(),
+                self.libor.tolist(),
+            )
+        ]
+
+
+@dataclass
+class RepaymentBatch:
+    loan_id: np.ndarray
+    payment: np.ndarray
+    amount_remaining: np.ndarray
+    remaining_duration: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.loan_id)
+
+    def __getitem__(self, index) -> "RepaymentBatch":
+        return RepaymentBatch(
+            loan_id=self.loan_id[index],
+            payment=self.payment[index],
+            amount_remaining=self.amount_remaining[index],
+            remaining_duration=self.remaining_duration[index],
+        )
+
+    def to_repayments(self) -> list[MonthlyRepayment]:
+        return [
+            MonthlyRepayment(
+                loan_id=loan_id,
+                payment=payment,
+                amount_remaining=amount_remaining,
+                remaining_duration=remaining_duration,
+            )
+            for loan_id, payment, amount_remaining, remaining_duration in zip(
+                self.loan_id.tolist(),
+                self.payment.tolist(),
+                self.amount_remaining.tolist(),
+                self.remaining_duration.tolist(),
+            )
+        ]
+
+
+def round_4(values: np.ndarray) -> np.ndarray:
+    # np.round scales by 10^4 before rounding, which can land on the other side of a .5 boundary than the builtin
+    # round() does, as the builtin rounds the exact binary value. Those cases are rare, so they are re-rounded one
+    # by one to keep the batch results identical to the scalar ones.
+    scaled = values * 1e4
+    rounded = np.rint(scaled) / 1e4
+    fraction = np.abs(scaled - np.trunc(scaled))
+    ambiguous = np.flatnonzero(np.abs(fraction - 0.5) <= np.abs(scaled) * 1e-12 + 1e-9)
+    for index in ambiguous.tolist():
+        rounded[index] = round(float(values[index]), 4)
+    return rounded
+
+
+def encode_known_loan_kinds(loan_kinds: np.ndarray, known: Iterable[str]) -> tuple[dict[str, int], np.ndarray]:
+    # The code of each known kind, and each loan's code, or len(known) for a kind that is not known. The codes come
+    # from a binary search of the sorted known kinds, so the strings are compared in one pass over the loans rather
+    # than once per kind, and the kinds can then be masked on small integers.
+    table = np.array(sorted(known), dtype=str)
+    dtype = np.min_scalar_type(len(table))
+    if not len(table):
+        return {}, np.zeros(len(loan_kinds), dtype=dtype)
+    position = np.minimum(np.searchsorted(table, loan_kinds), len(table) - 1)
+    codes = np.where(table[position] == loan_kinds, position, len(table)).astype(dtype)
+    return {loan_kind: code for code, loan_kind in enumerate(table.tolist())}, codes
+
+
+def create_monthly_repayments(loans: LoanBatch) -> RepaymentBatch:
+    # Loans with no months left are divided by 1 instead, and only fail below when their kind's scalar strategy
+    # would divide by their remaining duration
+    no_months_left = loans.remaining_duration == 0
+    amount = loans.amount
+    interest_payment = amount * loans.interest / 12 / 100
+    variable_interest_payment = amount * (loans.interest + loans.libor) / 12 / 100
+    repayment = amount / np.where(no_months_left, 1, loans.remaining_duration)
+    duration_so_far = loans.original_duration - loans.remaining_duration
+    is_last_repayment = loans.remaining_duration <= 1
+    credit_score = loans.current_credit_score
+    zero = np.zeros_like(amount)
+
+    # Loans of an unknown kind are repaid as interest_and_repayment
+    payment = interest_payment + repayment
+    amount_remaining = amount - repayment
+    # Where the repayment, and so the division by the remaining duration, is used
+    divides = np.ones_like(no_months_left)
+
+    kind_code, codes = encode_known_loan_kinds(loans.loan_kind, REPAYMENT_STRATEGIES)
+    kind_count = np.bincount(codes, minlength=len(kind_code) + 1)
+
+    # Each kind's repayment is only calculated when the batch has loans of that kind
+    def apply(loan_kind: str, calculate: Callable[[], tuple[np.ndarray, np.ndarray]], repaid: np.ndarray | bool = True):
+        if not kind_count[kind_code[loan_kind]]:
+            return
+        mask = codes == kind_code[loan_kind]
+        kind_payment, kind_amount_remaining = calculate()
+        payment[mask] = kind_payment[mask]
+        amount_remaining[mask] = kind_amount_remaining[mask]
+        divides[mask] = np.broadcast_to(repaid, mask.shape)[mask]
+
+    apply(
+        "interest_only",
+        lambda: (
+            np.where(is_last_repayment, interest_payment + amount, interest_payment),
+            np.where(is_last_repayment, zero, amount),
+        ),
+        repaid=False,
+    )
+    apply(
+        "interest_only_variable",
+        lambda: (
+            np.where(is_last_repayment, variable_interest_payment + amount, variable_interest_payment),
+            np.where(is_last_repayment, zero, amount),
+        ),
+        repaid=False,
+    )
+    apply(
+        "v_interest_and_repayment",
+        lambda: (
+            variable_interest_payment + repayment,
+            amount - repayment,
+        ),
+    )
+    in_offer = duration_so_far < 3
+    apply(
+        "introductory_offer_3",
+        lambda in_offer=in_offer: (
+            np.where(in_offer, zero, interest_payment + repayment),
+            np.where(in_offer, amount + interest_payment, amount - repayment),
+        ),
+        repaid=~in_offer,
+    )
+    in_offer = duration_so_far < 12
+    apply(
+        "introductory_offer_12",
+        lambda in_offer=in_offer: (
+            np.where(in_offer, zero, variable_interest_payment + repayment),
+            np.where(in_offer, amount + variable_interest_payment, amount - repayment),
+        ),
+        repaid=~in_offer,
+    )
+    in_offer = duration_so_far < 6
+    apply(
+        "introductory_offer_interst_only_6",
+        lambda in_offer=in_offer: (
+            np.where(in_offer, interest_payment, interest_payment + repayment),
+            np.where(in_offer, amount, amount - repayment),
+        ),
+        repaid=~in_offer,
+    )
+    in_offer = duration_so_far < 9
+    apply(
+        "introductory_offer_interst_only_9",
+        lambda in_offer=in_offer: (
+            np.where(in_offer, interest_payment, interest_payment + repayment),
+            np.where(in_offer, amount, amount - repayment),
+        ),
+        repaid=~in_offer,
+    )
+    apply(
+        "good_credit_score",
+        lambda: (
+            np.where(credit_score >= 700, repayment, interest_payment + repayment),
+            amount - repayment,
+        ),
+    )
+    apply(
+        "very_good_credit_score",
+        lambda: (
+            np.where(credit_score >= 850, repayment, variable_interest_payment + repayment),
+            amount - repayment,
+        ),
+    )
+    is_bad = credit_score < 650
+    apply(
+        "bad_credit_score",
+        lambda is_bad=is_bad: (
+            np.where(is_bad, interest_payment * 2 + repayment, interest_payment + repayment),
+            np.where(is_bad, amount - repayment, amount + interest_payment),
+        ),
+    )
+    is_bad = credit_score < 500
+    apply(
+        "very_bad_credit_score",
+        lambda is_bad=is_bad: (
+            np.where(is_bad, interest_payment * 2 + repayment, interest_payment + repayment),
+            np.where(is_bad, amount - repayment, amount + interest_payment),
+        ),
+    )
+
+    payment = round_4(payment)
+    amount_remaining = round_4(amount_remaining)
+
+    for loan_kind, strategy in REPAYMENT_STRATEGIES.items():
+        if VECTORISED_STRATEGIES.get(loan_kind) is strategy:
+            continue
+        if not kind_count[kind_code[loan_kind]]:
+            continue
+        for index in np.flatnonzero(codes == kind_code[loan_kind]).tolist():
+            result = strategy.create_monthly_repayment(loans[index : index + 1].to_loans()[0])
+            payment[index] = result.payment
+            amount_remaining[index] = result.amount_remaining
+            divides[index] = False
+
+    if np.any(no_months_left & divides):
+        raise ZeroDivisionError("division by zero")
+
+    return RepaymentBatch(
+        loan_id=loans.loan_id,
+        payment=payment,
+        amount_remaining=amount_remaining,
+        remaining_duration=loans.remaining_duration - 1,
+    )
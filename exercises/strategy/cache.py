@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .strategy import LoanInfo, MonthlyRepayment, create_monthly_repayment
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Everything create_monthly_repayment depends on, apart from loan_id which is only copied to the result
+def quote_key(loan_info: LoanInfo) -> tuple:
+    return (
+        loan_info.loan_kind,
+        loan_info.original_duration,
+        loan_info.remaining_duration,
+        loan_info.interest,
+        loan_info.amount,
+        loan_info.current_credit_score,
+        loan_info.libor,
+    )
+
+
+LIBOR_POSITION = 6
+
+
+# An opt-in, bounded LRU cache in front of create_monthly_repayment, for workloads that repeatedly ask for the same
+# quote. Entries are optionally dropped after ttl seconds.
+class RepaymentCache:
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple, tuple[float, float, int, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        key = quote_key(loan_info)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payment, amount_remaining, remaining_duration, expires = entry
+                if expires is None or expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return MonthlyRepayment(loan_info.loan_id, payment, amount_remaining, remaining_duration)
+                del self._entries[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+
+        repayment = create_monthly_repayment(loan_info)
+        expires = None if self.ttl is None else self.clock() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (repayment.payment, repayment.amount_remaining, repayment.remaining_duration, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return repayment
+
+    def invalidate_libor(self, current_libor: float) -> int:
+        # The libor rate is part of the key, so old entries are never returned for a new rate. Dropping them frees
+        # up their space straight away, instead of waiting for them to be evicted.
+        with self._lock:
+            stale = [key for key in self._entries if key[LIBOR_POSITION] != current_libor]
+            for key in stale:
+                del self._entries[key]
+            self.stats.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
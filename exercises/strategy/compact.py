@@ -0,0 +1,243 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import LoanBatch
+from .strategy import LoanInfo, MonthlyRepayment
+
+
+# Memory efficient variants of the models. They have the same fields as LoanInfo and MonthlyRepayment, so they can
+# be passed to create_monthly_repayment as they are, and converted to the original models where those are expected.
+@dataclass(slots=True)
+class SlottedLoanInfo:
+    loan_id: str
+    loan_kind: str
+    original_duration: int
+    remaining_duration: int
+    interest: float
+    amount: float
+    current_credit_score: int
+    libor: float
+
+    @classmethod
+    def from_loan_info(cls, loan_info: LoanInfo) -> "SlottedLoanInfo":
+        return cls(*loan_fields(loan_info))
+
+    def to_loan_info(self) -> LoanInfo:
+        return LoanInfo(*loan_fields(self))
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenLoanInfo:
+    loan_id: str
+    loan_kind: str
+    original_duration: int
+    remaining_duration: int
+    interest: float
+    amount: float
+    current_credit_score: int
+    libor: float
+
+    @classmethod
+    def from_loan_info(cls, loan_info: LoanInfo) -> "FrozenLoanInfo":
+        return cls(*loan_fields(loan_info))
+
+    def to_loan_info(self) -> LoanInfo:
+        return LoanInfo(*loan_fields(self))
+
+
+@dataclass(slots=True)
+class SlottedMonthlyRepayment:
+    loan_id: str
+    payment: float
+    amount_remaining: float
+    remaining_duration: int
+
+    @classmethod
+    def from_monthly_repayment(cls, repayment: MonthlyRepayment) -> "SlottedMonthlyRepayment":
+        return cls(repayment.loan_id, repayment.payment, repayment.amount_remaining, repayment.remaining_duration)
+
+    def to_monthly_repayment(self) -> MonthlyRepayment:
+        return MonthlyRepayment(self.loan_id, self.payment, self.amount_remaining, self.remaining_duration)
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenMonthlyRepayment:
+    loan_id: str
+    payment: float
+    amount_remaining: float
+    remaining_duration: int
+
+    @classmethod
+    def from_monthly_repayment(cls, repayment: MonthlyRepayment) -> "FrozenMonthlyRepayment":
+        return cls(repayment.loan_id, repayment.payment, repayment.amount_remaining, repayment.remaining_duration)
+
+    def to_monthly_repayment(self) -> MonthlyRepayment:
+        return MonthlyRepayment(self.loan_id, self.payment, self.amount_remaining, self.remaining_duration)
+
+
+def loan_fields(loan_info) -> tuple:
+    return (
+        loan_info.loan_id,
+        loan_info.loan_kind,
+        loan_info.original_duration,
+        loan_info.remaining_duration,
+        loan_info.interest,
+        loan_info.amount,
+        loan_info.current_credit_score,
+        loan_info.libor,
+    )
+
+
+# A read-only LoanInfo lookalike over one row of a LoanPortfolio. It only holds the portfolio and the row index, the
+# values are read from the columns when accessed.
+class LoanView:
+    __slots__ = ("_index", "_portfolio")
+
+    def __init__(self, portfolio: "LoanPortfolio", index: int) -> None:
+        self._portfolio = portfolio
+        self._index = index
+
+    @property
+    def loan_id(self) -> str:
+        return str(self._portfolio.loan_id[self._index])
+
+    @property
+    def loan_kind(self) -> str:
+        return self._portfolio.loan_kinds[self._portfolio.loan_kind_code[self._index]]
+
+    @property
+    def original_duration(self) -> int:
+        return int(self._portfolio.original_duration[self._index])
+
+    @property
+    def remaining_duration(self) -> int:
+        return int(self._portfolio.remaining_duration[self._index])
+
+    @property
+    def interest(self) -> float:
+        return float(self._portfolio.interest[self._index])
+
+    @property
+    def amount(self) -> float:
+        return float(self._portfolio.amount[self._index])
+
+    @property
+    def current_credit_score(self) -> int:
+        return int(self._portfolio.current_credit_score[self._index])
+
+    @property
+    def libor(self) -> float:
+        return float(self._portfolio.libor[self._index])
+
+    def to_loan_info(self) -> LoanInfo:
+        return LoanInfo(*loan_fields(self))
+
+    def __repr__(self) -> str:
+        return f"LoanView({self.to_loan_info()})"
+
+
+def encode_loan_kinds(loan_kinds: Iterable[str]) -> tuple[list[str], np.ndarray]:
+    # The distinct kinds in order of appearance, and each loan's position among them, in the smallest unsigned type
+    # that holds every position
+    codes: dict[str, int] = {}
+    positions = [codes.setdefault(loan_kind, len(codes)) for loan_kind in loan_kinds]
+    return list(codes), np.array(positions, dtype=np.min_scalar_type(max(len(codes) - 1, 0)))
+
+
+# Stores the LoanInfo fields as typed numpy columns. Loan kinds are stored as a small code into loan_kinds, as there
+# are usually only a handful of them, and the loan ids as fixed width strings rather than one Python object per loan.
+class LoanPortfolio:
+    def __init__(
+        self,
+        loan_id: np.ndarray,
+        loan_kinds: list[str],
+        loan_kind_code: np.ndarray,
+        original_duration: np.ndarray,
+        remaining_duration: np.ndarray,
+        interest: np.ndarray,
+        amount: np.ndarray,
+        current_credit_score: np.ndarray,
+        libor: np.ndarray,
+    ) -> None:
+        self.loan_id = loan_id
+        self.loan_kinds = loan_kinds
+        self.loan_kind_code = loan_kind_code
+        self.original_duration = original_duration
+        self.remaining_duration = remaining_duration
+        self.interest = interest
+        self.amount = amount
+        self.current_credit_score = current_credit_score
+        self.libor = libor
+
+    @classmethod
+    def from_loans(cls, loans: Iterable[LoanInfo]) -> "LoanPortfolio":
+        loans = list(loans)
+        loan_kinds, loan_kind_code = encode_loan_kinds(loan.loan_kind for loan in loans)
+        return cls(
+            loan_id=np.array([loan.loan_id for loan in loans], dtype=str),
+            loan_kinds=loan_kinds,
+            loan_kind_code=loan_kind_code,
+            original_duration=np.array([loan.original_duration for loan in loans], dtype=np.int32),
+            remaining_duration=np.array([loan.remaining_duration for loan in loans], dtype=np.int32),
+            interest=np.array([loan.interest for loan in loans], dtype=np.float64),
+            amount=np.array([loan.amount for loan in loans], dtype=np.float64),
+            current_credit_score=np.array([loan.current_credit_score for loan in loans], dtype=np.int16),
+            libor=np.array([loan.libor for loan in loans], dtype=np.float64),
+        )
+
+    @classmethod
+    def from_batch(cls, batch: LoanBatch) -> "LoanPortfolio":
+        loan_kinds, loan_kind_code = encode_loan_kinds(batch.loan_kind.tolist())
+        return cls(
+            loan_id=batch.loan_id.astype(str),
+            loan_kinds=loan_kinds,
+            loan_kind_code=loan_kind_code,
+            original_duration=batch.original_duration.astype(np.int32),
+            remaining_duration=batch.remaining_duration.astype(np.int32),
+            interest=batch.interest,
+            amount=batch.amount,
+            current_credit_score=batch.current_credit_score.astype(np.int16),
+            libor=batch.libor,
+        )
+
+    def __len__(self) -> int:
+        return len(self.loan_id)
+
+    def __getitem__(self, index: int | slice) -> "LoanView | LoanPortfolio":
+        if isinstance(index, slice):
+            return LoanPortfolio(
+                loan_id=self.loan_id[index],
+                loan_kinds=self.loan_kinds,
+                loan_kind_code=self.loan_kind_code[index],
+                original_duration=self.original_duration[index],
+                remaining_duration=self.remaining_duration[index],
+                interest=self.interest[index],
+                amount=self.amount[index],
+                current_credit_score=self.current_credit_score[index],
+                libor=self.libor[index],
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("loan portfolio index out of range")
+        return LoanView(self, index)
+
+    def __iter__(self) -> Iterator[LoanView]:
+        return (LoanView(self, index) for index in range(len(self)))
+
+    def to_loans(self) -> list[LoanInfo]:
+        return self.to_batch().to_loans()
+
+    def to_batch(self) -> LoanBatch:
+        return LoanBatch(
+            loan_id=self.loan_id.astype(object),
+            loan_kind=np.array(self.loan_kinds, dtype=str)[self.loan_kind_code],
+            original_duration=self.original_duration.astype(np.int64),
+            remaining_duration=self.remaining_duration.astype(np.int64),
+            interest=self.interest,
+            amount=self.amount,
+            current_credit_score=self.current_credit_score.astype(np.int64),
+            libor=self.libor,
+        )
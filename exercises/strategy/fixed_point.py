@@ -0,0 +1,265 @@
+from dataclasses import dataclass
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import numpy as np
+
+from .batch import VECTORISED_STRATEGIES, LoanBatch, RepaymentBatch, encode_known_loan_kinds
+from .strategy import REPAYMENT_STRATEGIES, LoanInfo, MonthlyRepayment
+
+# Amounts are held as integer multiples of 0.0001 (the precision repayments are rounded to) and rates as integer
+# multiples of 0.000001%, which holds LIBOR fixings, published to 5 decimals, exactly. Rates are never rounded: one
+# with more decimals raises. A month's interest is amount * rate / INTEREST_DENOMINATOR in amount units.
+AMOUNT_SCALE = 10_000
+RATE_SCALE = 1_000_000
+INTEREST_DENOMINATOR = 12 * 100 * RATE_SCALE
+# Largest amount * rate product the int64 batch path can hold
+MAX_INTEREST_NUMERATOR = 2**62
+
+# Every repayment and amount remaining has the form
+#   base * amount + amount * rate / INTEREST_DENOMINATOR + repayment_sign * amount / remaining_duration
+# so a loan kind only decides the three coefficients. Rates are the fixed rate, the variable rate, double the fixed
+# rate or no rate at all.
+NO_RATE, FIXED_RATE, VARIABLE_RATE, DOUBLE_FIXED_RATE = range(4)
+
+
+def to_units(value: float | Decimal | str, scale: int, exact: bool = False) -> int:
+    # Fast path: floats (and ints) that are the closest float to a number with no more decimals than the scale has,
+    # which is what loan amounts and rates are in practice
+    if isinstance(value, (int, float)):
+        units = round(value * scale)
+        if units / scale == value:
+            return units
+    scaled = Decimal(str(value)) * scale
+    units = int(scaled.to_integral_value(ROUND_HALF_EVEN))
+    if exact and units != scaled:
+        raise ValueError(
+            f"{value} has more decimals than the exact calculation can hold, at most {len(str(scale)) - 1}"
+        )
+    return units
+
+
+def to_units_array(values: np.ndarray, scale: int, exact: bool = False) -> np.ndarray:
+    # to_units for a column of floats. The fast path is vectorised, and the rare values with more decimals than the
+    # scale are converted one by one, so every value gets the same units on the batch path as on the scalar one.
+    units = np.rint(values * scale)
+    result = units.astype(np.int64)
+    for index in np.flatnonzero(units / scale != values).tolist():
+        result[index] = to_units(float(values[index]), scale, exact)
+    return result
+
+
+def to_amount_units(value: float | Decimal | str) -> int:
+    return to_units(value, AMOUNT_SCALE)
+
+
+def to_rate_units(value: float | Decimal | str) -> int:
+    return to_units(value, RATE_SCALE, exact=True)
+
+
+def from_amount_units(units: int) -> Decimal:
+    return Decimal(units).scaleb(-4)
+
+
+def round_sum(base, interest_numerator, repayment_numerator, remaining_duration):
+    # Exactly rounds base + interest_numerator / INTEREST_DENOMINATOR + repayment_numerator / remaining_duration to
+    # the nearest integer, ties to even (the same rule the builtin round() uses). Only integer operations are used,
+    # so this works both on Python ints and on numpy int64 arrays.
+    interest_whole = interest_numerator // INTEREST_DENOMINATOR
+    interest_fraction = interest_numerator % INTEREST_DENOMINATOR
+    repayment_whole = repayment_numerator // remaining_duration
+    repayment_fraction = repayment_numerator % remaining_duration
+
+    denominator = INTEREST_DENOMINATOR * remaining_duration
+    fraction = interest_fraction * remaining_duration + repayment_fraction * INTEREST_DENOMINATOR
+    carry = fraction >= denominator
+    whole = base + interest_whole + repayment_whole + carry
+    fraction = fraction - carry * denominator
+    round_up = (2 * fraction > denominator) | ((2 * fraction == denominator) & (whole % 2 == 1))
+    return whole + round_up
+
+
+def unsupported_loan_kinds() -> list[str]:
+    # Kinds registered at runtime (or re-registered) have no exact calculation
+    return [
+        loan_kind
+        for loan_kind, strategy in REPAYMENT_STRATEGIES.items()
+        if VECTORISED_STRATEGIES.get(loan_kind) is not strategy
+    ]
+
+
+def unsupported_loan_kind_error(loan_kind: str) -> ValueError:
+    return ValueError(f"There is no exact repayment calculation for loan kind '{loan_kind}'")
+
+
+INTEREST_AND_REPAYMENT = ((0, FIXED_RATE, 1), (1, NO_RATE, -1))
+V_INTEREST_AND_REPAYMENT = ((0, VARIABLE_RATE, 1), (1, NO_RATE, -1))
+REPAYMENT_ONLY = ((0, NO_RATE, 1), (1, NO_RATE, -1))
+INTEREST_ONLY = ((0, FIXED_RATE, 0), (1, NO_RATE, 0))
+
+
+# For each loan kind: a condition on (remaining_duration, duration_so_far, current_credit_score), and the
+# ((base, rate, repayment_sign) of the payment, (base, rate, repayment_sign) of the amount remaining) when the
+# condition holds and when it does not. The conditions work both on Python ints and numpy arrays.
+EXACT_REPAYMENT_TERMS = {
+    "interest_only": (
+        lambda remaining, so_far, score: remaining <= 1,
+        ((1, FIXED_RATE, 0), (0, NO_RATE, 0)),
+        INTEREST_ONLY,
+    ),
+    "interest_only_variable": (
+        lambda remaining, so_far, score: remaining <= 1,
+        ((1, VARIABLE_RATE, 0), (0, NO_RATE, 0)),
+        ((0, VARIABLE_RATE, 0), (1, NO_RATE, 0)),
+    ),
+    "interest_and_repayment": (lambda remaining, so_far, score: True, INTEREST_AND_REPAYMENT, INTEREST_AND_REPAYMENT),
+    "v_interest_and_repayment": (
+        lambda remaining, so_far, score: True,
+        V_INTEREST_AND_REPAYMENT,
+        V_INTEREST_AND_REPAYMENT,
+    ),
+    "introductory_offer_3": (
+        lambda remaining, so_far, score: so_far < 3,
+        ((0, NO_RATE, 0), (1, FIXED_RATE, 0)),
+        INTEREST_AND_REPAYMENT,
+    ),
+    "introductory_offer_12": (
+        lambda remaining, so_far, score: so_far < 12,
+        ((0, NO_RATE, 0), (1, VARIABLE_RATE, 0)),
+        V_INTEREST_AND_REPAYMENT,
+    ),
+    "introductory_offer_interst_only_6": (
+        lambda remaining, so_far, score: so_far < 6,
+        INTEREST_ONLY,
+        INTEREST_AND_REPAYMENT,
+    ),
+    "introductory_offer_interst_only_9": (
+        lambda remaining, so_far, score: so_far < 9,
+        INTEREST_ONLY,
+        INTEREST_AND_REPAYMENT,
+    ),
+    "good_credit_score": (lambda remaining, so_far, score: score >= 700, REPAYMENT_ONLY, INTEREST_AND_REPAYMENT),
+    "very_good_credit_score": (lambda remaining, so_far, score: score >= 850, REPAYMENT_ONLY, V_INTEREST_AND_REPAYMENT),
+    "bad_credit_score": (
+        lambda remaining, so_far, score: score < 650,
+        ((0, DOUBLE_FIXED_RATE, 1), (1, NO_RATE, -1)),
+        ((0, FIXED_RATE, 1), (1, FIXED_RATE, 0)),
+    ),
+    "very_bad_credit_score": (
+        lambda remaining, so_far, score: score < 500,
+        ((0, DOUBLE_FIXED_RATE, 1), (1, NO_RATE, -1)),
+        ((0, FIXED_RATE, 1), (1, FIXED_RATE, 0)),
+    ),
+}
+
+
+def create_monthly_repayment_exact(loan_info: LoanInfo) -> MonthlyRepayment:
+    # Same as create_monthly_repayment, but the payment and amount remaining are exact Decimals
+    if loan_info.loan_kind in unsupported_loan_kinds():
+        raise unsupported_loan_kind_error(loan_info.loan_kind)
+    if loan_info.remaining_duration == 0:
+        raise ZeroDivisionError("division by zero")
+    amount = to_amount_units(loan_info.amount)
+    interest = to_rate_units(loan_info.interest)
+    rates = [0, interest, interest + to_rate_units(loan_info.libor), 2 * interest]
+    condition, when_true, when_false = EXACT_REPAYMENT_TERMS.get(
+        loan_info.loan_kind, EXACT_REPAYMENT_TERMS["interest_and_repayment"]
+    )
+    duration_so_far = loan_info.original_duration - loan_info.remaining_duration
+    terms = (
+        when_true
+        if condition(loan_info.remaining_duration, duration_so_far, loan_info.current_credit_score)
+        else when_false
+    )
+    payment, amount_remaining = (
+        round_sum(base * amount, amount * rates[rate], repayment_sign * amount, loan_info.remaining_duration)
+        for base, rate, repayment_sign in terms
+    )
+    return MonthlyRepayment(
+        loan_id=loan_info.loan_id,
+        payment=from_amount_units(payment),
+        amount_remaining=from_amount_units(amount_remaining),
+        remaining_duration=loan_info.remaining_duration - 1,
+    )
+
+
+@dataclass
+class ExactRepaymentBatch:
+    loan_id: np.ndarray
+    payment_units: np.ndarray
+    amount_remaining_units: np.ndarray
+    remaining_duration: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.loan_id)
+
+    def to_repayments(self) -> list[MonthlyRepayment]:
+        return [
+            MonthlyRepayment(
+                loan_id=loan_id,
+                payment=from_amount_units(payment),
+                amount_remaining=from_amount_units(amount_remaining),
+                remaining_duration=remaining_duration,
+            )
+            for loan_id, payment, amount_remaining, remaining_duration in zip(
+                self.loan_id.tolist(),
+                self.payment_units.tolist(),
+                self.amount_remaining_units.tolist(),
+                self.remaining_duration.tolist(),
+            )
+        ]
+
+    def to_float_batch(self) -> RepaymentBatch:
+        return RepaymentBatch(
+            loan_id=self.loan_id,
+            payment=self.payment_units / AMOUNT_SCALE,
+            amount_remaining=self.amount_remaining_units / AMOUNT_SCALE,
+            remaining_duration=self.remaining_duration,
+        )
+
+
+def create_monthly_repayments_exact(loans: LoanBatch) -> ExactRepaymentBatch:
+    kind_code, codes = encode_known_loan_kinds(loans.loan_kind, REPAYMENT_STRATEGIES)
+    kind_count = np.bincount(codes, minlength=len(kind_code) + 1)
+    for loan_kind in unsupported_loan_kinds():
+        if kind_count[kind_code[loan_kind]]:
+            raise unsupported_loan_kind_error(loan_kind)
+    if np.any(loans.remaining_duration == 0):
+        raise ZeroDivisionError("division by zero")
+
+    amount = to_units_array(loans.amount, AMOUNT_SCALE)
+    interest = to_units_array(loans.interest, RATE_SCALE, exact=True)
+    variable_interest = interest + to_units_array(loans.libor, RATE_SCALE, exact=True)
+    remaining_duration = loans.remaining_duration
+    duration_so_far = loans.original_duration - remaining_duration
+    credit_score = loans.current_credit_score
+
+    # coefficients[0] holds the (base, rate, repayment_sign) of the payments, coefficients[1] of the amounts remaining.
+    # Loans of an unknown kind are repaid as interest_and_repayment.
+    coefficients = np.empty((2, 3, len(loans)), dtype=np.int64)
+    coefficients[:] = np.array(INTEREST_AND_REPAYMENT)[:, :, np.newaxis]
+    for loan_kind, (condition, when_true, when_false) in EXACT_REPAYMENT_TERMS.items():
+        if not kind_count[kind_code[loan_kind]]:
+            continue
+        mask = codes == kind_code[loan_kind]
+        holds = np.asarray(condition(remaining_duration, duration_so_far, credit_score))
+        coefficients[:, :, mask & holds] = np.array(when_true)[:, :, np.newaxis]
+        coefficients[:, :, mask & ~holds] = np.array(when_false)[:, :, np.newaxis]
+    (payment_base, payment_rate, payment_sign), (amount_base, amount_rate, amount_sign) = coefficients
+
+    rates = [np.zeros_like(interest), interest, variable_interest, 2 * interest]
+    payment_rate = np.choose(payment_rate, rates)
+    amount_rate = np.choose(amount_rate, rates)
+    largest_rate = max(np.abs(payment_rate).max(initial=0), np.abs(amount_rate).max(initial=0))
+    if largest_rate and np.abs(amount).max(initial=0) > MAX_INTEREST_NUMERATOR // largest_rate:
+        raise OverflowError("Amount or rate too large for the exact batch calculation, use the scalar one instead")
+
+    return ExactRepaymentBatch(
+        loan_id=loans.loan_id,
+        payment_units=round_sum(
+            payment_base * amount, amount * payment_rate, payment_sign * amount, remaining_duration
+        ),
+        amount_remaining_units=round_sum(
+            amount_base * amount, amount * amount_rate, amount_sign * amount, remaining_duration
+        ),
+        remaining_duration=remaining_duration - 1,
+    )
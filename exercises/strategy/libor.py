@@ -0,0 +1,49 @@
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .batch import LoanBatch, RepaymentBatch, create_monthly_repayments
+from .strategy import DEFAULT_REPAYMENT_STRATEGY, REPAYMENT_STRATEGIES
+
+
+@dataclass
+class RepaymentDelta:
+    # Positions of the changed loans in the book, and their new repayments
+    indices: np.ndarray
+    repayments: RepaymentBatch
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+# Holds a portfolio with its current repayments, indexed by loan kind, so that a libor change only recomputes the
+# loans whose kind depends on libor.
+class RepaymentBook:
+    def __init__(self, loans: LoanBatch) -> None:
+        self.loans = replace(loans, libor=loans.libor.copy())
+        self.repayments = create_monthly_repayments(self.loans)
+        self.kind_index = {
+            loan_kind: np.flatnonzero(self.loans.loan_kind == loan_kind)
+            for loan_kind in set(self.loans.loan_kind.tolist())
+        }
+        sensitive_kinds = [
+            loan_kind
+            for loan_kind in self.kind_index
+            if REPAYMENT_STRATEGIES.get(loan_kind, DEFAULT_REPAYMENT_STRATEGY).libor_sensitive
+        ]
+        self.libor_sensitive = np.sort(
+            np.concatenate([self.kind_index[loan_kind] for loan_kind in sensitive_kinds] or [np.empty(0, np.int64)])
+        )
+
+    def update_libor(self, libor: float) -> RepaymentDelta:
+        self.loans.libor[:] = libor
+        affected = self.libor_sensitive
+        repayments = create_monthly_repayments(self.loans[affected])
+
+        changed = (repayments.payment != self.repayments.payment[affected]) | (
+            repayments.amount_remaining != self.repayments.amount_remaining[affected]
+        )
+        indices = affected[changed]
+        self.repayments.payment[indices] = repayments.payment[changed]
+        self.repayments.amount_remaining[indices] = repayments.amount_remaining[changed]
+        return RepaymentDelta(indices=indices, repayments=repayments[changed])
@@ -0,0 +1,78 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import LoanBatch, RepaymentBatch, create_monthly_repayments
+from .compact import LoanPortfolio
+
+
+@dataclass
+class WorkerStats:
+    worker: int
+    chunks: int
+    loans: int
+    seconds: float
+
+    @property
+    def loans_per_second(self) -> float:
+        return self.loans / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class PortfolioRun:
+    repayments: RepaymentBatch
+    worker_stats: list[WorkerStats]
+    seconds: float
+
+    @property
+    def loans_per_second(self) -> float:
+        return len(self.repayments) / self.seconds if self.seconds else 0.0
+
+
+def _repay_chunk(start: int, chunk: LoanPortfolio) -> tuple[int, int, float, np.ndarray, np.ndarray]:
+    began = time.perf_counter()
+    repayments = create_monthly_repayments(chunk.to_batch())
+    return os.getpid(), start, time.perf_counter() - began, repayments.payment, repayments.amount_remaining
+
+
+def run_portfolio(
+    loans: LoanBatch | LoanPortfolio, workers: int | None = None, chunk_size: int = 100_000
+) -> PortfolioRun:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    # Chunks are sent to the workers as LoanPortfolio slices, which pickle as a handful of typed numpy buffers
+    portfolio = loans if isinstance(loans, LoanPortfolio) else LoanPortfolio.from_batch(loans)
+    began = time.perf_counter()
+
+    payment = np.empty(len(portfolio), dtype=np.float64)
+    amount_remaining = np.empty(len(portfolio), dtype=np.float64)
+    worker_stats: dict[int, WorkerStats] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_repay_chunk, start, portfolio[start : start + chunk_size])
+            for start in range(0, len(portfolio), chunk_size)
+        ]
+        for future in as_completed(futures):
+            worker, start, seconds, chunk_payment, chunk_amount_remaining = future.result()
+            end = start + len(chunk_payment)
+            payment[start:end] = chunk_payment
+            amount_remaining[start:end] = chunk_amount_remaining
+
+            stats = worker_stats.setdefault(worker, WorkerStats(worker=worker, chunks=0, loans=0, seconds=0.0))
+            stats.chunks += 1
+            stats.loans += end - start
+            stats.seconds += seconds
+
+    return PortfolioRun(
+        repayments=RepaymentBatch(
+            loan_id=portfolio.loan_id.astype(object),
+            payment=payment,
+            amount_remaining=amount_remaining,
+            remaining_duration=portfolio.remaining_duration.astype(np.int64) - 1,
+        ),
+        worker_stats=sorted(worker_stats.values(), key=lambda stats: stats.worker),
+        seconds=time.perf_counter() - began,
+    )
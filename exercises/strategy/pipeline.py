@@ -0,0 +1,84 @@
+import csv
+import json
+from collections.abc import Iterator
+from dataclasses import fields
+from pathlib import Path
+from typing import IO
+
+from ..io import file_type_of, open_lines, read_records
+from .batch import LoanBatch, RepaymentBatch, create_monthly_repayments
+from .strategy import LoanInfo, MonthlyRepayment
+
+LOAN_FIELDS = [field.name for field in fields(LoanInfo)]
+REPAYMENT_FIELDS = [field.name for field in fields(MonthlyRepayment)]
+
+
+def parse_loan(record: dict, line_number: int) -> LoanInfo:
+    missing = [name for name in LOAN_FIELDS if record.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"Line {line_number}: missing field(s) {', '.join(missing)}")
+    try:
+        loan_info = LoanInfo(
+            loan_id=str(record["loan_id"]),
+            loan_kind=str(record["loan_kind"]),
+            original_duration=int(record["original_duration"]),
+            remaining_duration=int(record["remaining_duration"]),
+            interest=float(record["interest"]),
+            amount=float(record["amount"]),
+            current_credit_score=int(record["current_credit_score"]),
+            libor=float(record["libor"]),
+        )
+    except (TypeError, ValueError, OverflowError) as error:
+        # JSON fields can have any type, such as a list or an object, or be a number too large for an int
+        raise ValueError(f"Line {line_number}: {error}") from error
+    if loan_info.remaining_duration < 1:
+        raise ValueError(f"Line {line_number}: remaining_duration must be at least 1")
+    return loan_info
+
+
+def read_loans(path: str | Path, chunk_size: int = 100_000, memory_map: bool = False) -> Iterator[list[LoanInfo]]:
+    file_type = file_type_of(path)
+    with open_lines(path, memory_map) as lines:
+        chunk: list[LoanInfo] = []
+        for line_number, record in read_records(lines, file_type):
+            chunk.append(parse_loan(record, line_number))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class RepaymentWriter:
+    def __init__(self, file: IO[str], file_type: str) -> None:
+        self.file = file
+        self.file_type = file_type
+        self.csv_writer = None
+        if file_type == "csv":
+            self.csv_writer = csv.writer(file)
+            self.csv_writer.writerow(REPAYMENT_FIELDS)
+
+    def write(self, repayments: RepaymentBatch) -> None:
+        rows = zip(
+            repayments.loan_id.tolist(),
+            repayments.payment.tolist(),
+            repayments.amount_remaining.tolist(),
+            repayments.remaining_duration.tolist(),
+        )
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(rows)
+            return
+        self.file.writelines(json.dumps(dict(zip(REPAYMENT_FIELDS, row))) + "\n" for row in rows)
+
+
+def process_file(
+    input_path: str | Path, output_path: str | Path, chunk_size: int = 100_000, memory_map: bool = False
+) -> int:
+    output_file_type = file_type_of(output_path)
+    count = 0
+    with open(output_path, "w", newline="") as output:
+        writer = RepaymentWriter(output, output_file_type)
+        for chunk in read_loans(input_path, chunk_size, memory_map):
+            writer.write(create_monthly_repayments(LoanBatch.from_loans(chunk)))
+            count += len(chunk)
+    return count
@@ -0,0 +1,185 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import LoanBatch, create_monthly_repayments
+from .compact import LoanPortfolio
+
+MIN_CREDIT_SCORE = 300
+MAX_CREDIT_SCORE = 850
+
+# The loans of a process pool worker, received once when the worker starts
+_worker_loans: LoanBatch | None = None
+
+
+# What-if paths, one row per scenario and one column per month. Every month of a scenario, all loans get that month's
+# libor, and have their credit score moved by that month's shift, which never takes a score outside the 300-850 range.
+@dataclass
+class ScenarioShocks:
+    libor: np.ndarray
+    credit_score_shift: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.libor = np.asarray(self.libor, dtype=np.float64)
+        self.credit_score_shift = np.asarray(self.credit_score_shift, dtype=np.int64)
+        if self.libor.ndim != 2 or self.libor.shape != self.credit_score_shift.shape:
+            raise ValueError("libor and credit_score_shift must both have the shape (scenarios, months)")
+
+    @property
+    def scenarios(self) -> int:
+        return self.libor.shape[0]
+
+    @property
+    def months(self) -> int:
+        return self.libor.shape[1]
+
+    def __getitem__(self, index: slice) -> "ScenarioShocks":
+        return ScenarioShocks(libor=self.libor[index], credit_score_shift=self.credit_score_shift[index])
+
+    @classmethod
+    def random_walk(
+        cls,
+        scenarios: int,
+        months: int,
+        libor: float,
+        libor_volatility: float = 0.1,
+        credit_score_volatility: float = 10.0,
+        seed: int = 0,
+    ) -> "ScenarioShocks":
+        # Libor moves by a normal step each month and never goes negative; credit scores drift the same way
+        random = np.random.default_rng(seed)
+        libor_paths = np.maximum(libor + np.cumsum(random.normal(0, libor_volatility, (scenarios, months)), axis=1), 0)
+        shifts = np.rint(np.cumsum(random.normal(0, credit_score_volatility, (scenarios, months)), axis=1))
+        return cls(libor=libor_paths, credit_score_shift=shifts.astype(np.int64))
+
+
+# Totals per loan kind, scenario and month, of the payments made and of the amount remaining after them. Each
+# kind's row over the scenarios is the distribution of that quantity for the month.
+@dataclass
+class ScenarioResult:
+    loan_kinds: list[str]
+    cash_flow: np.ndarray
+    balance: np.ndarray
+    seconds: float
+
+    def kind(self, loan_kind: str) -> tuple[np.ndarray, np.ndarray]:
+        index = self.loan_kinds.index(loan_kind)
+        return self.cash_flow[index], self.balance[index]
+
+    def percentiles(self, quantity: str, q: list[float]) -> dict[str, np.ndarray]:
+        # Per loan kind, one row per percentile and one column per month
+        if quantity not in ("cash_flow", "balance"):
+            raise ValueError(f"Unknown quantity '{quantity}', expected cash_flow or balance")
+        values = getattr(self, quantity)
+        return {loan_kind: np.percentile(values[index], q, axis=0) for index, loan_kind in enumerate(self.loan_kinds)}
+
+
+def shift_credit_scores(credit_score: np.ndarray, shift: np.ndarray) -> np.ndarray:
+    # A shift stops at the edges of the 300-850 range, but scores that were already outside it are left where they are
+    # rather than being moved by a shift of zero
+    lowest, highest = np.minimum(credit_score, MIN_CREDIT_SCORE), np.maximum(credit_score, MAX_CREDIT_SCORE)
+    return np.clip(credit_score + shift, lowest, highest)
+
+
+def simulate_kind(loans: LoanBatch, shocks: ScenarioShocks) -> tuple[np.ndarray, np.ndarray]:
+    # Runs loans of a single kind through every scenario of the block at once, as one batch of scenarios x loans,
+    # laid out scenario by scenario. A batch of one kind is much faster to repay than a mixed one, as every loan kind
+    # comparison in create_monthly_repayments then gives the same answer for the whole batch. Finished loans are kept
+    # in the batch with a remaining duration of 1 so the vectorised repayment never divides by zero, and their
+    # results are masked out.
+    count, scenarios = len(loans), shocks.scenarios
+    batch = LoanBatch(
+        loan_id=np.tile(loans.loan_id, scenarios),
+        loan_kind=np.tile(loans.loan_kind, scenarios),
+        original_duration=np.tile(loans.original_duration, scenarios),
+        remaining_duration=np.tile(loans.remaining_duration, scenarios),
+        interest=np.tile(loans.interest, scenarios),
+        amount=np.tile(loans.amount, scenarios),
+        current_credit_score=np.empty(count * scenarios, dtype=np.int64),
+        libor=np.empty(count * scenarios, dtype=np.float64),
+    )
+    credit_score = np.tile(loans.current_credit_score, scenarios)
+    remaining_duration = batch.remaining_duration
+
+    cash_flow = np.empty((scenarios, shocks.months))
+    balance = np.empty((scenarios, shocks.months))
+    for month in range(shocks.months):
+        active = remaining_duration > 0
+        batch.remaining_duration = np.maximum(remaining_duration, 1)
+        batch.libor = np.repeat(shocks.libor[:, month], count)
+        batch.current_credit_score = shift_credit_scores(
+            credit_score, np.repeat(shocks.credit_score_shift[:, month], count)
+        )
+        repayments = create_monthly_repayments(batch)
+
+        payment = np.where(active, repayments.payment, 0.0)
+        batch.amount = np.where(active, repayments.amount_remaining, batch.amount)
+        remaining_duration = np.where(active, remaining_duration - 1, 0)
+        cash_flow[:, month] = payment.reshape(scenarios, count).sum(axis=1)
+        balance[:, month] = batch.amount.reshape(scenarios, count).sum(axis=1)
+    return cash_flow, balance
+
+
+def simulate_block(
+    loans: LoanBatch, kinds: list[list[np.ndarray]], shocks: ScenarioShocks
+) -> tuple[np.ndarray, np.ndarray]:
+    # The totals of each kind, given the positions of the kind's loans split into pieces that are simulated one by one
+    cash_flows, balances = [], []
+    for pieces in kinds:
+        results = [simulate_kind(loans[indices], shocks) for indices in pieces]
+        cash_flows.append(sum(cash_flow for cash_flow, _ in results))
+        balances.append(sum(balance for _, balance in results))
+    return np.stack(cash_flows), np.stack(balances)
+
+
+def _start_worker(loans: LoanBatch) -> None:
+    global _worker_loans
+    _worker_loans = loans
+
+
+def _simulate_in_worker(kinds: list[list[np.ndarray]], shocks: ScenarioShocks) -> tuple[np.ndarray, np.ndarray]:
+    return simulate_block(_worker_loans, kinds, shocks)
+
+
+# Runs a portfolio through every scenario month by month, rolling each loan's amount remaining forward like
+# create_repayment_schedule does. Each kind's loans are split into pieces of at most block_size loans, and the
+# scenarios into blocks small enough that a piece never runs through more than block_size loan-scenarios at once, so
+# memory depends on the block size rather than on the number of loans or scenarios. With more than one worker the
+# blocks run on a process pool whose workers each receive the portfolio once.
+def run_scenarios(
+    loans: LoanBatch | LoanPortfolio, shocks: ScenarioShocks, workers: int = 1, block_size: int = 1_000_000
+) -> ScenarioResult:
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1")
+    loans = loans.to_batch() if isinstance(loans, LoanPortfolio) else loans
+    if len(loans) == 0:
+        raise ValueError("The portfolio has no loans")
+    if np.any(loans.remaining_duration < 0):
+        raise ValueError("remaining_duration must not be negative")
+    began = time.perf_counter()
+
+    loan_kinds, kind_codes = np.unique(loans.loan_kind, return_inverse=True)
+    kinds = [
+        [indices[start : start + block_size] for start in range(0, len(indices), block_size)]
+        for indices in (np.flatnonzero(kind_codes == code) for code in range(len(loan_kinds)))
+    ]
+    largest_piece = max(len(indices) for pieces in kinds for indices in pieces)
+    scenarios_per_block = block_size // largest_piece
+    blocks = [shocks[start : start + scenarios_per_block] for start in range(0, shocks.scenarios, scenarios_per_block)]
+    if workers == 1:
+        results = [simulate_block(loans, kinds, block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_start_worker, initargs=(loans,)) as executor:
+            results = list(executor.map(_simulate_in_worker, [kinds] * len(blocks), blocks))
+
+    shape = (len(loan_kinds), 0, shocks.months)
+    return ScenarioResult(
+        loan_kinds=loan_kinds.tolist(),
+        cash_flow=np.concatenate([cash_flow for cash_flow, _ in results], axis=1) if results else np.empty(shape),
+        balance=np.concatenate([balance for _, balance in results], axis=1) if results else np.empty(shape),
+        seconds=time.perf_counter() - began,
+    )
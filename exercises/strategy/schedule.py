@@ -0,0 +1,84 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .batch import LoanBatch, RepaymentBatch, create_monthly_repayments
+from .strategy import LoanInfo, MonthlyRepayment, create_monthly_repayment
+
+
+def iter_schedule(loan_info: LoanInfo) -> Iterator[MonthlyRepayment]:
+    # Each month is calculated from the previous month's rounded amount remaining, same as rebuilding the LoanInfo
+    # by hand from the MonthlyRepayment would.
+    while loan_info.remaining_duration > 0:
+        repayment = create_monthly_repayment(loan_info)
+        yield repayment
+        loan_info = replace(
+            loan_info,
+            remaining_duration=repayment.remaining_duration,
+            amount=repayment.amount_remaining,
+        )
+
+
+# The schedules of all loans are stored back to back in flat arrays; the rows of loan i are
+# offsets[i]:offsets[i + 1], one row per remaining month.
+@dataclass
+class RepaymentSchedule:
+    loan_id: np.ndarray
+    offsets: np.ndarray
+    payment: np.ndarray
+    amount_remaining: np.ndarray
+    remaining_duration: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.loan_id)
+
+    def rows(self, index: int) -> RepaymentBatch:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return RepaymentBatch(
+            loan_id=np.full(end - start, self.loan_id[index], dtype=object),
+            payment=self.payment[start:end],
+            amount_remaining=self.amount_remaining[start:end],
+            remaining_duration=self.remaining_duration[start:end],
+        )
+
+    def iter_schedule(self, index: int) -> Iterator[MonthlyRepayment]:
+        yield from self.rows(index).to_repayments()
+
+
+def create_repayment_schedule(loans: LoanBatch) -> RepaymentSchedule:
+    if np.any(loans.remaining_duration < 0):
+        raise ValueError("remaining_duration must not be negative")
+
+    offsets = np.zeros(len(loans) + 1, dtype=np.int64)
+    np.cumsum(loans.remaining_duration, out=offsets[1:])
+    total_rows = int(offsets[-1])
+    payment = np.empty(total_rows, dtype=np.float64)
+    amount_remaining = np.empty(total_rows, dtype=np.float64)
+    remaining_duration = np.empty(total_rows, dtype=np.int32)
+
+    # Every step advances all loans that still have repayments left by one month
+    active = np.flatnonzero(loans.remaining_duration > 0)
+    current = loans[active]
+    month = 0
+    while len(active) > 0:
+        repayments = create_monthly_repayments(current)
+        rows = offsets[active] + month
+        payment[rows] = repayments.payment
+        amount_remaining[rows] = repayments.amount_remaining
+        remaining_duration[rows] = repayments.remaining_duration
+
+        current.amount = repayments.amount_remaining
+        current.remaining_duration = repayments.remaining_duration
+        still_active = repayments.remaining_duration > 0
+        active = active[still_active]
+        current = current[still_active]
+        month += 1
+
+    return RepaymentSchedule(
+        loan_id=loans.loan_id,
+        offsets=offsets,
+        payment=payment,
+        amount_remaining=amount_remaining,
+        remaining_duration=remaining_duration,
+    )
@@ -0,0 +1,64 @@
+import asyncio
+
+from .batch import LoanBatch, create_monthly_repayments
+from .strategy import LoanInfo, MonthlyRepayment, create_monthly_repayment
+
+# What the repayment calculation raises for an invalid loan: ZeroDivisionError with no months left, OverflowError,
+# TypeError or ValueError for fields the batch cannot hold
+LOAN_ERRORS = (ArithmeticError, TypeError, ValueError)
+
+
+# Coalesces concurrent repayment requests into micro-batches. A batch is evaluated as soon as it holds
+# max_batch_size requests, or max_wait seconds after its first request arrived, whichever comes first.
+class RepaymentService:
+    def __init__(self, max_batch_size: int = 256, max_wait: float = 0.001) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self._pending: list[tuple[LoanInfo, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((loan_info, future))
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        pending = [(loan_info, future) for loan_info, future in pending if not future.cancelled()]
+        if not pending:
+            return
+        self.batches += 1
+
+        try:
+            self._evaluate(pending)
+        except Exception as error:  # noqa: BLE001
+            # Anything else is a bug rather than an invalid loan. Raising it here would leave the batch's callers
+            # waiting for good, as flush usually runs from the event loop's timer, so they all get it instead.
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _evaluate(self, pending: list[tuple[LoanInfo, asyncio.Future]]) -> None:
+        try:
+            results = create_monthly_repayments(LoanBatch.from_loans(loan for loan, _ in pending)).to_repayments()
+        except LOAN_ERRORS:
+            # Evaluate one by one, so only the callers with invalid loans get the error
+            for loan_info, future in pending:
+                try:
+                    future.set_result(create_monthly_repayment(loan_info))
+                except LOAN_ERRORS as error:
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(pending, results):
+            future.set_result(result)
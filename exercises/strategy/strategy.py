@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from dataclasses import dataclass
 
 
@@ -23,174 +24,143 @@ class MonthlyRepayment:
     remaining_duration: int
 
 
-def create_monthly_repayment(loan_info: LoanInfo) -> MonthlyRepayment:
-    interest_payment = loan_info.amount * loan_info.interest / 12 / 100
-    variable_interest_payment = loan_info.amount * (loan_info.interest + loan_info.libor) / 12 / 100
-    repayment = loan_info.amount / loan_info.remaining_duration
-    duration_so_far = loan_info.original_duration - loan_info.remaining_duration
-    if loan_info.loan_kind == "interest_only":
-        if loan_info.remaining_duration <= 1:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(interest_payment + loan_info.amount, 4),
-                amount_remaining=round(0, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment, 4),
-            amount_remaining=round(loan_info.amount, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "interest_only_variable":
-        if loan_info.remaining_duration <= 1:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(variable_interest_payment + loan_info.amount, 4),
-                amount_remaining=round(0, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(variable_interest_payment, 4),
-            amount_remaining=round(loan_info.amount, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "interest_and_repayment":
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "v_interest_and_repayment":
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(variable_interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "introductory_offer_3":
-        if duration_so_far < 3:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(0, 4),
-                amount_remaining=round(loan_info.amount + interest_payment, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "introductory_offer_12":
-        if duration_so_far < 12:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(0, 4),
-                amount_remaining=round(loan_info.amount + variable_interest_payment, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(variable_interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "introductory_offer_interst_only_6":
-        if duration_so_far < 6:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(interest_payment, 4),
-                amount_remaining=round(loan_info.amount, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "introductory_offer_interst_only_9":
-        if duration_so_far < 9:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(interest_payment, 4),
-                amount_remaining=round(loan_info.amount, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "good_credit_score":
-        if loan_info.current_credit_score >= 700:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(repayment, 4),
-                amount_remaining=round(loan_info.amount - repayment, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "very_good_credit_score":
-        if loan_info.current_credit_score >= 850:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(repayment, 4),
-                amount_remaining=round(loan_info.amount - repayment, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(variable_interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount - repayment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "bad_credit_score":
-        if loan_info.current_credit_score < 650:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(interest_payment * 2 + repayment, 4),
-                amount_remaining=round(loan_info.amount - repayment, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount + interest_payment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
-    if loan_info.loan_kind == "very_bad_credit_score":
-        if loan_info.current_credit_score < 500:
-            return MonthlyRepayment(
-                loan_id=loan_info.loan_id,
-                payment=round(interest_payment * 2 + repayment, 4),
-                amount_remaining=round(loan_info.amount - repayment, 4),
-                remaining_duration=loan_info.remaining_duration - 1,
-            )
-        return MonthlyRepayment(
-            loan_id=loan_info.loan_id,
-            payment=round(interest_payment + repayment, 4),
-            amount_remaining=round(loan_info.amount + interest_payment, 4),
-            remaining_duration=loan_info.remaining_duration - 1,
-        )
+def interest_payment(loan_info: LoanInfo) -> float:
+    return loan_info.amount * loan_info.interest / 12 / 100
+
+
+def variable_interest_payment(loan_info: LoanInfo) -> float:
+    return loan_info.amount * (loan_info.interest + loan_info.libor) / 12 / 100
+
+
+def repayment(loan_info: LoanInfo) -> float:
+    return loan_info.amount / loan_info.remaining_duration
+
+
+def duration_so_far(loan_info: LoanInfo) -> int:
+    return loan_info.original_duration - loan_info.remaining_duration
 
+
+def monthly_repayment(loan_info: LoanInfo, payment: float, amount_remaining: float) -> MonthlyRepayment:
     return MonthlyRepayment(
         loan_id=loan_info.loan_id,
-        payment=round(interest_payment + repayment, 4),
-        amount_remaining=round(loan_info.amount - repayment, 4),
+        payment=round(payment, 4),
+        amount_remaining=round(amount_remaining, 4),
         remaining_duration=loan_info.remaining_duration - 1,
     )
 
 
+# Strategies:
+# Each strategy only calculates the quantities it needs. The interest calculation is passed in as a function, so
+# the same strategy serves both the fixed (interest_payment) and variable (variable_interest_payment) rate kinds.
+class RepaymentStrategy:
+    # Whether the repayment depends on loan_info.libor. Strategies are assumed to, unless they say otherwise.
+    @property
+    def libor_sensitive(self) -> bool:
+        return True
+
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        raise NotImplementedError
+
+
+class InterestRateStrategy(RepaymentStrategy):
+    def __init__(self, interest: Callable[[LoanInfo], float]) -> None:
+        self.interest = interest
+
+    @property
+    def libor_sensitive(self) -> bool:
+        return self.interest is not interest_payment
+
+
+class InterestAndRepaymentStrategy(InterestRateStrategy):
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        loan_repayment = repayment(loan_info)
+        return monthly_repayment(
+            loan_info, self.interest(loan_info) + loan_repayment, loan_info.amount - loan_repayment
+        )
+
+
+class InterestOnlyStrategy(InterestRateStrategy):
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        if loan_info.remaining_duration <= 1:
+            return monthly_repayment(loan_info, self.interest(loan_info) + loan_info.amount, 0)
+        return monthly_repayment(loan_info, self.interest(loan_info), loan_info.amount)
+
+
+class IntroductoryOfferStrategy(InterestAndRepaymentStrategy):
+    def __init__(self, interest: Callable[[LoanInfo], float], offer_months: int) -> None:
+        super().__init__(interest)
+        self.offer_months = offer_months
+
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        if duration_so_far(loan_info) < self.offer_months:
+            return monthly_repayment(loan_info, 0, loan_info.amount + self.interest(loan_info))
+        return super().create_monthly_repayment(loan_info)
+
+
+class IntroductoryInterestOnlyStrategy(InterestAndRepaymentStrategy):
+    def __init__(self, interest: Callable[[LoanInfo], float], offer_months: int) -> None:
+        super().__init__(interest)
+        self.offer_months = offer_months
+
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        if duration_so_far(loan_info) < self.offer_months:
+            return monthly_repayment(loan_info, self.interest(loan_info), loan_info.amount)
+        return super().create_monthly_repayment(loan_info)
+
+
+class GoodCreditScoreStrategy(InterestAndRepaymentStrategy):
+    def __init__(self, interest: Callable[[LoanInfo], float], min_credit_score: int) -> None:
+        super().__init__(interest)
+        self.min_credit_score = min_credit_score
+
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        if loan_info.current_credit_score >= self.min_credit_score:
+            loan_repayment = repayment(loan_info)
+            return monthly_repayment(loan_info, loan_repayment, loan_info.amount - loan_repayment)
+        return super().create_monthly_repayment(loan_info)
+
+
+class BadCreditScoreStrategy(InterestRateStrategy):
+    def __init__(self, interest: Callable[[LoanInfo], float], max_credit_score: int) -> None:
+        super().__init__(interest)
+        self.max_credit_score = max_credit_score
+
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        loan_interest = self.interest(loan_info)
+        loan_repayment = repayment(loan_info)
+        if loan_info.current_credit_score < self.max_credit_score:
+            return monthly_repayment(loan_info, loan_interest * 2 + loan_repayment, loan_info.amount - loan_repayment)
+        return monthly_repayment(loan_info, loan_interest + loan_repayment, loan_info.amount + loan_interest)
+
+
+DEFAULT_REPAYMENT_STRATEGY: RepaymentStrategy = InterestAndRepaymentStrategy(interest_payment)
+
+REPAYMENT_STRATEGIES: dict[str, RepaymentStrategy] = {
+    "interest_only": InterestOnlyStrategy(interest_payment),
+    "interest_only_variable": InterestOnlyStrategy(variable_interest_payment),
+    "interest_and_repayment": InterestAndRepaymentStrategy(interest_payment),
+    "v_interest_and_repayment": InterestAndRepaymentStrategy(variable_interest_payment),
+    "introductory_offer_3": IntroductoryOfferStrategy(interest_payment, 3),
+    "introductory_offer_12": IntroductoryOfferStrategy(variable_interest_payment, 12),
+    "introductory_offer_interst_only_6": IntroductoryInterestOnlyStrategy(interest_payment, 6),
+    "introductory_offer_interst_only_9": IntroductoryInterestOnlyStrategy(interest_payment, 9),
+    "good_credit_score": GoodCreditScoreStrategy(interest_payment, 700),
+    "very_good_credit_score": GoodCreditScoreStrategy(variable_interest_payment, 850),
+    "bad_credit_score": BadCreditScoreStrategy(interest_payment, 650),
+    "very_bad_credit_score": BadCreditScoreStrategy(interest_payment, 500),
+}
+# The kinds above, kept apart from the registry so code that reimplements them can tell when one has been replaced
+BUILT_IN_STRATEGIES: dict[str, RepaymentStrategy] = dict(REPAYMENT_STRATEGIES)
+
+
+def register_repayment_strategy(loan_kind: str, strategy: RepaymentStrategy) -> None:
+    REPAYMENT_STRATEGIES[loan_kind] = strategy
+
+
+def create_monthly_repayment(loan_info: LoanInfo) -> MonthlyRepayment:
+    return REPAYMENT_STRATEGIES.get(loan_info.loan_kind, DEFAULT_REPAYMENT_STRATEGY).create_monthly_repayment(loan_info)
+
+
 def run_example():
     example = LoanInfo(
         loan_id="123-456",
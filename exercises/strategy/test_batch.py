@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pytest
+
+from .batch import LoanBatch, create_monthly_repayments, encode_known_loan_kinds
+from .strategy import LoanInfo, create_monthly_repayment
+
+LOAN_KINDS = [
+    "interest_only",
+    "interest_only_variable",
+    "interest_and_repayment",
+    "v_interest_and_repayment",
+    "introductory_offer_3",
+    "introductory_offer_12",
+    "introductory_offer_interst_only_6",
+    "introductory_offer_interst_only_9",
+    "good_credit_score",
+    "very_good_credit_score",
+    "bad_credit_score",
+    "very_bad_credit_score",
+    "unknown_kind",
+]
+
+
+def random_loans(count: int, seed: int = 0) -> list[LoanInfo]:
+    rng = random.Random(seed)
+    loans = []
+    for index in range(count):
+        original_duration = rng.randint(1, 360)
+        loans.append(
+            LoanInfo(
+                loan_id=f"loan-{index}",
+                loan_kind=rng.choice(LOAN_KINDS),
+                original_duration=original_duration,
+                remaining_duration=rng.randint(1, original_duration),
+                interest=rng.choice([0, 2.5, 5, round(rng.uniform(0, 15), 2)]),
+                amount=rng.choice([10000, round(rng.uniform(0, 1_000_000), 2)]),
+                current_credit_score=rng.randint(300, 900),
+                libor=round(rng.uniform(0, 6), 3),
+            )
+        )
+    return loans
+
+
+def test_batch_matches_scalar():
+    loans = random_loans(5000)
+    repayments = create_monthly_repayments(LoanBatch.from_loans(loans)).to_repayments()
+    assert repayments == [create_monthly_repayment(loan) for loan in loans]
+
+
+@pytest.mark.parametrize("credit_score", [499, 500, 649, 650, 699, 700, 849, 850])
+def test_batch_matches_scalar_at_thresholds(credit_score: int):
+    loans = [
+        LoanInfo(
+            loan_id=f"{loan_kind}-{remaining_duration}",
+            loan_kind=loan_kind,
+            original_duration=24,
+            remaining_duration=remaining_duration,
+            interest=5,
+            amount=10000,
+            current_credit_score=credit_score,
+            libor=3,
+        )
+        for loan_kind in LOAN_KINDS
+        for remaining_duration in range(1, 25)
+    ]
+    repayments = create_monthly_repayments(LoanBatch.from_loans(loans)).to_repayments()
+    assert repayments == [create_monthly_repayment(loan) for loan in loans]
+
+
+@pytest.mark.parametrize("known", [["b", "a", "c"], []])
+def test_encode_known_loan_kinds(known: list[str]):
+    loan_kinds = np.array(["c", "a", "zz", "", "b", "a", "ab"])
+    kind_code, codes = encode_known_loan_kinds(loan_kinds, known)
+    assert sorted(kind_code) == sorted(known)
+    unknown = len(known)
+    assert codes.tolist() == [kind_code.get(loan_kind, unknown) for loan_kind in loan_kinds.tolist()]
+
+
+def test_batch_round_trips_loans():
+    loans = random_loans(100)
+    assert LoanBatch.from_loans(loans).to_loans() == loans
+
+
+def test_batch_rejects_zero_remaining_duration():
+    loans = random_loans(10)
+    loans[3].loan_kind = "interest_and_repayment"
+    loans[3].remaining_duration = 0
+    with pytest.raises(ZeroDivisionError):
+        create_monthly_repayments(LoanBatch.from_loans(loans))
+
+
+@pytest.mark.parametrize("loan_kind", LOAN_KINDS)
+@pytest.mark.parametrize("original_duration", [0, 2, 24])
+def test_batch_matches_scalar_with_no_months_left(loan_kind: str, original_duration: int):
+    loan = LoanInfo(
+        loan_id="123-456",
+        loan_kind=loan_kind,
+        original_duration=original_duration,
+        remaining_duration=0,
+        interest=5,
+        amount=10000,
+        current_credit_score=600,
+        libor=3,
+    )
+    batch = LoanBatch.from_loans(random_loans(5) + [loan])
+    try:
+        expected = create_monthly_repayment(loan)
+    except ZeroDivisionError:
+        with pytest.raises(ZeroDivisionError):
+            create_monthly_repayments(batch)
+        return
+    assert create_monthly_repayments(batch).to_repayments()[-1] == expected
@@ -0,0 +1,76 @@
+from dataclasses import replace
+
+import pytest
+
+from .cache import RepaymentCache
+from .strategy import LoanInfo, MonthlyRepayment, create_monthly_repayment
+from .test_batch import random_loans
+
+EXAMPLE = LoanInfo(
+    loan_id="123-456",
+    loan_kind="interest_and_repayment",
+    original_duration=36,
+    remaining_duration=36,
+    interest=5,
+    amount=10000,
+    current_credit_score=700,
+    libor=3,
+)
+
+
+def test_cache_matches_uncached():
+    cache = RepaymentCache(max_size=50)
+    loans = random_loans(100)
+    for loan in loans + loans:
+        assert cache.create_monthly_repayment(loan) == create_monthly_repayment(loan)
+
+
+def test_cache_hit_restamps_loan_id():
+    cache = RepaymentCache()
+    cache.create_monthly_repayment(EXAMPLE)
+    assert cache.create_monthly_repayment(replace(EXAMPLE, loan_id="789")) == MonthlyRepayment(
+        loan_id="789", payment=319.4444, amount_remaining=9722.2222, remaining_duration=35
+    )
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RepaymentCache(max_size=2)
+    first, second, third = (replace(EXAMPLE, amount=amount) for amount in [1000, 2000, 3000])
+    cache.create_monthly_repayment(first)
+    cache.create_monthly_repayment(second)
+    cache.create_monthly_repayment(first)
+    cache.create_monthly_repayment(third)
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    cache.create_monthly_repayment(first)
+    assert cache.stats.hits == 2
+    cache.create_monthly_repayment(second)
+    assert cache.stats.misses == 4
+
+
+def test_cache_expires_entries():
+    now = [0.0]
+    cache = RepaymentCache(ttl=10, clock=lambda: now[0])
+    cache.create_monthly_repayment(EXAMPLE)
+    now[0] = 5
+    cache.create_monthly_repayment(EXAMPLE)
+    now[0] = 11
+    cache.create_monthly_repayment(EXAMPLE)
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.expirations) == (1, 2, 1)
+
+
+def test_cache_invalidate_libor():
+    cache = RepaymentCache()
+    cache.create_monthly_repayment(EXAMPLE)
+    cache.create_monthly_repayment(replace(EXAMPLE, libor=4))
+    assert cache.invalidate_libor(4) == 1
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats.invalidations == 2
+
+
+def test_cache_rejects_empty_size():
+    with pytest.raises(ValueError):
+        RepaymentCache(max_size=0)
@@ -0,0 +1,61 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from .batch import create_monthly_repayments
+from .compact import FrozenLoanInfo, FrozenMonthlyRepayment, LoanPortfolio, SlottedLoanInfo, SlottedMonthlyRepayment
+from .strategy import create_monthly_repayment
+from .test_batch import random_loans
+
+
+@pytest.mark.parametrize("model", [SlottedLoanInfo, FrozenLoanInfo])
+def test_compact_loan_info_is_interchangeable(model):
+    for loan in random_loans(200):
+        compact = model.from_loan_info(loan)
+        assert not hasattr(compact, "__dict__")
+        assert compact.to_loan_info() == loan
+        assert create_monthly_repayment(compact) == create_monthly_repayment(loan)
+
+
+def test_frozen_loan_info_is_immutable():
+    loan = FrozenLoanInfo.from_loan_info(random_loans(1)[0])
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        loan.amount = 0
+    assert hash(loan) == hash(FrozenLoanInfo.from_loan_info(loan.to_loan_info()))
+
+
+@pytest.mark.parametrize("model", [SlottedMonthlyRepayment, FrozenMonthlyRepayment])
+def test_compact_monthly_repayment_is_interchangeable(model):
+    for loan in random_loans(200):
+        repayment = create_monthly_repayment(loan)
+        assert model.from_monthly_repayment(repayment).to_monthly_repayment() == repayment
+
+
+def test_loan_portfolio_views():
+    loans = random_loans(500)
+    portfolio = LoanPortfolio.from_loans(loans)
+    assert len(portfolio) == len(loans)
+    assert [view.to_loan_info() for view in portfolio] == loans
+    assert portfolio[-1].to_loan_info() == loans[-1]
+    assert [create_monthly_repayment(view) for view in portfolio] == [create_monthly_repayment(loan) for loan in loans]
+    with pytest.raises(IndexError):
+        portfolio[len(loans)]
+
+
+def test_loan_portfolio_to_batch():
+    loans = random_loans(500)
+    portfolio = LoanPortfolio.from_loans(loans)
+    assert portfolio.to_loans() == loans
+    assert create_monthly_repayments(portfolio.to_batch()).to_repayments() == [
+        create_monthly_repayment(loan) for loan in loans
+    ]
+
+
+def test_loan_portfolio_with_many_loan_kinds():
+    loans = [dataclasses.replace(loan, loan_kind=f"kind_{index}") for index, loan in enumerate(random_loans(300))]
+    portfolio = LoanPortfolio.from_loans(loans)
+    assert portfolio.loan_kind_code.dtype == np.uint16
+    assert portfolio.to_loans() == loans
+    assert LoanPortfolio.from_batch(portfolio.to_batch()).to_loans() == loans
+    assert LoanPortfolio.from_loans(loans[:256]).loan_kind_code.dtype == np.uint8
@@ -0,0 +1,127 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from .batch import LoanBatch, create_monthly_repayments
+from .fixed_point import create_monthly_repayment_exact, create_monthly_repayments_exact, to_amount_units
+from .strategy import LoanInfo, MonthlyRepayment, create_monthly_repayment
+from .test_batch import LOAN_KINDS, random_loans
+
+
+def to_decimal(value: Fraction | int) -> Decimal:
+    value = Fraction(value)
+    return Decimal(value.numerator) / Decimal(value.denominator)
+
+
+def exact_reference(loan_info: LoanInfo) -> MonthlyRepayment:
+    # The scalar strategies evaluated on exact fractions, rounded once at the end
+    exact = LoanInfo(
+        loan_id=loan_info.loan_id,
+        loan_kind=loan_info.loan_kind,
+        original_duration=loan_info.original_duration,
+        remaining_duration=loan_info.remaining_duration,
+        interest=Fraction(str(loan_info.interest)),
+        amount=Fraction(str(loan_info.amount)),
+        current_credit_score=loan_info.current_credit_score,
+        libor=Fraction(str(loan_info.libor)),
+    )
+    repayment = create_monthly_repayment(exact)
+    return MonthlyRepayment(
+        loan_id=repayment.loan_id,
+        payment=to_decimal(repayment.payment),
+        amount_remaining=to_decimal(repayment.amount_remaining),
+        remaining_duration=repayment.remaining_duration,
+    )
+
+
+def test_exact_matches_fraction_reference():
+    for loan in random_loans(3000, seed=10):
+        assert create_monthly_repayment_exact(loan) == exact_reference(loan)
+
+
+def test_exact_batch_matches_exact_scalar():
+    loans = random_loans(3000, seed=11)
+    batch = create_monthly_repayments_exact(LoanBatch.from_loans(loans))
+    assert batch.to_repayments() == [create_monthly_repayment_exact(loan) for loan in loans]
+
+
+def test_exact_and_float_modes_agree_to_the_last_digit():
+    loans = random_loans(3000, seed=12)
+    exact = create_monthly_repayments_exact(LoanBatch.from_loans(loans)).to_float_batch()
+    floating = create_monthly_repayments(LoanBatch.from_loans(loans))
+    assert abs(exact.payment - floating.payment).max() <= 0.0001 + 1e-9
+    assert abs(exact.amount_remaining - floating.amount_remaining).max() <= 0.0001 + 1e-9
+
+
+def test_exact_rounds_ties_to_even():
+    loan = LoanInfo("123-456", "interest_only", 36, 36, interest=1.2, amount=0.0005, current_credit_score=700, libor=0)
+    assert create_monthly_repayment_exact(loan).amount_remaining == Decimal("0.0005")
+    loan = LoanInfo("123-456", "good_credit_score", 36, 2, interest=5, amount=0.0003, current_credit_score=700, libor=0)
+    assert create_monthly_repayment_exact(loan).payment == Decimal("0.0002")
+    loan = LoanInfo("123-456", "good_credit_score", 36, 2, interest=5, amount=0.0001, current_credit_score=700, libor=0)
+    assert create_monthly_repayment_exact(loan).payment == Decimal("0.0000")
+
+
+@pytest.mark.parametrize("loan_kind", LOAN_KINDS)
+def test_exact_example(loan_kind: str):
+    loan = LoanInfo("123-456", loan_kind, 36, 36, interest=5, amount=10000, current_credit_score=700, libor=3)
+    assert create_monthly_repayment_exact(loan) == exact_reference(loan)
+
+
+def test_exact_keeps_five_decimal_libor():
+    loan = LoanInfo(
+        "123-456",
+        "v_interest_and_repayment",
+        360,
+        360,
+        interest=4.5,
+        amount=1_000_000,
+        current_credit_score=700,
+        libor=2.31063,
+    )
+    expected = exact_reference(loan)
+    assert expected.payment == Decimal("8453.3028")
+    assert create_monthly_repayment_exact(loan) == expected
+    assert create_monthly_repayments_exact(LoanBatch.from_loans([loan])).to_repayments() == [expected]
+
+
+@pytest.mark.parametrize("libor", [2.3106312, Decimal("2.3106312"), "0.0000001"])
+def test_exact_rejects_rates_it_cannot_hold(libor):
+    loan = LoanInfo("123-456", "v_interest_and_repayment", 360, 360, 4.5, 1_000_000, 700, libor)
+    with pytest.raises(ValueError, match="decimals"):
+        create_monthly_repayment_exact(loan)
+    if isinstance(libor, float):
+        with pytest.raises(ValueError, match="decimals"):
+            create_monthly_repayments_exact(LoanBatch.from_loans([loan]))
+
+
+def test_exact_batch_rejects_overflow():
+    loan = LoanInfo("123-456", "interest_only", 36, 36, interest=50, amount=1e13, current_credit_score=700, libor=0)
+    with pytest.raises(OverflowError):
+        create_monthly_repayments_exact(LoanBatch.from_loans([loan]))
+    assert create_monthly_repayment_exact(loan).payment == Decimal("416666666666.6667")
+
+
+@pytest.mark.parametrize(
+    "value, units",
+    [(0.1, 1000), (10000, 100000000), (1234.5678, 12345678), (Decimal("1.23455"), 12346), ("0.00015", 2), (1e-5, 0)],
+)
+def test_to_amount_units(value, units: int):
+    assert to_amount_units(value) == units
+
+
+@pytest.mark.parametrize("value", [0.00015, 0.00025, 1234.56785, 2.00005])
+def test_exact_batch_converts_values_finer_than_the_scale_like_the_scalar_path(value: float):
+    assert to_amount_units(value) == int((Decimal(str(value)) * 10_000).to_integral_value())
+    loans = [
+        LoanInfo(
+            "amount", "interest_and_repayment", 36, 24, interest=5, amount=value, current_credit_score=700, libor=3
+        ),
+        LoanInfo("interest", "interest_only", 36, 24, interest=value, amount=10000, current_credit_score=700, libor=3),
+        LoanInfo(
+            "libor", "interest_only_variable", 36, 24, interest=5, amount=10000, current_credit_score=700, libor=value
+        ),
+    ]
+    batch = create_monthly_repayments_exact(LoanBatch.from_loans(loans))
+    assert batch.to_repayments() == [create_monthly_repayment_exact(loan) for loan in loans]
@@ -0,0 +1,42 @@
+from dataclasses import replace
+
+from .batch import LoanBatch
+from .libor import RepaymentBook
+from .strategy import create_monthly_repayment
+from .test_batch import random_loans
+
+VARIABLE_KINDS = {
+    "interest_only_variable",
+    "v_interest_and_repayment",
+    "introductory_offer_12",
+    "very_good_credit_score",
+}
+
+
+def test_book_indexes_libor_sensitive_kinds():
+    loans = random_loans(1000, seed=7)
+    book = RepaymentBook(LoanBatch.from_loans(loans))
+    assert book.libor_sensitive.tolist() == [
+        index for index, loan in enumerate(loans) if loan.loan_kind in VARIABLE_KINDS
+    ]
+
+
+def test_update_libor_matches_full_recomputation():
+    loans = random_loans(1000, seed=8)
+    book = RepaymentBook(LoanBatch.from_loans(loans))
+    before = book.repayments.to_repayments()
+
+    delta = book.update_libor(4.25)
+
+    expected = [create_monthly_repayment(replace(loan, libor=4.25)) for loan in loans]
+    assert book.repayments.to_repayments() == expected
+    changed = [index for index in range(len(loans)) if expected[index] != before[index]]
+    assert delta.indices.tolist() == changed
+    assert delta.repayments.to_repayments() == [expected[index] for index in changed]
+    assert all(loans[index].loan_kind in VARIABLE_KINDS for index in changed)
+
+
+def test_update_libor_without_change_is_empty():
+    loans = [replace(loan, libor=2.0) for loan in random_loans(100, seed=9)]
+    book = RepaymentBook(LoanBatch.from_loans(loans))
+    assert len(book.update_libor(2.0)) == 0
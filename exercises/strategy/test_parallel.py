@@ -0,0 +1,26 @@
+import pytest
+
+from .batch import LoanBatch
+from .compact import LoanPortfolio
+from .parallel import run_portfolio
+from .strategy import create_monthly_repayment
+from .test_batch import random_loans
+
+
+def test_run_portfolio_matches_scalar_in_input_order():
+    loans = random_loans(2500, seed=4)
+    run = run_portfolio(LoanBatch.from_loans(loans), workers=2, chunk_size=300)
+    assert run.repayments.to_repayments() == [create_monthly_repayment(loan) for loan in loans]
+    assert sum(stats.chunks for stats in run.worker_stats) == 9
+    assert sum(stats.loans for stats in run.worker_stats) == len(loans)
+
+
+def test_run_portfolio_accepts_loan_portfolio():
+    loans = random_loans(100, seed=5)
+    run = run_portfolio(LoanPortfolio.from_loans(loans), workers=1)
+    assert run.repayments.to_repayments() == [create_monthly_repayment(loan) for loan in loans]
+
+
+def test_run_portfolio_rejects_empty_chunks():
+    with pytest.raises(ValueError):
+        run_portfolio(LoanBatch.from_loans(random_loans(10)), chunk_size=0)
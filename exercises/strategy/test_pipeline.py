@@ -0,0 +1,100 @@
+import csv
+import json
+from dataclasses import asdict
+
+import pytest
+from click.testing import CliRunner
+
+from ..__main__ import cli
+from .pipeline import LOAN_FIELDS, process_file, read_loans
+from .strategy import MonthlyRepayment, create_monthly_repayment
+from .test_batch import random_loans
+
+
+def write_csv(path, loans):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, LOAN_FIELDS)
+        writer.writeheader()
+        writer.writerows(asdict(loan) for loan in loans)
+
+
+def write_jsonl(path, loans):
+    with open(path, "w") as file:
+        file.writelines(json.dumps(asdict(loan)) + "\n" for loan in loans)
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+@pytest.mark.parametrize("input_type", ["csv", "jsonl"])
+@pytest.mark.parametrize("output_type", ["csv", "jsonl"])
+def test_process_file(tmp_path, input_type, output_type, memory_map):
+    loans = random_loans(250, seed=6)
+    input_path = tmp_path / f"loans.{input_type}"
+    output_path = tmp_path / f"repayments.{output_type}"
+    (write_csv if input_type == "csv" else write_jsonl)(input_path, loans)
+
+    assert process_file(input_path, output_path, chunk_size=100, memory_map=memory_map) == len(loans)
+
+    with open(output_path, newline="") as file:
+        if output_type == "csv":
+            records = list(csv.DictReader(file))
+        else:
+            records = [json.loads(line) for line in file]
+    repayments = [
+        MonthlyRepayment(
+            loan_id=record["loan_id"],
+            payment=float(record["payment"]),
+            amount_remaining=float(record["amount_remaining"]),
+            remaining_duration=int(record["remaining_duration"]),
+        )
+        for record in records
+    ]
+    assert repayments == [create_monthly_repayment(loan) for loan in loans]
+
+
+def test_read_loans_chunks(tmp_path):
+    loans = random_loans(25)
+    write_jsonl(tmp_path / "loans.jsonl", loans)
+    chunks = list(read_loans(tmp_path / "loans.jsonl", chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [loan.loan_id for chunk in chunks for loan in chunk] == [loan.loan_id for loan in loans]
+
+
+def test_read_loans_reports_invalid_line(tmp_path):
+    loans = random_loans(3)
+    write_csv(tmp_path / "loans.csv", loans)
+    content = (tmp_path / "loans.csv").read_text().splitlines()
+    content[2] = content[2].replace(loans[1].loan_kind, "").replace(f",{loans[1].libor}", ",")
+    (tmp_path / "loans.csv").write_text("\n".join(content))
+    with pytest.raises(ValueError, match="Line 3: missing field"):
+        list(read_loans(tmp_path / "loans.csv"))
+
+
+def test_read_loans_rejects_unknown_file_type(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        list(read_loans(tmp_path / "loans.txt"))
+
+
+@pytest.mark.parametrize("line", ["[1, 2]", "3", '"loan"'])
+def test_read_loans_rejects_lines_that_are_not_objects(tmp_path, line):
+    write_jsonl(tmp_path / "loans.jsonl", random_loans(1))
+    with open(tmp_path / "loans.jsonl", "a") as file:
+        file.write(line + "\n")
+    with pytest.raises(ValueError, match="Line 2: expected an object"):
+        list(read_loans(tmp_path / "loans.jsonl"))
+    result = CliRunner().invoke(cli, ["strategy-file", str(tmp_path / "loans.jsonl"), str(tmp_path / "out.csv")])
+    assert result.exit_code == 1
+    assert "Error: Line 2: expected an object" in result.output
+
+
+@pytest.mark.parametrize(
+    "field, value", [("original_duration", [3]), ("interest", {"rate": 5}), ("remaining_duration", float("inf"))]
+)
+def test_read_loans_rejects_fields_of_the_wrong_type(tmp_path, field, value):
+    write_jsonl(tmp_path / "loans.jsonl", random_loans(1))
+    with open(tmp_path / "loans.jsonl", "a") as file:
+        file.write(json.dumps(asdict(random_loans(1)[0]) | {field: value}) + "\n")
+    with pytest.raises(ValueError, match="Line 2: "):
+        list(read_loans(tmp_path / "loans.jsonl"))
+    result = CliRunner().invoke(cli, ["strategy-file", str(tmp_path / "loans.jsonl"), str(tmp_path / "out.csv")])
+    assert result.exit_code == 1
+    assert "Error: Line 2: " in result.output
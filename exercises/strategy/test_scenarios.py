@@ -0,0 +1,106 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from .batch import LoanBatch
+from .compact import LoanPortfolio
+from .scenarios import ScenarioShocks, run_scenarios, shift_credit_scores, simulate_kind
+from .strategy import create_monthly_repayment
+from .test_batch import random_loans
+
+
+def scalar_scenarios(loans, shocks):
+    loan_kinds = sorted({loan.loan_kind for loan in loans})
+    cash_flow = np.zeros((len(loan_kinds), shocks.scenarios, shocks.months))
+    balance = np.zeros((len(loan_kinds), shocks.scenarios, shocks.months))
+    for scenario in range(shocks.scenarios):
+        for loan in loans:
+            kind = loan_kinds.index(loan.loan_kind)
+            for month in range(shocks.months):
+                if loan.remaining_duration > 0:
+                    credit_score = loan.current_credit_score + int(shocks.credit_score_shift[scenario, month])
+                    repayment = create_monthly_repayment(
+                        replace(
+                            loan,
+                            libor=float(shocks.libor[scenario, month]),
+                            current_credit_score=min(
+                                max(credit_score, min(loan.current_credit_score, 300)),
+                                max(loan.current_credit_score, 850),
+                            ),
+                        )
+                    )
+                    cash_flow[kind, scenario, month] += repayment.payment
+                    loan = replace(
+                        loan, amount=repayment.amount_remaining, remaining_duration=repayment.remaining_duration
+                    )
+                balance[kind, scenario, month] += loan.amount
+    return loan_kinds, cash_flow, balance
+
+
+@pytest.mark.parametrize("workers, block_size", [(1, 1_000_000), (1, 250), (2, 400), (1, 13), (2, 1)])
+def test_run_scenarios_matches_scalar(workers: int, block_size: int):
+    loans = [replace(loan, remaining_duration=min(loan.remaining_duration, 8)) for loan in random_loans(120, seed=21)]
+    shocks = ScenarioShocks.random_walk(7, 10, libor=3.0, credit_score_volatility=60, seed=21)
+    result = run_scenarios(LoanBatch.from_loans(loans), shocks, workers=workers, block_size=block_size)
+
+    loan_kinds, cash_flow, balance = scalar_scenarios(loans, shocks)
+    assert result.loan_kinds == loan_kinds
+    np.testing.assert_allclose(result.cash_flow, cash_flow, rtol=1e-12)
+    np.testing.assert_allclose(result.balance, balance, rtol=1e-12)
+
+
+def test_blocks_stay_within_block_size(monkeypatch: pytest.MonkeyPatch):
+    # More loans than the block size, so both the loans and the scenarios have to be split
+    loans = [replace(loan, remaining_duration=min(loan.remaining_duration, 4)) for loan in random_loans(60, seed=22)]
+    shocks = ScenarioShocks.random_walk(5, 4, libor=3.0, seed=22)
+    expected = run_scenarios(LoanBatch.from_loans(loans), shocks)
+    sizes = []
+
+    def recording_simulate_kind(loans: LoanBatch, shocks: ScenarioShocks) -> tuple[np.ndarray, np.ndarray]:
+        sizes.append(len(loans) * shocks.scenarios)
+        return simulate_kind(loans, shocks)
+
+    monkeypatch.setattr("exercises.strategy.scenarios.simulate_kind", recording_simulate_kind)
+    result = run_scenarios(LoanBatch.from_loans(loans), shocks, block_size=7)
+    assert max(sizes) <= 7
+    np.testing.assert_allclose(result.cash_flow, expected.cash_flow, rtol=1e-12)
+    np.testing.assert_allclose(result.balance, expected.balance, rtol=1e-12)
+    with pytest.raises(ValueError, match="block_size"):
+        run_scenarios(LoanBatch.from_loans(loans), shocks, block_size=0)
+
+
+def test_shift_credit_scores():
+    credit_score = np.array([250, 320, 600, 840, 900])
+    assert shift_credit_scores(credit_score, np.zeros(5, dtype=np.int64)).tolist() == [250, 320, 600, 840, 900]
+    assert shift_credit_scores(credit_score, np.full(5, 30)).tolist() == [280, 350, 630, 850, 900]
+    assert shift_credit_scores(credit_score, np.full(5, -30)).tolist() == [250, 300, 570, 810, 870]
+
+
+def test_credit_score_shift_crosses_thresholds():
+    loan = random_loans(1)[0]
+    loan = replace(loan, loan_kind="bad_credit_score", current_credit_score=660, remaining_duration=12)
+    shocks = ScenarioShocks(libor=[[3.0], [3.0]], credit_score_shift=[[0], [-20]])
+    result = run_scenarios(LoanPortfolio.from_loans([loan]), shocks)
+    cash_flow, balance = result.kind("bad_credit_score")
+    assert cash_flow[0, 0] == create_monthly_repayment(loan).payment
+    assert cash_flow[1, 0] == create_monthly_repayment(replace(loan, current_credit_score=640)).payment
+    assert cash_flow[1, 0] > cash_flow[0, 0]
+    assert balance[1, 0] < balance[0, 0]
+
+
+def test_percentiles():
+    shocks = ScenarioShocks.random_walk(50, 6, libor=3.0, seed=1)
+    result = run_scenarios(LoanBatch.from_loans(random_loans(40, seed=2)), shocks)
+    percentiles = result.percentiles("cash_flow", [5, 50, 95])
+    assert set(percentiles) == set(result.loan_kinds)
+    for values in percentiles.values():
+        assert values.shape == (3, 6)
+        assert np.all(values[0] <= values[1]) and np.all(values[1] <= values[2])
+    with pytest.raises(ValueError):
+        result.percentiles("payments", [50])
+
+
+def test_invalid_shocks():
+    with pytest.raises(ValueError, match="shape"):
+        ScenarioShocks(libor=np.zeros((2, 3)), credit_score_shift=np.zeros((2, 4)))
@@ -0,0 +1,38 @@
+from .batch import LoanBatch
+from .schedule import create_repayment_schedule, iter_schedule
+from .strategy import LoanInfo, MonthlyRepayment
+from .test_batch import random_loans
+
+
+def test_iter_schedule():
+    example = LoanInfo(
+        loan_id="123-456",
+        loan_kind="interest_only",
+        original_duration=3,
+        remaining_duration=3,
+        interest=12,
+        amount=10000,
+        current_credit_score=700,
+        libor=3,
+    )
+    assert list(iter_schedule(example)) == [
+        MonthlyRepayment(loan_id="123-456", payment=100.0, amount_remaining=10000, remaining_duration=2),
+        MonthlyRepayment(loan_id="123-456", payment=100.0, amount_remaining=10000, remaining_duration=1),
+        MonthlyRepayment(loan_id="123-456", payment=10100.0, amount_remaining=0, remaining_duration=0),
+    ]
+
+
+def test_portfolio_schedule_matches_iter_schedule():
+    loans = random_loans(300, seed=1)
+    schedule = create_repayment_schedule(LoanBatch.from_loans(loans))
+    assert len(schedule) == len(loans)
+    for index, loan in enumerate(loans):
+        assert list(schedule.iter_schedule(index)) == list(iter_schedule(loan))
+
+
+def test_portfolio_schedule_skips_finished_loans():
+    loans = random_loans(3, seed=2)
+    loans[1].remaining_duration = 0
+    schedule = create_repayment_schedule(LoanBatch.from_loans(loans))
+    assert list(schedule.iter_schedule(1)) == []
+    assert list(schedule.iter_schedule(2)) == list(iter_schedule(loans[2]))
@@ -0,0 +1,88 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from .service import RepaymentService
+from .strategy import (
+    REPAYMENT_STRATEGIES,
+    LoanInfo,
+    MonthlyRepayment,
+    RepaymentStrategy,
+    create_monthly_repayment,
+    register_repayment_strategy,
+)
+from .test_batch import random_loans
+
+
+def test_service_batches_concurrent_requests():
+    loans = random_loans(100, seed=13)
+
+    async def run():
+        service = RepaymentService(max_batch_size=40, max_wait=0.01)
+        results = await asyncio.gather(*(service.create_monthly_repayment(loan) for loan in loans))
+        return service, results
+
+    service, results = asyncio.run(run())
+    assert results == [create_monthly_repayment(loan) for loan in loans]
+    assert service.batches == 3
+
+
+def test_service_flushes_after_max_wait():
+    loan = random_loans(1)[0]
+
+    async def run():
+        service = RepaymentService(max_batch_size=1000, max_wait=0.001)
+        return await asyncio.wait_for(service.create_monthly_repayment(loan), timeout=1)
+
+    assert asyncio.run(run()) == create_monthly_repayment(loan)
+
+
+@pytest.mark.parametrize(
+    "invalid, error",
+    [
+        ({"loan_kind": "interest_and_repayment", "remaining_duration": 0}, ZeroDivisionError),
+        ({"remaining_duration": None}, TypeError),
+    ],
+)
+def test_service_only_fails_invalid_requests(invalid: dict, error: type):
+    loans = random_loans(3, seed=14)
+    loans[1] = replace(loans[1], **invalid)
+
+    async def run():
+        service = RepaymentService()
+        return await asyncio.gather(*(service.create_monthly_repayment(loan) for loan in loans), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert results[0] == create_monthly_repayment(loans[0])
+    assert isinstance(results[1], error)
+    assert results[2] == create_monthly_repayment(loans[2])
+
+
+class LookupFailingStrategy(RepaymentStrategy):
+    def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+        raise KeyError(loan_info.loan_id)
+
+
+@pytest.mark.parametrize("max_batch_size", [3, 1000])
+def test_service_fails_the_batch_on_other_errors(max_batch_size: int):
+    # With a batch size of 1000 the batch is flushed by the timer, where an escaping error would only be logged
+    loans = random_loans(3, seed=15)
+    loans[1] = replace(loans[1], loan_kind="failing_lookup")
+
+    async def run():
+        service = RepaymentService(max_batch_size=max_batch_size, max_wait=0.001)
+        requests = asyncio.gather(*(service.create_monthly_repayment(loan) for loan in loans), return_exceptions=True)
+        return await asyncio.wait_for(requests, timeout=1)
+
+    register_repayment_strategy("failing_lookup", LookupFailingStrategy())
+    try:
+        results = asyncio.run(run())
+    finally:
+        del REPAYMENT_STRATEGIES["failing_lookup"]
+    assert [type(result) for result in results] == [KeyError, KeyError, KeyError]
+
+
+def test_service_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        RepaymentService(max_batch_size=0)
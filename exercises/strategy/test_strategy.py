@@ -1,4 +1,20 @@
-from .strategy import create_monthly_repayment, LoanInfo, MonthlyRepayment
+import os
+import subprocess
+import sys
+
+import pytest
+
+from .batch import LoanBatch, create_monthly_repayments
+from .strategy import (
+    REPAYMENT_STRATEGIES,
+    LoanInfo,
+    MonthlyRepayment,
+    RepaymentStrategy,
+    create_monthly_repayment,
+    register_repayment_strategy,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
 
 def test_equal_amounts():
@@ -18,3 +34,127 @@ def test_equal_amounts():
         amount_remaining=9722.2222,
         remaining_duration=35,
     )
+
+
+# Repayments of the original if-chain, for a 36 month loan of 10000 at 5% with a libor of 3, in and after every
+# introductory offer and on both sides of every credit score threshold
+@pytest.mark.parametrize(
+    "loan_kind, remaining_duration, credit_score, payment, amount_remaining",
+    [
+        ("interest_only", 36, 450, 41.6667, 10000),
+        ("interest_only", 30, 600, 41.6667, 10000),
+        ("interest_only", 24, 860, 41.6667, 10000),
+        ("interest_only", 1, 700, 10041.6667, 0),
+        ("interest_only_variable", 36, 450, 66.6667, 10000),
+        ("interest_only_variable", 30, 600, 66.6667, 10000),
+        ("interest_only_variable", 24, 860, 66.6667, 10000),
+        ("interest_only_variable", 1, 700, 10066.6667, 0),
+        ("interest_and_repayment", 36, 450, 319.4444, 9722.2222),
+        ("interest_and_repayment", 30, 600, 375.0, 9666.6667),
+        ("interest_and_repayment", 24, 860, 458.3333, 9583.3333),
+        ("interest_and_repayment", 1, 700, 10041.6667, 0.0),
+        ("v_interest_and_repayment", 36, 450, 344.4444, 9722.2222),
+        ("v_interest_and_repayment", 30, 600, 400.0, 9666.6667),
+        ("v_interest_and_repayment", 24, 860, 483.3333, 9583.3333),
+        ("v_interest_and_repayment", 1, 700, 10066.6667, 0.0),
+        ("introductory_offer_3", 36, 450, 0, 10041.6667),
+        ("introductory_offer_3", 30, 600, 375.0, 9666.6667),
+        ("introductory_offer_3", 24, 860, 458.3333, 9583.3333),
+        ("introductory_offer_3", 1, 700, 10041.6667, 0.0),
+        ("introductory_offer_12", 36, 450, 0, 10066.6667),
+        ("introductory_offer_12", 30, 600, 0, 10066.6667),
+        ("introductory_offer_12", 24, 860, 483.3333, 9583.3333),
+        ("introductory_offer_12", 1, 700, 10066.6667, 0.0),
+        ("introductory_offer_interst_only_6", 36, 450, 41.6667, 10000),
+        ("introductory_offer_interst_only_6", 30, 600, 375.0, 9666.6667),
+        ("introductory_offer_interst_only_6", 24, 860, 458.3333, 9583.3333),
+        ("introductory_offer_interst_only_6", 1, 700, 10041.6667, 0.0),
+        ("introductory_offer_interst_only_9", 36, 450, 41.6667, 10000),
+        ("introductory_offer_interst_only_9", 30, 600, 41.6667, 10000),
+        ("introductory_offer_interst_only_9", 24, 860, 458.3333, 9583.3333),
+        ("introductory_offer_interst_only_9", 1, 700, 10041.6667, 0.0),
+        ("good_credit_score", 36, 450, 319.4444, 9722.2222),
+        ("good_credit_score", 30, 600, 375.0, 9666.6667),
+        ("good_credit_score", 24, 860, 416.6667, 9583.3333),
+        ("good_credit_score", 1, 700, 10000.0, 0.0),
+        ("very_good_credit_score", 36, 450, 344.4444, 9722.2222),
+        ("very_good_credit_score", 30, 600, 400.0, 9666.6667),
+        ("very_good_credit_score", 24, 860, 416.6667, 9583.3333),
+        ("very_good_credit_score", 1, 700, 10066.6667, 0.0),
+        ("bad_credit_score", 36, 450, 361.1111, 9722.2222),
+        ("bad_credit_score", 30, 600, 416.6667, 9666.6667),
+        ("bad_credit_score", 24, 860, 458.3333, 10041.6667),
+        ("bad_credit_score", 1, 700, 10041.6667, 10041.6667),
+        ("very_bad_credit_score", 36, 450, 361.1111, 9722.2222),
+        ("very_bad_credit_score", 30, 600, 375.0, 10041.6667),
+        ("very_bad_credit_score", 24, 860, 458.3333, 10041.6667),
+        ("very_bad_credit_score", 1, 700, 10041.6667, 10041.6667),
+        ("unknown_kind", 36, 450, 319.4444, 9722.2222),
+        ("unknown_kind", 30, 600, 375.0, 9666.6667),
+        ("unknown_kind", 24, 860, 458.3333, 9583.3333),
+        ("unknown_kind", 1, 700, 10041.6667, 0.0),
+    ],
+)
+def test_registry_matches_if_chain(
+    loan_kind: str, remaining_duration: int, credit_score: int, payment: float, amount_remaining: float
+):
+    example = LoanInfo(
+        loan_id="123-456",
+        loan_kind=loan_kind,
+        original_duration=36,
+        remaining_duration=remaining_duration,
+        interest=5,
+        amount=10000,
+        current_credit_score=credit_score,
+        libor=3,
+    )
+    assert create_monthly_repayment(example) == MonthlyRepayment(
+        "123-456", payment, amount_remaining, remaining_duration - 1
+    )
+
+
+def test_register_repayment_strategy():
+    class NoPaymentStrategy(RepaymentStrategy):
+        def create_monthly_repayment(self, loan_info: LoanInfo) -> MonthlyRepayment:
+            return MonthlyRepayment(loan_info.loan_id, 0, loan_info.amount, loan_info.remaining_duration - 1)
+
+    example = LoanInfo(
+        loan_id="123-456",
+        loan_kind="payment_holiday",
+        original_duration=36,
+        remaining_duration=36,
+        interest=5,
+        amount=10000,
+        current_credit_score=700,
+        libor=3,
+    )
+    register_repayment_strategy("payment_holiday", NoPaymentStrategy())
+    try:
+        assert create_monthly_repayment(example) == MonthlyRepayment("123-456", 0, 10000, 35)
+        batch = create_monthly_repayments(LoanBatch.from_loans([example]))
+        assert batch.to_repayments() == [MonthlyRepayment("123-456", 0, 10000, 35)]
+    finally:
+        del REPAYMENT_STRATEGIES["payment_holiday"]
+
+
+def test_kinds_registered_before_the_batch_module_is_imported():
+    # The batch module must not take a kind registered before it was imported for one it vectorises
+    script = (
+        "from exercises.strategy.strategy import LoanInfo, MonthlyRepayment, RepaymentStrategy,"
+        " create_monthly_repayment, register_repayment_strategy\n"
+        "class FlatStrategy(RepaymentStrategy):\n"
+        "    def create_monthly_repayment(self, loan_info):\n"
+        "        return MonthlyRepayment(loan_info.loan_id, 1.0, loan_info.amount - 1, loan_info.remaining_duration - 1)\n"
+        "register_repayment_strategy('flat', FlatStrategy())\n"
+        "from exercises.strategy.batch import LoanBatch, create_monthly_repayments\n"
+        "from exercises.strategy.fixed_point import create_monthly_repayment_exact\n"
+        "loan = LoanInfo('123-456', 'flat', 36, 36, 5, 10000, 700, 3)\n"
+        "assert create_monthly_repayments(LoanBatch.from_loans([loan])).to_repayments() == "
+        "[create_monthly_repayment(loan)]\n"
+        "try:\n"
+        "    create_monthly_repayment_exact(loan)\n"
+        "except ValueError:\n"
+        "    print('unsupported')\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ["unsupported"]